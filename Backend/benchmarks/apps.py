@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BenchmarksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'benchmarks'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (registers the score sketch receivers)
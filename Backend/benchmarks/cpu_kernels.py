@@ -0,0 +1,238 @@
+# benchmarks/cpu_kernels.py
+"""
+Pluggable CPU benchmark suite.
+
+Each kernel does a fixed amount of work and reports a rate in its own unit.
+The rate is scaled to points with its reference rate (1000 points = reference),
+and the suite composite is the weighted geometric mean of the kernel points,
+so one very fast or very slow kernel cannot dominate the result.
+
+"matmul" is the all-core BLAS stress test from stress_pool.py; the other
+kernels run single-threaded in the calling process and take the best of a few
+repeats, which keeps them short and stable.
+
+Register extra kernels with register_kernel().
+"""
+import hashlib
+import json
+import lzma
+import math
+import random
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class CpuKernel:
+    """One sub-benchmark: `run()` performs the fixed workload and returns units of work done."""
+
+    def __init__(self, name: str, run: Callable[[], float], unit: str, reference: float,
+                 weight: float = 1.0, setup: Optional[Callable[[], None]] = None, repeats: int = 3):
+        self.name = name
+        self.run = run
+        self.unit = unit
+        self.reference = reference
+        self.weight = weight
+        self.setup = setup
+        self.repeats = repeats
+
+    def measure(self) -> Dict:
+        if self.setup:
+            self.setup()
+        best = None
+        work = 0.0
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            work = self.run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        rate = work / best if best else 0.0
+        return {"rate": round(rate, 3), "unit": self.unit, "seconds": round(best or 0.0, 4)}
+
+
+KERNELS: Dict[str, CpuKernel] = {}
+
+
+def register_kernel(kernel: CpuKernel) -> CpuKernel:
+    KERNELS[kernel.name] = kernel
+    return kernel
+
+
+# --- workloads (fixed sizes; data is generated once and reused) ---
+VECTOR_N = 4_000_000
+HASH_N = 4_000_000
+SORT_N = 300_000
+COMPRESS_BYTES = 4 * 1024 * 1024
+JSON_RECORDS = 20_000
+
+_data: Dict[str, object] = {}
+
+
+def _vector_data():
+    if "vector" not in _data:
+        import numpy as np
+        rng = np.random.default_rng(42)
+        x = rng.random(VECTOR_N, dtype=np.float32)
+        y = rng.random(VECTOR_N, dtype=np.float32)
+        _data["vector"] = (x, y, np.empty_like(x), np.empty_like(x))
+    return _data["vector"]
+
+
+def _vector_float() -> float:
+    """Fused-style float pipeline over contiguous float32 arrays; NumPy ufuncs use SIMD."""
+    import numpy as np
+    x, y, out, tmp = _vector_data()
+    np.multiply(x, 1.0001, out=out)        # 1 flop
+    np.add(out, y, out=out)                # 1 flop
+    np.multiply(out, out, out=tmp)         # 1 flop
+    np.sqrt(tmp, out=tmp)                  # 1 flop
+    np.subtract(tmp, x, out=out)           # 1 flop
+    return 5 * VECTOR_N / 1e6              # MFLOP
+
+
+def _hash_data():
+    if "hash" not in _data:
+        import numpy as np
+        _data["hash"] = (np.arange(HASH_N, dtype=np.uint64), np.empty(HASH_N, dtype=np.uint64))
+    return _data["hash"]
+
+
+def _integer_hash() -> float:
+    """splitmix64 finaliser over a uint64 array: multiplies, shifts and xors only."""
+    import numpy as np
+    keys, h = _hash_data()
+    np.add(keys, np.uint64(0x9E3779B97F4A7C15), out=h)
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return HASH_N / 1e6  # Mhashes
+
+
+def _sort_data():
+    if "sort" not in _data:
+        rng = random.Random(42)
+        _data["sort"] = [rng.random() for _ in range(SORT_N)]
+    return _data["sort"]
+
+
+def _branchy_sort() -> float:
+    """Interpreter-level comparison sort: unpredictable branches and pointer chasing."""
+    sorted(_sort_data())
+    return SORT_N / 1e6  # Mkeys
+
+
+def _compress_data():
+    if "compress" not in _data:
+        # semi-compressible: words from a small vocabulary in a random order
+        rng = random.Random(42)
+        words = [hashlib.md5(str(i).encode()).hexdigest()[: rng.randint(3, 10)] for i in range(2000)]
+        chunks, size = [], 0
+        while size < COMPRESS_BYTES:
+            w = rng.choice(words)
+            chunks.append(w)
+            size += len(w) + 1
+        _data["compress"] = " ".join(chunks).encode()[:COMPRESS_BYTES]
+    return _data["compress"]
+
+
+def _compression() -> float:
+    data = _compress_data()
+    zlib.decompress(zlib.compress(data, 6))
+    lzma.decompress(lzma.compress(data[: COMPRESS_BYTES // 8], preset=1))
+    return (len(data) + COMPRESS_BYTES // 8) / (1024 * 1024)  # MiB
+
+
+def _json_data():
+    if "json" not in _data:
+        rng = random.Random(42)
+        doc = [
+            {"id": i, "name": f"host-{i}", "tags": ["cpu", "gpu", str(i % 7)],
+             "score": rng.random() * 1000, "ok": i % 3 == 0, "meta": {"ram": 16, "temp": 41.5}}
+            for i in range(JSON_RECORDS)
+        ]
+        _data["json"] = json.dumps(doc)
+    return _data["json"]
+
+
+def _json_parse() -> float:
+    text = _json_data()
+    json.dumps(json.loads(text))
+    return len(text) / (1024 * 1024)  # MiB
+
+
+# Reference rates are roughly what one core of a current desktop CPU reaches (= 1000 points).
+register_kernel(CpuKernel("vector_float", _vector_float, "MFLOP/s", reference=2500.0, weight=1.0, setup=_vector_data, repeats=5))
+register_kernel(CpuKernel("integer_hash", _integer_hash, "Mhash/s", reference=200.0, weight=1.0, setup=_hash_data, repeats=5))
+register_kernel(CpuKernel("sort", _branchy_sort, "Mkeys/s", reference=5.0, weight=1.0, setup=_sort_data))
+register_kernel(CpuKernel("compression", _compression, "MiB/s", reference=40.0, weight=1.0, setup=_compress_data))
+register_kernel(CpuKernel("json", _json_parse, "MiB/s", reference=30.0, weight=1.0, setup=_json_data))
+# matmul is driven by run_cpu_suite() through the stress pool; run() is never called directly
+register_kernel(CpuKernel("matmul", lambda: 0.0, "GFLOPS", reference=200.0, weight=2.0))
+
+DEFAULT_KERNELS = ["matmul", "vector_float", "integer_hash", "sort", "compression", "json"]
+
+
+def validate_kernels(names: Optional[Iterable[str]]) -> List[str]:
+    """Normalise a kernel list (list or comma-separated string); raises ValueError on unknown names."""
+    if not names:
+        return list(DEFAULT_KERNELS)
+    if isinstance(names, str):
+        names = [n for n in names.split(",")]
+    cleaned = []
+    for n in names:
+        n = str(n).strip().lower()
+        if not n:
+            continue
+        if n not in KERNELS:
+            raise ValueError(f"Unknown CPU kernel '{n}'. Available: {', '.join(sorted(KERNELS))}")
+        if n not in cleaned:
+            cleaned.append(n)
+    return cleaned or list(DEFAULT_KERNELS)
+
+
+def composite_score(kernel_results: Dict[str, Dict]) -> float:
+    """Weighted geometric mean of kernel points."""
+    total_weight = 0.0
+    log_sum = 0.0
+    for name, result in kernel_results.items():
+        points = result.get("score", 0.0)
+        weight = KERNELS[name].weight if name in KERNELS else 1.0
+        if points <= 0:
+            continue
+        log_sum += weight * math.log(points)
+        total_weight += weight
+    return round(math.exp(log_sum / total_weight), 2) if total_weight else 0.0
+
+
+def run_cpu_suite(kernels: Optional[Iterable[str]] = None, duration_seconds: int = 10,
+                  progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Run the selected kernels and return:
+      {
+        "cpu_score": weighted composite points,
+        "kernels": {name: {"rate", "unit", "seconds", "score"}},
+        ...matmul stress fields (avg_cpu, timeline, gflops, ...) when matmul ran
+      }
+    """
+    from .utils import run_cpu_stress_test
+
+    names = validate_kernels(kernels)
+    results: Dict[str, Dict] = {}
+    stress: Dict = {}
+    for name in names:
+        if progress:
+            progress(name)
+        kernel = KERNELS[name]
+        if name == "matmul":
+            stress = run_cpu_stress_test(duration_seconds=duration_seconds)
+            result = {"rate": stress.get("gflops", 0.0), "unit": kernel.unit, "seconds": stress.get("duration", 0.0)}
+        else:
+            result = kernel.measure()
+        result["score"] = round(result["rate"] / kernel.reference * 1000.0, 2) if kernel.reference else 0.0
+        results[name] = result
+
+    suite = dict(stress)
+    suite.update({"cpu_score": composite_score(results), "kernels": results})
+    return suite
@@ -0,0 +1,143 @@
+# benchmarks/downsample.py
+"""
+Server-side decimation of benchmark timelines for charts.
+
+A chart a few hundred pixels wide cannot show thousands of samples, so the
+history/detail endpoints accept ?points=N and return at most N of the
+original samples:
+
+  - "lttb" (default): Largest-Triangle-Three-Buckets. Each bucket keeps the
+    sample forming the largest triangle with the previously kept sample and
+    the next bucket's average, which preserves the visual shape.
+  - "minmax": the lowest and highest sample of every bucket, computed for
+    all buckets at once. Nothing outside the kept envelope is dropped, so
+    every spike (thermal or otherwise) survives.
+
+Indices are picked per channel (cpu, gpu, temp; channels that never change
+are skipped) and the union is returned. The first and last sample are shared
+by every channel, so only the N - 2 interior slots are split between the
+channels; the union never exceeds N.
+Every kept sample is an unmodified original row, so the JSON shape is the
+usual metric row and peaks keep their exact value.
+
+Results are cached per (series row, last write, N, method); a re-run
+rewrites the series and so gets new keys.
+"""
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+
+from .response_cache import get_cache, stats
+from .series import to_samples
+
+METHODS = ("lttb", "minmax")
+CHART_CHANNELS = ("cpu", "gpu", "temp")
+MIN_POINTS = 3
+
+
+def lttb_indices(x, y, n: int):
+    """Indices of the n samples LTTB keeps (first and last always included)."""
+    import numpy as np
+
+    size = len(y)
+    if n >= size or n < MIN_POINTS:
+        return np.arange(size)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n - 2 buckets over the interior samples [1, size - 1)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:size - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:size - 1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y, n: int):
+    """Indices of each bucket's minimum and maximum (plus the end points), at most n of them."""
+    import numpy as np
+
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    y = np.asarray(y, dtype=np.float64)
+    if n < 4:
+        # room for at most one interior sample: the one furthest from the median, so a lone spike survives
+        spike = [int(np.argmax(np.abs(y - np.median(y))))] if n == 3 else []
+        return np.unique([0, *spike, size - 1])
+    buckets = (n - 2) // 2
+    width = -(-size // buckets)
+    buckets = -(-size // width)  # the padding stays inside the last bucket
+    pad = buckets * width - size
+    lows = np.concatenate([y, np.full(pad, np.inf)]).reshape(buckets, width)
+    highs = np.concatenate([y, np.full(pad, -np.inf)]).reshape(buckets, width)
+    starts = np.arange(buckets) * width
+    return np.unique(np.concatenate([
+        [0, size - 1], starts + lows.argmin(axis=1), starts + highs.argmax(axis=1),
+    ]))
+
+
+def select_indices(arrays: Dict, points: int, method: str = "lttb"):
+    import numpy as np
+
+    size = len(arrays["time"])
+    if points >= size:
+        return np.arange(size)
+    channels = [c for c in CHART_CHANNELS if c in arrays and np.ptp(arrays[c]) > 0] or ["cpu"]
+    share, extra = divmod(max(0, points - 2), len(channels))
+    picks = [np.array([0, size - 1])]
+    for i, c in enumerate(channels):
+        budget = share + (1 if i < extra else 0) + 2  # this channel's interior slots plus the shared end points
+        if budget < MIN_POINTS:
+            continue
+        picks.append(lttb_indices(arrays["time"], arrays[c], budget) if method == "lttb"
+                     else minmax_indices(arrays[c], budget))
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_series(series, points: int, method: str = "lttb") -> List[Dict]:
+    """Metric rows of `series` reduced to at most `points` samples."""
+    if series.length <= points:
+        return series.samples()
+    indices = select_indices(series.arrays(), points, method)
+    return to_samples(series.channels, series.length, series.encoding, series.data, indices=indices.tolist())
+
+
+def _key(series, points: int, method: str) -> str:
+    return f"bench:series:{series.pk}:{series.updated_at.timestamp()}:{points}:{method}"
+
+
+def downsampled_metrics(benchmarks: Iterable, points: int, method: str = "lttb") -> Dict[int, List[Dict]]:
+    """
+    {benchmark id: downsampled metric rows} for benchmarks loaded with
+    select_related("series"); one cache round trip for the whole batch.
+    """
+    series_by_id = {b.id: getattr(b, "series", None) for b in benchmarks}  # missing one-to-one -> None
+    keyed = {_key(s, points, method): bid for bid, s in series_by_id.items() if s is not None}
+
+    cache = get_cache()
+    found = cache.get_many(list(keyed))
+    result = {bid: [] for bid, s in series_by_id.items() if s is None}
+    missing = {}
+    for key, bid in keyed.items():
+        if key in found:
+            stats.record("series", hit=True)
+            result[bid] = found[key]
+        else:
+            stats.record("series", hit=False)
+            result[bid] = missing[key] = downsample_series(series_by_id[bid], points, method)
+    if missing:
+        cache.set_many(missing, getattr(settings, "BENCHMARK_SERIES_CACHE_TIMEOUT", 3600))
+    return result
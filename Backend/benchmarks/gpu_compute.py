@@ -0,0 +1,252 @@
+# benchmarks/gpu_compute.py
+"""
+Process-wide OpenCL compute sessions.
+
+Creating a context and queue, compiling a program and uploading input
+buffers cost from tens of milliseconds to seconds. None of that belongs
+inside a timed benchmark window, and none of it needs repeating per run. A
+ComputeSession is created once per device and keeps:
+
+  - the context and a profiling-enabled command queue (plus named extra
+    queues, e.g. for overlapping transfers with compute);
+  - built programs, keyed by source and build options. Each device binary is
+    also written to GPU_PROGRAM_CACHE_DIR, keyed by platform/device/driver
+    version, source and options, so a fresh process skips the compiler;
+  - named device buffers, reused while their size and flags match.
+
+Device selection (the GPU_COMPUTE_DEVICE setting or an explicit spec):
+  "auto"   first GPU, else accelerator; CPU devices only if GPU_COMPUTE_ALLOW_CPU
+  "gpu" / "cpu" / "accelerator"   first device of that type
+  "P:D"    platform P, device D as listed by list_devices()
+  other    first device whose name contains the text (case-insensitive)
+CPU OpenCL runtimes such as PoCL are ordinary devices here, so the compute
+path also runs on GPU-less machines and CI.
+
+pyopencl is optional: without it list_devices() is empty and get_session()
+returns None.
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _cl():
+    try:
+        import pyopencl as cl
+        return cl
+    except Exception:
+        return None
+
+
+def _device_type(cl, device) -> str:
+    if device.type & cl.device_type.GPU:
+        return "GPU"
+    if device.type & cl.device_type.ACCELERATOR:
+        return "ACCELERATOR"
+    if device.type & cl.device_type.CPU:
+        return "CPU"
+    return "OTHER"
+
+
+def describe(device) -> Dict:
+    cl = _cl()
+    return {
+        "name": device.name.strip(),
+        "type": _device_type(cl, device),
+        "vendor": device.vendor.strip(),
+        "platform": device.platform.name.strip(),
+        "driver_version": device.driver_version,
+        "compute_units": device.max_compute_units,
+        "max_clock_mhz": device.max_clock_frequency,
+        "global_mem_mb": device.global_mem_size // (1024 * 1024),
+    }
+
+
+def _all_devices() -> List[Tuple[str, object]]:
+    cl = _cl()
+    if cl is None:
+        return []
+    found = []
+    try:
+        platforms = cl.get_platforms()
+    except Exception:  # no ICD loader / no platforms installed
+        return []
+    for p_index, platform in enumerate(platforms):
+        try:
+            devices = platform.get_devices()
+        except Exception:
+            continue
+        for d_index, device in enumerate(devices):
+            found.append((f"{p_index}:{d_index}", device))
+    return found
+
+
+def list_devices() -> List[Dict]:
+    """Every OpenCL device, as {"id": "P:D", "name", "type", ...}."""
+    return [{"id": key, **describe(device)} for key, device in _all_devices()]
+
+
+def select_device(spec: Optional[str] = None) -> Optional[Tuple[str, object]]:
+    """(id, device) for a device spec (see module docstring), or None."""
+    cl = _cl()
+    devices = _all_devices()
+    if cl is None or not devices:
+        return None
+    spec = (spec or _setting("GPU_COMPUTE_DEVICE", "auto") or "auto").strip()
+    lowered = spec.lower()
+
+    def first_of(kind):
+        return next(((k, d) for k, d in devices if _device_type(cl, d) == kind), None)
+
+    if lowered == "auto":
+        choice = first_of("GPU") or first_of("ACCELERATOR")
+        if choice is None and _setting("GPU_COMPUTE_ALLOW_CPU", False):
+            choice = first_of("CPU")
+        return choice
+    if lowered in ("gpu", "cpu", "accelerator"):
+        return first_of(lowered.upper())
+    for key, device in devices:
+        if key == spec:
+            return key, device
+    return next(((k, d) for k, d in devices if lowered in d.name.lower()), None)
+
+
+class ComputeSession:
+    """Context, queue, built programs and device buffers of one OpenCL device."""
+
+    def __init__(self, device_id: str, device):
+        cl = _cl()
+        self.cl = cl
+        self.device_id = device_id
+        self.device = device
+        self.info = describe(device)
+        started = time.perf_counter()
+        self.context = cl.Context([device])
+        self.queue = cl.CommandQueue(self.context, device,
+                                     properties=cl.command_queue_properties.PROFILING_ENABLE)
+        self.setup_seconds = time.perf_counter() - started
+        self.lock = threading.RLock()  # one benchmark at a time per device
+        self._queues: Dict[str, object] = {}
+        self._programs: Dict[str, object] = {}
+        self._buffers: Dict[str, Tuple[int, int, object]] = {}
+        self.build_stats = {"memory_hits": 0, "disk_hits": 0, "compiles": 0, "last_build_seconds": 0.0}
+
+    def queue_for(self, name: str):
+        """Extra in-order profiling queue `name`; commands on different queues may run concurrently."""
+        with self.lock:
+            queue = self._queues.get(name)
+            if queue is None:
+                queue = self._queues[name] = self.cl.CommandQueue(
+                    self.context, self.device, properties=self.cl.command_queue_properties.PROFILING_ENABLE)
+            return queue
+
+    # --- programs ---
+    def _program_key(self, source: str, options: str) -> str:
+        platform = self.device.platform
+        identity = "\0".join([platform.name, platform.version, self.device.name, self.device.driver_version,
+                              self.device.version, options, source])
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        directory = _setting("GPU_PROGRAM_CACHE_DIR", None)
+        return Path(directory) / f"{key}.bin" if directory else None
+
+    def program(self, source: str, options: str = ""):
+        """Built program for `source`: from memory, else the on-disk binary cache, else the compiler."""
+        key = self._program_key(source, options)
+        with self.lock:
+            program = self._programs.get(key)
+            if program is not None:
+                self.build_stats["memory_hits"] += 1
+                return program
+
+            started = time.perf_counter()
+            path = self._cache_path(key)
+            if path is not None and path.exists():
+                try:
+                    program = self.cl.Program(self.context, [self.device], [path.read_bytes()]).build(options=options)
+                    self.build_stats["disk_hits"] += 1
+                except Exception:
+                    program = None  # stale or foreign binary: recompile below
+            if program is None:
+                program = self.cl.Program(self.context, source).build(options=options)
+                self.build_stats["compiles"] += 1
+                if path is not None:
+                    self._store_binary(path, program)
+            self.build_stats["last_build_seconds"] = round(time.perf_counter() - started, 4)
+            self._programs[key] = program
+            return program
+
+    def _store_binary(self, path: Path, program) -> None:
+        try:
+            binary = program.get_info(self.cl.program_info.BINARIES)[0]
+            if not binary:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(binary)
+            os.replace(tmp, path)  # atomic: concurrent processes never read half a binary
+        except Exception:
+            pass
+
+    # --- buffers ---
+    def buffer(self, name: str, nbytes: int, flags=None, host=None):
+        """
+        Device buffer `name`, reused while size and flags match. `host` (a
+        NumPy array, or a callable returning one) is copied in only when the
+        buffer is (re)created, so cached inputs are never regenerated.
+        """
+        cl = self.cl
+        flags = cl.mem_flags.READ_WRITE if flags is None else flags
+        with self.lock:
+            cached = self._buffers.get(name)
+            if cached and cached[0] == nbytes and cached[1] == int(flags):
+                return cached[2]
+            if cached:
+                cached[2].release()
+            if host is not None:
+                host = host() if callable(host) else host
+                buf = cl.Buffer(self.context, flags | cl.mem_flags.COPY_HOST_PTR, hostbuf=host)
+            else:
+                buf = cl.Buffer(self.context, flags, nbytes)
+            self._buffers[name] = (nbytes, int(flags), buf)
+            return buf
+
+    def release_buffers(self) -> None:
+        with self.lock:
+            for _, _, buf in self._buffers.values():
+                buf.release()
+            self._buffers.clear()
+
+
+_sessions: Dict[str, ComputeSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(spec: Optional[str] = None) -> Optional[ComputeSession]:
+    """Process-wide session for the device `spec` selects (None when there is no such device)."""
+    choice = select_device(spec)
+    if choice is None:
+        return None
+    device_id, device = choice
+    with _sessions_lock:
+        session = _sessions.get(device_id)
+        if session is None:
+            session = _sessions[device_id] = ComputeSession(device_id, device)
+    return session
+
+
+def clear_sessions() -> None:
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.release_buffers()
+        _sessions.clear()
@@ -0,0 +1,346 @@
+# benchmarks/gpu_kernels.py
+"""
+GPU benchmark suite (OpenCL).
+
+Every test runs on the device chosen by benchmarks/gpu_compute.py and is
+timed from OpenCL profiling events (command START/END on the device clock),
+so launch overhead, queue.finish() and utilisation polling never enter a
+measurement. A test runs once as warm-up, then repeats until its share of
+the time budget is used (at least MIN_REPEATS times), and the best repeat
+counts, as in cpu_kernels.py.
+
+  fma                independent float4 FMA chains held in registers; GFLOPS
+                     (2 flops per fma lane)
+  device_bandwidth   float4 copy between two device buffers larger than any
+                     GPU cache; GB/s read + written
+  transfer_pinned    host->device and device->host copies from a mapped
+                     ALLOC_HOST_PTR (page-locked) buffer; GB/s, mean of both
+  transfer_pageable  the same copies from an ordinary NumPy array, which the
+                     driver has to stage through its own pinned memory
+  overlap            pinned chunks streamed through a compute kernel with two
+                     device buffer slots and separate upload / compute /
+                     download queues, so chunk i+1 uploads while chunk i
+                     computes and chunk i-1 downloads; GB/s moved over the
+                     whole pipeline's span. "speedup" is the summed command
+                     time over that span (1.0 = nothing overlapped).
+
+Rates are scaled to points with each test's reference rate (1000 points =
+reference) and gpu_score is their weighted geometric mean. `scale` shrinks
+or grows every problem size, e.g. for CPU OpenCL devices in tests.
+"""
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+GB = 1e9
+
+FMA_WORK_ITEMS = 1 << 20
+FMA_ITERATIONS = 512
+FMA_FLOPS_PER_ITERATION = 8 * 4 * 2  # 8 float4 fmas per loop, 2 flops per lane
+BANDWIDTH_BYTES = 128 * 1024 * 1024   # per buffer
+TRANSFER_BYTES = 64 * 1024 * 1024
+OVERLAP_CHUNK_BYTES = 8 * 1024 * 1024
+OVERLAP_CHUNKS = 8
+OVERLAP_ITERATIONS = 64               # fmas per element, so compute and copies take comparable time
+
+SOURCE = """
+__kernel void fma_chain(__global float *out, const float a, const float b, const int iterations) {
+    const int gid = get_global_id(0);
+    float4 x0 = (float4)(gid, gid + 1, gid + 2, gid + 3) * 1e-7f;
+    float4 x1 = x0 + 0.25f, x2 = x0 + 0.5f, x3 = x0 + 0.75f;
+    for (int i = 0; i < iterations; i++) {
+        x0 = fma(x0, a, b); x1 = fma(x1, a, b); x2 = fma(x2, a, b); x3 = fma(x3, a, b);
+        x0 = fma(x0, a, b); x1 = fma(x1, a, b); x2 = fma(x2, a, b); x3 = fma(x3, a, b);
+    }
+    float4 s = x0 + x1 + x2 + x3;
+    out[gid] = s.x + s.y + s.z + s.w;  /* keeps every chain live */
+}
+
+__kernel void copy4(__global const float4 *src, __global float4 *dst) {
+    const int gid = get_global_id(0);
+    dst[gid] = src[gid];
+}
+
+__kernel void process4(__global const float4 *src, __global float4 *dst, const int iterations) {
+    const int gid = get_global_id(0);
+    float4 x = src[gid];
+    for (int i = 0; i < iterations; i++) {
+        x = fma(x, 0.999f, 0.001f);
+    }
+    dst[gid] = x;
+}
+"""
+
+
+class GpuTest:
+    """One sub-benchmark: `run(session, scale, budget)` returns at least {"rate", "seconds"}."""
+
+    def __init__(self, name: str, run: Callable, unit: str, reference: float, weight: float = 1.0):
+        self.name = name
+        self.run = run
+        self.unit = unit
+        self.reference = reference
+        self.weight = weight
+
+
+TESTS: Dict[str, GpuTest] = {}
+
+
+def register_test(test: GpuTest) -> GpuTest:
+    TESTS[test.name] = test
+    return test
+
+
+# --- timing ---
+def _span(events) -> float:
+    """Device seconds from the earliest START to the latest END of `events`."""
+    return (max(e.profile.end for e in events) - min(e.profile.start for e in events)) / 1e9
+
+
+def _busy(events) -> float:
+    """Summed device seconds of `events`, as if none of them had overlapped."""
+    return sum(e.profile.end - e.profile.start for e in events) / 1e9
+
+
+def _best(launch: Callable[[], List], budget: float, on_repeat: Optional[Callable[[], None]] = None) -> Dict:
+    """Run launch() (returns its events) once to warm up, then repeatedly; keep the shortest span."""
+    for event in launch():
+        event.wait()
+    best_events, best, repeats = None, None, 0
+    deadline = time.perf_counter() + budget
+    while repeats < MIN_REPEATS or (repeats < MAX_REPEATS and time.perf_counter() < deadline):
+        events = launch()
+        for event in events:
+            event.wait()
+        span = _span(events)
+        if best is None or span < best:
+            best, best_events = span, events
+        repeats += 1
+        if on_repeat:
+            on_repeat()
+    return {"seconds": best, "events": best_events, "repeats": repeats}
+
+
+def _elements(session, nbytes: float, buffers: int = 1, span: int = 1) -> int:
+    """
+    float32 count for a buffer of ~nbytes that fits the device (whole float4s):
+    `buffers` such buffers take at most half of global memory and `span` of
+    them still fit in one allocation.
+    """
+    device = session.device
+    limit = min(device.max_mem_alloc_size // span, device.global_mem_size // (2 * buffers))
+    return max(4, int(min(nbytes, limit)) // 16 * 4)
+
+
+def _ones(n: int):
+    import numpy as np
+    return np.ones(n, dtype=np.float32)
+
+
+def _kernel(session, name: str, *args):
+    kernel = session.cl.Kernel(session.program(SOURCE), name)
+    kernel.set_args(*args)
+    return kernel
+
+
+def _pinned(session, name: str, n: int):
+    """A mapped, page-locked host array of n float32 (unmap with array.base.release())."""
+    import numpy as np
+    cl = session.cl
+    buf = session.buffer(name, n * 4, cl.mem_flags.READ_WRITE | cl.mem_flags.ALLOC_HOST_PTR)
+    host, event = cl.enqueue_map_buffer(session.queue, buf, cl.map_flags.READ | cl.map_flags.WRITE,
+                                        0, (n,), np.float32)
+    event.wait()
+    return host
+
+
+# --- tests ---
+def _fma(session, scale: float, budget: float, on_repeat=None) -> Dict:
+    import numpy as np
+    items = max(64, int(FMA_WORK_ITEMS * scale))
+    out = session.buffer("suite.fma", items * 4, session.cl.mem_flags.WRITE_ONLY)
+    kernel = _kernel(session, "fma_chain", out, np.float32(0.9999), np.float32(0.0001), np.int32(FMA_ITERATIONS))
+    run = _best(lambda: [session.cl.enqueue_nd_range_kernel(session.queue, kernel, (items,), None)], budget, on_repeat)
+    flops = items * FMA_ITERATIONS * FMA_FLOPS_PER_ITERATION
+    return {"rate": round(flops / run["seconds"] / 1e9, 3), "seconds": round(run["seconds"], 6),
+            "repeats": run["repeats"]}
+
+
+def _device_bandwidth(session, scale: float, budget: float, on_repeat=None) -> Dict:
+    n = _elements(session, BANDWIDTH_BYTES * scale, buffers=2)
+    src = session.buffer("suite.bw.src", n * 4, host=lambda: _ones(n))
+    dst = session.buffer("suite.bw.dst", n * 4)
+    kernel = _kernel(session, "copy4", src, dst)
+    run = _best(lambda: [session.cl.enqueue_nd_range_kernel(session.queue, kernel, (n // 4,), None)], budget, on_repeat)
+    return {"rate": round(2 * n * 4 / run["seconds"] / GB, 3), "seconds": round(run["seconds"], 6),
+            "bytes": n * 4, "repeats": run["repeats"]}
+
+
+def _transfers(session, host, budget: float, on_repeat=None) -> Dict:
+    cl = session.cl
+    n = host.size
+    dev = session.buffer("suite.transfer", n * 4)
+    up = _best(lambda: [cl.enqueue_copy(session.queue, dev, host, is_blocking=False)], budget / 2, on_repeat)
+    down = _best(lambda: [cl.enqueue_copy(session.queue, host, dev, is_blocking=False)], budget / 2, on_repeat)
+    h2d = n * 4 / up["seconds"] / GB
+    d2h = n * 4 / down["seconds"] / GB
+    return {"rate": round((h2d + d2h) / 2, 3), "seconds": round(up["seconds"] + down["seconds"], 6),
+            "h2d_gbps": round(h2d, 3), "d2h_gbps": round(d2h, 3), "bytes": n * 4,
+            "repeats": up["repeats"] + down["repeats"]}
+
+
+def _transfer_pinned(session, scale: float, budget: float, on_repeat=None) -> Dict:
+    n = _elements(session, TRANSFER_BYTES * scale, buffers=2)
+    host = _pinned(session, "suite.pinned", n)
+    try:
+        host.fill(1.0)
+        return _transfers(session, host, budget, on_repeat)
+    finally:
+        host.base.release(session.queue)
+
+
+def _transfer_pageable(session, scale: float, budget: float, on_repeat=None) -> Dict:
+    n = _elements(session, TRANSFER_BYTES * scale, buffers=2)
+    return _transfers(session, _ones(n), budget, on_repeat)
+
+
+def _overlap(session, scale: float, budget: float, on_repeat=None) -> Dict:
+    import numpy as np
+    cl = session.cl
+    # four chunk buffers on the device plus two pinned host arrays of OVERLAP_CHUNKS chunks each
+    n = _elements(session, OVERLAP_CHUNK_BYTES * scale, buffers=4 + 2 * OVERLAP_CHUNKS, span=OVERLAP_CHUNKS)
+    upload, compute, download = session.queue_for("upload"), session.queue, session.queue_for("download")
+    host_in = _pinned(session, "suite.overlap.in", n * OVERLAP_CHUNKS)
+    host_out = _pinned(session, "suite.overlap.out", n * OVERLAP_CHUNKS)
+    host_in.fill(1.0)
+    slots = []
+    for s in range(2):
+        src = session.buffer(f"suite.overlap.src{s}", n * 4)
+        dst = session.buffer(f"suite.overlap.dst{s}", n * 4)
+        slots.append((src, dst, _kernel(session, "process4", src, dst, np.int32(OVERLAP_ITERATIONS))))
+
+    def launch():
+        events = []
+        computed, downloaded = [None, None], [None, None]
+        for i in range(OVERLAP_CHUNKS):
+            s = i % 2
+            src, dst, kernel = slots[s]
+            chunk = slice(i * n, (i + 1) * n)
+            # a slot is reused only after the kernel two chunks back has read src / its download has read dst
+            up = cl.enqueue_copy(upload, src, host_in[chunk], is_blocking=False,
+                                 wait_for=[computed[s]] if computed[s] else None)
+            run = cl.enqueue_nd_range_kernel(compute, kernel, (n // 4,), None,
+                                             wait_for=[up] + ([downloaded[s]] if downloaded[s] else []))
+            down = cl.enqueue_copy(download, host_out[chunk], dst, is_blocking=False, wait_for=[run])
+            computed[s], downloaded[s] = run, down
+            events += [up, run, down]
+        for queue in (upload, compute, download):
+            queue.flush()
+        return events
+
+    try:
+        run = _best(launch, budget, on_repeat)
+    finally:
+        host_in.base.release(session.queue)
+        host_out.base.release(session.queue)
+    moved = 2 * n * 4 * OVERLAP_CHUNKS
+    return {"rate": round(moved / run["seconds"] / GB, 3), "seconds": round(run["seconds"], 6),
+            "speedup": round(_busy(run["events"]) / run["seconds"], 3), "chunk_bytes": n * 4,
+            "chunks": OVERLAP_CHUNKS, "repeats": run["repeats"]}
+
+
+# Reference rates are roughly what a current mid-range desktop GPU on PCIe 4.0 reaches (= 1000 points).
+register_test(GpuTest("fma", _fma, "GFLOPS", reference=15000.0, weight=2.0))
+register_test(GpuTest("device_bandwidth", _device_bandwidth, "GB/s", reference=250.0, weight=2.0))
+register_test(GpuTest("transfer_pinned", _transfer_pinned, "GB/s", reference=12.0, weight=1.0))
+register_test(GpuTest("transfer_pageable", _transfer_pageable, "GB/s", reference=6.0, weight=0.5))
+register_test(GpuTest("overlap", _overlap, "GB/s", reference=10.0, weight=1.0))
+
+DEFAULT_TESTS = ["fma", "device_bandwidth", "transfer_pinned", "transfer_pageable", "overlap"]
+
+
+def validate_gpu_tests(names: Optional[Iterable[str]]) -> List[str]:
+    """Normalise a test list (list or comma-separated string); raises ValueError on unknown names."""
+    if not names:
+        return list(DEFAULT_TESTS)
+    if isinstance(names, str):
+        names = names.split(",")
+    cleaned = []
+    for n in names:
+        n = str(n).strip().lower()
+        if not n:
+            continue
+        if n not in TESTS:
+            raise ValueError(f"Unknown GPU test '{n}'. Available: {', '.join(sorted(TESTS))}")
+        if n not in cleaned:
+            cleaned.append(n)
+    return cleaned or list(DEFAULT_TESTS)
+
+
+def composite_score(results: Dict[str, Dict]) -> float:
+    """Weighted geometric mean of test points."""
+    total_weight = 0.0
+    log_sum = 0.0
+    for name, result in results.items():
+        points = result.get("score", 0.0)
+        weight = TESTS[name].weight if name in TESTS else 1.0
+        if points <= 0:
+            continue
+        log_sum += weight * math.log(points)
+        total_weight += weight
+    return round(math.exp(log_sum / total_weight), 2) if total_weight else 0.0
+
+
+def run_gpu_suite(tests: Optional[Iterable[str]] = None, device: Optional[str] = None, duration_seconds: float = 10,
+                  scale: float = 1.0, progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Run the selected tests on one OpenCL device and return:
+      {
+        "gpu_score": weighted composite points,
+        "kernels": {name: {"rate", "unit", "seconds", "score", ...}},
+        "avg_gpu": mean utilisation polled between repeats (0 if unavailable),
+        "duration": wall-clock seconds, "device": device description or None
+      }
+    """
+    from .gpu_compute import get_session
+    from .gpu_telemetry import read_gpu
+
+    names = validate_gpu_tests(tests)
+    started = time.perf_counter()
+    session = get_session(device)
+    if session is None:
+        return {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": 0.0, "device": None, "kernels": {}}
+
+    utilisation: List[float] = []
+
+    def poll():
+        # host-side, between timed commands; an in-process read, see benchmarks/gpu_telemetry.py
+        percent = read_gpu().get("gpu_percent")
+        if percent is not None:
+            utilisation.append(percent)
+
+    budget = float(duration_seconds) / len(names)
+    results: Dict[str, Dict] = {}
+    with session.lock:
+        prepared = time.perf_counter()
+        session.program(SOURCE)  # compile (or load) once, outside every measurement
+        setup_seconds = time.perf_counter() - prepared
+        for name in names:
+            if progress:
+                progress(name)
+            test = TESTS[name]
+            result = test.run(session, scale, budget, poll)
+            result["unit"] = test.unit
+            result["score"] = round(result["rate"] / test.reference * 1000.0, 2) if test.reference else 0.0
+            results[name] = result
+
+    return {
+        "gpu_score": composite_score(results),
+        "kernels": results,
+        "avg_gpu": round(sum(utilisation) / len(utilisation), 2) if utilisation else 0.0,
+        "duration": round(time.perf_counter() - started, 2),
+        "device": {"id": session.device_id, **session.info},
+        "setup_seconds": round(setup_seconds, 4),
+    }
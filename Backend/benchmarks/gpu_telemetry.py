@@ -0,0 +1,290 @@
+# benchmarks/gpu_telemetry.py
+"""
+Pluggable GPU telemetry (utilisation, temperature, VRAM).
+
+GPUtil runs nvidia-smi for every query, which takes tens to hundreds of
+milliseconds of subprocess work. When the telemetry sampler, the runner or a
+benchmark loop polls it, that work competes with the measurement. A provider
+here opens its handles once and answers read() in-process:
+
+  nvml    NVIDIA, through the NVML bindings (`pip install nvidia-ml-py`);
+          one nvmlInit() and a cached device handle
+  sysfs   Linux DRM drivers: amdgpu's gpu_busy_percent and mem_info_vram_*,
+          i915/xe busy time derived from the GT's RC6 residency counter, and
+          the card's hwmon temperature. Every attribute is opened once and
+          re-read with os.pread(fd, ..., 0), so a read is a few syscalls
+  gputil  last resort (e.g. Windows without NVML bindings): GPUtil, at most
+          one nvidia-smi call per GPU_TELEMETRY_SLOW_INTERVAL, cached between
+  fake    fixed values, set with set(); for tests
+  none    nothing to report
+
+GPU_TELEMETRY_PROVIDER picks one; "auto" tries nvml, sysfs, gputil in that
+order and keeps the first that finds a device. GPU_TELEMETRY_DEVICE is the
+index among the devices the provider sees.
+
+read() always returns {"gpu_percent", "temp_c", "vram_used_mb",
+"vram_total_mb", "name"}; anything the backend cannot tell is None.
+"""
+import glob
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .sensors import open_first
+
+FIELDS = ("gpu_percent", "temp_c", "vram_used_mb", "vram_total_mb", "name")
+MB = 1024 * 1024
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _empty() -> Dict:
+    return dict.fromkeys(FIELDS)
+
+
+class GpuTelemetryProvider:
+    """A backend: open handles in __init__ (raise if there is no device), then answer read() cheaply."""
+
+    name = "none"
+
+    def read(self) -> Dict:
+        return _empty()
+
+    def close(self) -> None:
+        pass
+
+
+class NvmlProvider(GpuTelemetryProvider):
+    name = "nvml"
+
+    def __init__(self, index: int = 0):
+        import pynvml
+        self.nvml = pynvml
+        pynvml.nvmlInit()
+        try:
+            self.handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            name = pynvml.nvmlDeviceGetName(self.handle)
+        except Exception:
+            pynvml.nvmlShutdown()
+            raise
+        self.device_name = name.decode() if isinstance(name, bytes) else name
+
+    def read(self) -> Dict:
+        nvml = self.nvml
+        reading = _empty()
+        reading["name"] = self.device_name
+        try:
+            reading["gpu_percent"] = float(nvml.nvmlDeviceGetUtilizationRates(self.handle).gpu)
+        except nvml.NVMLError:
+            pass
+        try:
+            reading["temp_c"] = float(nvml.nvmlDeviceGetTemperature(self.handle, nvml.NVML_TEMPERATURE_GPU))
+        except nvml.NVMLError:
+            pass
+        try:
+            memory = nvml.nvmlDeviceGetMemoryInfo(self.handle)
+            reading["vram_used_mb"] = memory.used // MB
+            reading["vram_total_mb"] = memory.total // MB
+        except nvml.NVMLError:
+            pass
+        return reading
+
+    def close(self) -> None:
+        try:
+            self.nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+class SysfsProvider(GpuTelemetryProvider):
+    name = "sysfs"
+    DRIVERS = ("amdgpu", "i915", "xe")
+    RC6_MIN_WINDOW_MS = 100.0
+
+    def __init__(self, index: int = 0, root: str = "/sys/class/drm"):
+        cards = []
+        for card in sorted(glob.glob(os.path.join(root, "card[0-9]*"))):
+            if "-" in os.path.basename(card):  # connectors such as card0-DP-1
+                continue
+            driver = os.path.basename(os.path.realpath(os.path.join(card, "device", "driver")))
+            if driver in self.DRIVERS:
+                cards.append((card, driver))
+        if index >= len(cards):
+            raise LookupError(f"No amdgpu/i915/xe card #{index} under {root}")
+        card, self.driver = cards[index]
+        device = os.path.join(card, "device")
+        self.device_name = f"{self.driver} ({os.path.basename(card)})"
+        self._lock = threading.Lock()
+
+        self.busy = open_first(os.path.join(device, "gpu_busy_percent"))
+        self.vram_used = open_first(os.path.join(device, "mem_info_vram_used"))
+        self.vram_total = open_first(os.path.join(device, "mem_info_vram_total"))
+        self.temp = open_first(os.path.join(device, "hwmon", "hwmon*", "temp1_input"))
+        # i915/xe have no busy attribute: busy = 1 - RC6 (idle) residency over wall time
+        self.rc6 = None if self.busy else open_first(
+            os.path.join(card, "gt", "gt0", "rc6_residency_ms"),
+            os.path.join(card, "power", "rc6_residency_ms"),
+            os.path.join(device, "tile0", "gt0", "gtidle", "idle_residency_ms"),
+        )
+        self._rc6_last = None
+        self._rc6_busy_percent = None
+
+    def _rc6_busy(self) -> Optional[float]:
+        idle_ms = self.rc6.value()
+        now_ms = time.monotonic() * 1000.0
+        if idle_ms is None:
+            return None
+        with self._lock:
+            if self._rc6_last is None:
+                self._rc6_last = (now_ms, idle_ms)  # the first read only primes the counter
+            elif now_ms - self._rc6_last[0] >= self.RC6_MIN_WINDOW_MS:
+                last_ms, last_idle = self._rc6_last
+                busy = 1.0 - (idle_ms - last_idle) / (now_ms - last_ms)
+                self._rc6_busy_percent = round(min(100.0, max(0.0, busy * 100.0)), 2)
+                self._rc6_last = (now_ms, idle_ms)
+            # readers closer together than the window share the last estimate
+            return self._rc6_busy_percent
+
+    def read(self) -> Dict:
+        reading = _empty()
+        reading["name"] = self.device_name
+        if self.busy:
+            busy = self.busy.value()
+            reading["gpu_percent"] = float(busy) if busy is not None else None
+        elif self.rc6:
+            reading["gpu_percent"] = self._rc6_busy()
+        if self.temp:
+            millidegrees = self.temp.value()
+            reading["temp_c"] = millidegrees / 1000.0 if millidegrees is not None else None
+        for key, attribute in (("vram_used_mb", self.vram_used), ("vram_total_mb", self.vram_total)):
+            value = attribute.value() if attribute else None
+            reading[key] = value // MB if value is not None else None
+        return reading
+
+    def close(self) -> None:
+        for attribute in (self.busy, self.vram_used, self.vram_total, self.temp, self.rc6):
+            if attribute:
+                attribute.close()
+
+
+class GPUtilProvider(GpuTelemetryProvider):
+    name = "gputil"
+
+    def __init__(self, index: int = 0, min_interval: float = 2.0):
+        import GPUtil
+        self.gputil = GPUtil
+        self.index = index
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._cached = None
+        self._cached_at = 0.0
+        if self._query() is None:
+            raise LookupError("GPUtil sees no GPU")
+
+    def _query(self) -> Optional[Dict]:
+        gpus = self.gputil.getGPUs()
+        if len(gpus) <= self.index:
+            return None
+        gpu = gpus[self.index]
+        self._cached = {
+            "gpu_percent": round(gpu.load * 100, 2),
+            "temp_c": getattr(gpu, "temperature", None),
+            "vram_used_mb": int(gpu.memoryUsed) if getattr(gpu, "memoryUsed", None) else None,
+            "vram_total_mb": int(gpu.memoryTotal) if getattr(gpu, "memoryTotal", None) else None,
+            "name": getattr(gpu, "name", None),
+        }
+        self._cached_at = time.monotonic()
+        return self._cached
+
+    def read(self) -> Dict:
+        with self._lock:
+            if time.monotonic() - self._cached_at >= self.min_interval:
+                try:
+                    self._query()
+                except Exception:
+                    pass
+            return dict(self._cached or _empty())
+
+
+class FakeProvider(GpuTelemetryProvider):
+    name = "fake"
+
+    def __init__(self, index: int = 0, **values):
+        self.values = {"gpu_percent": 0.0, "temp_c": 40.0, "vram_used_mb": 512, "vram_total_mb": 8192,
+                       "name": "Fake GPU"}
+        self.values.update(values)
+        self.reads = 0
+
+    def set(self, **values) -> None:
+        self.values.update(values)
+
+    def read(self) -> Dict:
+        self.reads += 1
+        return dict(self.values)
+
+
+PROVIDERS = {
+    "nvml": NvmlProvider,
+    "sysfs": SysfsProvider,
+    "gputil": GPUtilProvider,
+    "fake": FakeProvider,
+    "none": GpuTelemetryProvider,
+}
+AUTO_ORDER = ("nvml", "sysfs", "gputil")
+
+
+def create_provider(name: str = "auto", index: int = 0) -> GpuTelemetryProvider:
+    """Open the named provider; "auto" returns the first of AUTO_ORDER that finds a device (else "none")."""
+    name = (name or "auto").lower()
+    if name != "auto":
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown GPU telemetry provider '{name}'. Available: auto, {', '.join(PROVIDERS)}")
+        if name == "none":
+            return GpuTelemetryProvider()
+        if name == "gputil":
+            return GPUtilProvider(index, min_interval=_setting("GPU_TELEMETRY_SLOW_INTERVAL", 2.0))
+        return PROVIDERS[name](index)
+    for candidate in AUTO_ORDER:
+        try:
+            return create_provider(candidate, index)
+        except Exception:
+            continue
+    return GpuTelemetryProvider()
+
+
+_provider: Optional[GpuTelemetryProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> GpuTelemetryProvider:
+    """Process-wide provider chosen by GPU_TELEMETRY_PROVIDER, opened on first use."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            try:
+                _provider = create_provider(_setting("GPU_TELEMETRY_PROVIDER", "auto"),
+                                            _setting("GPU_TELEMETRY_DEVICE", 0))
+            except Exception:
+                _provider = GpuTelemetryProvider()
+        return _provider
+
+
+def reset_provider() -> None:
+    """Close the current provider; the next get_provider() opens one from the current settings."""
+    global _provider
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = None
+
+
+def read_gpu() -> Dict:
+    try:
+        return get_provider().read()
+    except Exception:
+        return _empty()
@@ -0,0 +1,138 @@
+# benchmarks/hardware.py
+"""
+Canonical hardware identity for grouping benchmarks.
+
+Collectors report the same chip under several spellings: cpuinfo's brand_raw
+("Intel(R) Core(TM) i7-9700K CPU @ 3.60GHz"), WMI names, GPUtil names and
+pci.ids entries ("NVIDIA GA102 [GeForce RTX 3080]"). The functions below
+reduce each to one canonical string, and RAM to its nominal module size, so
+that every run on the same hardware lands in one HardwareProfile and peer
+lookups become an integer join on Benchmark.profile_id.
+
+The canonicalisers are pure functions (the data migration uses them too);
+get_or_create_profile() is the only part that touches the database.
+"""
+import re
+from typing import Optional
+
+UNKNOWN_CPU = "Unknown CPU"
+UNKNOWN_GPU = "Unknown GPU"
+
+# Marketed memory sizes; usable RAM reported by the OS is a little below these.
+NOMINAL_RAM_GB = [1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512, 768, 1024]
+
+CPU_VENDORS = {
+    "genuineintel": "Intel", "intel": "Intel",
+    "authenticamd": "AMD", "amd": "AMD",
+    "apple": "Apple", "qualcomm": "Qualcomm",
+}
+GPU_VENDORS = {
+    "nvidia corporation": "NVIDIA", "nvidia": "NVIDIA",
+    "advanced micro devices, inc. [amd/ati]": "AMD", "amd/ati": "AMD", "ati": "AMD", "amd": "AMD",
+    "intel corporation": "Intel", "intel": "Intel",
+    "apple": "Apple",
+}
+
+_TRADEMARKS = re.compile(r"\((?:r|tm|c)\)|[®™©]", re.IGNORECASE)
+_CPU_NOISE = [
+    re.compile(r"^\d+(?:st|nd|rd|th)\s+gen\s+", re.IGNORECASE),                 # "13th Gen Intel ..."
+    re.compile(r"@\s*[\d.]+\s*[gm]hz", re.IGNORECASE),                           # "@ 3.60GHz"
+    re.compile(r"\b\d+(?:\.\d+)?\s*[gm]hz\b", re.IGNORECASE),                      # trailing clock
+    re.compile(r"\b(?:\w+-core|\d+\s*-?\s*cores?)\b(?:\s+processor)?", re.IGNORECASE),  # "8-Core Processor"
+    re.compile(r"\bwith\s+radeon(?:\s+\w+)*\s+graphics\b", re.IGNORECASE),       # APU suffix
+    re.compile(r"\b(?:cpu|processor)\b", re.IGNORECASE),
+]
+_GPU_NOISE = [
+    re.compile(r"\bgraphics\s+(?:adapter|controller)\b", re.IGNORECASE),
+    re.compile(r"\(rev\s+\w+\)", re.IGNORECASE),
+]
+_SPACES = re.compile(r"\s+")
+
+
+def _clean(text: str) -> str:
+    text = _TRADEMARKS.sub(" ", text or "")
+    return _SPACES.sub(" ", text).strip(" ,-")
+
+
+def _split_vendor(text: str, vendors: dict):
+    lower = text.lower()
+    for raw in sorted(vendors, key=len, reverse=True):
+        if lower == raw or lower.startswith(raw + " "):
+            return vendors[raw], text[len(raw):].strip()
+    return None, text
+
+
+def canonical_cpu(raw: Optional[str]) -> str:
+    """'Intel(R) Core(TM) i7-9700K CPU @ 3.60GHz' -> 'Intel Core i7-9700K'."""
+    text = _clean(raw or "")
+    if not text or text.lower() in ("standard", "unknown", UNKNOWN_CPU.lower()):
+        return UNKNOWN_CPU
+    for pattern in _CPU_NOISE:
+        text = pattern.sub(" ", text)
+    text = _clean(text)
+    vendor, rest = _split_vendor(text, CPU_VENDORS)
+    if vendor is None:
+        if re.match(r"(?i)(core|xeon|pentium|celeron|atom)\b", rest):
+            vendor = "Intel"
+        elif re.match(r"(?i)(ryzen|epyc|athlon|threadripper|phenom)\b", rest):
+            vendor = "AMD"
+    return f"{vendor} {rest}".strip() if vendor else rest
+
+
+def canonical_gpu(raw: Optional[str]) -> str:
+    """'NVIDIA GA102 [GeForce RTX 3080]' / 'NVIDIA GeForce RTX 3080' -> 'NVIDIA GeForce RTX 3080'."""
+    text = _clean(raw or "")
+    if not text or text.lower() in ("standard", "unknown", "none", UNKNOWN_GPU.lower()):
+        return UNKNOWN_GPU
+    vendor, rest = _split_vendor(text, GPU_VENDORS)
+    # pci.ids names carry the marketing name in brackets after the chip codename
+    bracket = re.search(r"\[([^\]]+)\]", rest)
+    if bracket:
+        rest = bracket.group(1).split("/")[0]
+    for pattern in _GPU_NOISE:
+        rest = pattern.sub(" ", rest)
+    rest = _clean(rest)
+    if vendor is None:
+        if re.match(r"(?i)(geforce|quadro|tesla|titan|rtx)\b", rest):
+            vendor = "NVIDIA"
+        elif re.match(r"(?i)radeon\b", rest):
+            vendor = "AMD"
+        elif re.match(r"(?i)(arc|iris|uhd|hd graphics)\b", rest):
+            vendor = "Intel"
+    return f"{vendor} {rest}".strip() if vendor and rest else (vendor or rest or UNKNOWN_GPU)
+
+
+def nominal_ram_gb(ram_gb: Optional[float]) -> int:
+    """Usable RAM (e.g. 15.6) -> marketed size (16); 0 when unknown."""
+    try:
+        ram = float(ram_gb or 0)
+    except (TypeError, ValueError):
+        return 0
+    if ram <= 0:
+        return 0
+    for size in NOMINAL_RAM_GB:
+        if size >= ram * 0.97:  # firmware/iGPU reservations take a few percent
+            return size
+    return int(-(-ram // 64) * 64)
+
+
+def get_or_create_profile(cpu_model: Optional[str], gpu_model: Optional[str], ram_gb: Optional[float]):
+    from .models import HardwareProfile
+
+    profile, _ = HardwareProfile.objects.get_or_create(
+        cpu_model=canonical_cpu(cpu_model),
+        gpu_model=canonical_gpu(gpu_model),
+        ram_gb=nominal_ram_gb(ram_gb),
+    )
+    return profile
+
+
+def find_profile(cpu_model: Optional[str], gpu_model: Optional[str], ram_gb: Optional[float]):
+    """Existing profile for raw names/RAM, or None (never creates one)."""
+    from .models import HardwareProfile
+
+    return HardwareProfile.objects.filter(
+        cpu_model=canonical_cpu(cpu_model),
+        gpu_model=canonical_gpu(gpu_model),
+        ram_gb=nominal_ram_gb(ram_gb),
+    ).first()
@@ -0,0 +1,267 @@
+# benchmarks/jobs.py
+"""
+DB-backed benchmark job queue and the local worker pool that drains it.
+
+POST /api/benchmarks/run/ only inserts a BenchmarkJob row; a worker thread
+claims it with a conditional UPDATE (so several processes can share the same
+table), runs benchmarks.runner.execute_benchmark and writes progress, partial
+results and the final payload back to the row. Jobs left "running" by a dead
+worker are re-queued once their heartbeat goes stale, so queued work survives
+a restart.
+"""
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BenchmarkJob
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_benchmark_job(user, bench_type: str = "cpu", params: Optional[Dict] = None) -> BenchmarkJob:
+    """Insert a queued job and make sure a local worker is awake to pick it up."""
+    job = BenchmarkJob.objects.create(
+        user=user,
+        type=(bench_type or "cpu").lower(),
+        params=params or {},
+    )
+    if _setting("BENCHMARK_WORKER_AUTOSTART", True):
+        get_worker_pool().wake()
+    return job
+
+
+def claim_next_job(worker_id: str) -> Optional[BenchmarkJob]:
+    """
+    Atomically move the oldest queued job to "running" for this worker.
+    The status check in the UPDATE makes the claim safe across threads and processes.
+    """
+    candidates = (BenchmarkJob.objects
+                  .filter(status=BenchmarkJob.STATUS_QUEUED)
+                  .order_by("created_at", "id")
+                  .values_list("id", flat=True)[:5])
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = BenchmarkJob.objects.filter(id=job_id, status=BenchmarkJob.STATUS_QUEUED).update(
+            status=BenchmarkJob.STATUS_RUNNING,
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return BenchmarkJob.objects.select_related("user").get(id=job_id)
+    return None
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Return "running" jobs whose worker disappeared to the queue.
+
+    A job is orphaned when its heartbeat is older than BENCHMARK_JOB_STALE_SECONDS,
+    or immediately when it was claimed on this host by a process that no longer exists.
+    Jobs that already used BENCHMARK_JOB_MAX_ATTEMPTS are marked failed instead.
+    """
+    import psutil
+
+    stale_after = timedelta(seconds=_setting("BENCHMARK_JOB_STALE_SECONDS", 300))
+    max_attempts = _setting("BENCHMARK_JOB_MAX_ATTEMPTS", 3)
+    host = socket.gethostname()
+    cutoff = timezone.now() - stale_after
+
+    orphaned = []
+    for job in BenchmarkJob.objects.filter(status=BenchmarkJob.STATUS_RUNNING).only("id", "worker_id", "heartbeat_at", "attempts"):
+        w_host, _, rest = job.worker_id.partition(":")
+        pid = rest.split(":")[0]
+        dead_local = w_host == host and pid.isdigit() and not psutil.pid_exists(int(pid))
+        if dead_local or job.heartbeat_at is None or job.heartbeat_at < cutoff:
+            orphaned.append(job)
+
+    count = 0
+    for job in orphaned:
+        base = BenchmarkJob.objects.filter(id=job.id, status=BenchmarkJob.STATUS_RUNNING, worker_id=job.worker_id)
+        if job.attempts >= max_attempts:
+            count += base.update(status=BenchmarkJob.STATUS_FAILED, finished_at=timezone.now(),
+                                 error="Worker died while running this job.")
+        else:
+            count += base.update(status=BenchmarkJob.STATUS_QUEUED, worker_id="", stage="requeued")
+    return count
+
+
+class JobReporter:
+    """Progress callback handed to execute_benchmark; each call also refreshes the heartbeat."""
+
+    def __init__(self, job: BenchmarkJob):
+        self.job = job
+
+    def __call__(self, percent: float, stage: str, **partial) -> None:
+        job = self.job
+        job.progress = float(percent)
+        job.stage = stage
+        if partial:
+            job.partial_results = {**(job.partial_results or {}), **partial}
+        job.heartbeat_at = timezone.now()
+        BenchmarkJob.objects.filter(id=job.id).update(
+            progress=job.progress, stage=job.stage,
+            partial_results=job.partial_results, heartbeat_at=job.heartbeat_at,
+        )
+
+
+class JobHeartbeat:
+    """
+    Context manager that refreshes a running job's heartbeat from a daemon thread.
+    The interval is capped at a third of BENCHMARK_JOB_STALE_SECONDS so a live job
+    can miss two beats before requeue_stale_jobs treats it as orphaned.
+    """
+
+    def __init__(self, job: BenchmarkJob, interval: Optional[float] = None):
+        self.job = job
+        stale = _setting("BENCHMARK_JOB_STALE_SECONDS", 300)
+        interval = interval if interval is not None else _setting("BENCHMARK_JOB_HEARTBEAT_SECONDS", 30.0)
+        self.interval = max(0.01, min(float(interval), stale / 3.0))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def beat(self) -> int:
+        return BenchmarkJob.objects.filter(
+            id=self.job.id, status=BenchmarkJob.STATUS_RUNNING, worker_id=self.job.worker_id,
+        ).update(heartbeat_at=timezone.now())
+
+    def _loop(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.beat()
+                except Exception:
+                    logger.exception("Heartbeat of benchmark job %s failed", self.job.id)
+        finally:
+            connection.close()
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread = threading.Thread(target=self._loop, name=f"benchmark-heartbeat-{self.job.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_job(job: BenchmarkJob) -> None:
+    """Execute a claimed job and record its outcome on the row."""
+    from .runner import execute_benchmark
+
+    try:
+        with JobHeartbeat(job):
+            outcome = execute_benchmark(job.user, job.type, job.params, progress=JobReporter(job))
+        BenchmarkJob.objects.filter(id=job.id).update(
+            status=BenchmarkJob.STATUS_DONE,
+            progress=100.0,
+            stage="done",
+            result=outcome["data"],
+            benchmark=outcome["benchmark"],
+            finished_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.exception("Benchmark job %s failed", job.id)
+        BenchmarkJob.objects.filter(id=job.id).update(
+            status=BenchmarkJob.STATUS_FAILED,
+            stage="failed",
+            error=str(e),
+            finished_at=timezone.now(),
+        )
+
+
+class BenchmarkWorkerPool:
+    """
+    A few daemon threads that poll the job table. Stress tests already use every
+    core, so the default pool size is 1; raise BENCHMARK_WORKERS to run jobs side by side.
+    """
+
+    def __init__(self, size: int = 1, poll_interval: float = 2.0):
+        self.size = max(1, int(size))
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._threads = []
+            self._prewarm()
+            for i in range(self.size):
+                t = threading.Thread(target=self._loop, args=(i,), name=f"benchmark-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=timeout)
+
+    def wake(self) -> None:
+        self.start()
+        self._wake.set()
+
+    def _prewarm(self) -> None:
+        if _setting("BENCHMARK_CPU_POOL_PREWARM", True):
+            from .stress_pool import prewarm_cpu_pool
+            prewarm_cpu_pool()
+
+    def _worker_id(self, index: int) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def _loop(self, index: int) -> None:
+        worker_id = self._worker_id(index)
+        while not self._stop.is_set():
+            job = None
+            try:
+                close_old_connections()
+                requeue_stale_jobs()
+                job = claim_next_job(worker_id)
+                if job is not None:
+                    run_job(job)
+            except Exception:
+                logger.exception("Benchmark worker %s failed to poll the job queue", worker_id)
+            finally:
+                close_old_connections()
+
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+_pool: Optional[BenchmarkWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> BenchmarkWorkerPool:
+    """Process-wide worker pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BenchmarkWorkerPool(
+                size=_setting("BENCHMARK_WORKERS", 1),
+                poll_interval=_setting("BENCHMARK_JOB_POLL_SECONDS", 2.0),
+            )
+        return _pool
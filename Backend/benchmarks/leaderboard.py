@@ -0,0 +1,103 @@
+# benchmarks/leaderboard.py
+"""
+Hardware-group leaderboard queries.
+
+A group is every Benchmark attached to the same HardwareProfile (canonical
+CPU, GPU and nominal RAM, see benchmarks/hardware.py). Lookups resolve the
+profile id(s) once and then work on the (profile, overall_score) index:
+the top of a group is an index walk from its highest score, and a rank is a
+COUNT(*) of the index entries scoring higher, so nothing is loaded into
+Python and memory use does not grow with the group.
+
+Each profile also carries a DDSketch per score field (benchmarks/sketch.py),
+updated incrementally whenever a Benchmark is saved or deleted, so
+percentiles and p50/p90/p99 peer scores cost one row read.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .hardware import canonical_cpu, canonical_gpu, nominal_ram_gb
+from .models import Benchmark, HardwareProfile
+from .sketch import DDSketch
+
+SKETCHED_FIELDS = ("overall_score", "cpu_score", "gpu_score")
+
+
+def group_profile_ids(cpu_model: str, gpu_model: str, ram_gb: Optional[float] = None) -> List[int]:
+    """Profiles matching raw CPU/GPU names; every RAM size unless `ram_gb` is given."""
+    profiles = HardwareProfile.objects.filter(cpu_model=canonical_cpu(cpu_model), gpu_model=canonical_gpu(gpu_model))
+    if ram_gb is not None:
+        profiles = profiles.filter(ram_gb=nominal_ram_gb(ram_gb))
+    return list(profiles.values_list("id", flat=True))
+
+
+def hardware_group(profile_ids: List[int]) -> QuerySet:
+    if len(profile_ids) == 1:
+        return Benchmark.objects.filter(profile_id=profile_ids[0])  # plain equality keeps the index ordered
+    return Benchmark.objects.filter(profile_id__in=profile_ids)
+
+
+def rank_in_group(group: QuerySet, score: float, field: str = "overall_score") -> int:
+    """1-based rank of `score` in `group` (ties share the better rank)."""
+    return group.filter(**{f"{field}__gt": score}).count() + 1
+
+
+def top_in_group(group: QuerySet, limit: int = 5, field: str = "overall_score") -> QuerySet:
+    return (group.order_by(f"-{field}")
+            .select_related("profile", "series").defer("profile__score_sketches")
+            .prefetch_related("scaling_points")[:limit])
+
+
+# --- per-group score sketches ---
+def adjust_sketches(profile_id: Optional[int], scores: Dict[str, float], count: int) -> None:
+    """Add (count=1) or remove (count=-1) one benchmark's scores from its profile's sketches."""
+    if profile_id is None:
+        return
+    with transaction.atomic():
+        profile = HardwareProfile.objects.select_for_update().filter(id=profile_id).only("id", "score_sketches").first()
+        if profile is None:
+            return
+        data = dict(profile.score_sketches or {})
+        for field in SKETCHED_FIELDS:
+            sketch = DDSketch.from_dict(data.get(field))
+            sketch.add(scores.get(field) or 0.0, count)
+            data[field] = sketch.to_dict()
+        HardwareProfile.objects.filter(id=profile_id).update(score_sketches=data)
+
+
+def build_sketches(rows: Iterable[Dict[str, float]]) -> Dict[str, Dict]:
+    sketches = {field: DDSketch() for field in SKETCHED_FIELDS}
+    for row in rows:
+        for field in SKETCHED_FIELDS:
+            sketches[field].add(row.get(field) or 0.0)
+    return {field: sketch.to_dict() for field, sketch in sketches.items()}
+
+
+def rebuild_sketches(profile_id: int) -> None:
+    """Recompute a profile's sketches from its rows (after bulk_create/update, which skip signals)."""
+    rows = Benchmark.objects.filter(profile_id=profile_id).values(*SKETCHED_FIELDS).iterator(chunk_size=2000)
+    HardwareProfile.objects.filter(id=profile_id).update(score_sketches=build_sketches(rows))
+
+
+def group_sketches(profile_ids: List[int]) -> Dict[str, DDSketch]:
+    """Merged sketches of one or more profiles (one query, independent of group size)."""
+    merged = {field: DDSketch() for field in SKETCHED_FIELDS}
+    for data in HardwareProfile.objects.filter(id__in=profile_ids).values_list("score_sketches", flat=True):
+        for field in SKETCHED_FIELDS:
+            merged[field].merge(DDSketch.from_dict((data or {}).get(field)))
+    return merged
+
+
+def score_distribution(sketch: DDSketch, score: Optional[float] = None) -> Dict:
+    """Peer quantiles and, given a score, its percentile in the group."""
+    rounded = lambda v: round(v, 2) if v is not None else None  # noqa: E731
+    return {
+        "count": sketch.count,
+        "p50": rounded(sketch.quantile(0.5)),
+        "p90": rounded(sketch.quantile(0.9)),
+        "p99": rounded(sketch.quantile(0.99)),
+        "max": rounded(sketch.quantile(1.0)),
+        "percentile": sketch.percentile_of(score) if score is not None else None,
+    }
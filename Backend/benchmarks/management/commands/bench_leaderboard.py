@@ -0,0 +1,102 @@
+# benchmarks/management/commands/bench_leaderboard.py
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from benchmarks.hardware import get_or_create_profile
+from benchmarks.leaderboard import group_profile_ids, hardware_group, rank_in_group, rebuild_sketches
+from benchmarks.models import Benchmark
+from benchmarks.response_cache import invalidate_group
+from benchmarks.views import compare_benchmarks
+
+CPU = "Bench CPU 9000"
+GPU = "Bench GPU 9000"
+RAM = 16.0
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Time compare_benchmarks as one hardware group grows to --rows benchmarks "
+            "(fixture rows are created inside a transaction and rolled back).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Final size of the benchmarked group.")
+        parser.add_argument("--steps", type=int, default=3, help="Group sizes measured (powers of ten up to --rows).")
+        parser.add_argument("--requests", type=int, default=20, help="Requests timed per group size.")
+
+    def _median_ms(self, fn, runs):
+        fn()  # warm-up
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1e3)
+        return statistics.median(samples)
+
+    def _grow(self, user, profile, size, rng):
+        have = hardware_group([profile.id]).count()
+        batch = [
+            Benchmark(user=user, type="cpu", cpu_model=CPU, gpu_model=GPU, profile=profile,
+                      ram_gb=round(RAM - rng.uniform(0, 0.4), 2), overall_score=rng.uniform(0, 10_000))
+            for _ in range(size - have)
+        ]
+        Benchmark.objects.bulk_create(batch, batch_size=2000)
+        rebuild_sketches(profile.id)  # bulk_create skips the signals that maintain them
+        invalidate_group(profile.id)
+
+    def handle(self, *args, **options):
+        rows = max(10, options["rows"])
+        sizes = sorted({max(10, rows // 10 ** i) for i in range(max(1, options["steps"]))})
+        runs = max(1, options["requests"])
+        rng = random.Random(42)
+        factory = APIRequestFactory()
+
+        try:
+            with transaction.atomic():
+                user = User.objects.create(username="leaderboard-bench")
+                others = User.objects.create(username="leaderboard-bench-others")
+                profile = get_or_create_profile(CPU, GPU, RAM)
+                mine = Benchmark.objects.create(user=user, type="cpu", cpu_model=CPU, gpu_model=GPU,
+                                                ram_gb=RAM, overall_score=5_000, profile=profile)
+
+                def cold_request():
+                    invalidate_group(profile.id)
+                    request()
+
+                def request():
+                    req = factory.get("/api/benchmarks/compare/", {"cpu_model": CPU, "gpu_model": GPU, "ram_gb": RAM})
+                    force_authenticate(req, user=user)
+                    response = compare_benchmarks(req)
+                    assert response.status_code == 200, response.data
+
+                def python_rank():
+                    # what compare_benchmarks used to do: pull every score and count in Python
+                    scores = list(hardware_group(group_profile_ids(CPU, GPU, RAM)).values_list("overall_score", flat=True))
+                    return sum(1 for s in scores if s > mine.overall_score) + 1
+
+                def count_rank():
+                    return rank_in_group(hardware_group(group_profile_ids(CPU, GPU, RAM)), mine.overall_score)
+
+                self.stdout.write(f"{'group rows':>10} {'endpoint (ms)':>14} {'cached (ms)':>12} "
+                                  f"{'COUNT rank (ms)':>16} {'python rank (ms)':>17}")
+                for size in sizes:
+                    self._grow(others, profile, size, rng)
+                    assert python_rank() == count_rank()
+                    self.stdout.write(
+                        f"{size:>10} {self._median_ms(cold_request, runs):>14.2f} {self._median_ms(request, runs):>12.2f} "
+                        f"{self._median_ms(count_rank, runs):>16.2f} {self._median_ms(python_rank, max(1, runs // 4)):>17.2f}"
+                    )
+
+                plan = hardware_group([profile.id]).filter(overall_score__gt=mine.overall_score).explain()
+                self.stdout.write(f"\nrank query plan:\n{plan}")
+                raise _Rollback
+        except _Rollback:
+            invalidate_group(profile.id)
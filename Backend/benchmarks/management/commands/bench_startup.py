@@ -0,0 +1,41 @@
+# benchmarks/management/commands/bench_startup.py
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.startup import HEAVY_MODULES, TARGETS, budget_ms, startup_report
+
+
+class Command(BaseCommand):
+    help = ("Measure the cold-start import time of sdu.wsgi/sdu.asgi (plus the URLconf) with "
+            "`python -X importtime` in fresh interpreters; fail if it exceeds the budget or loads a heavy module.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target.")
+        parser.add_argument("--target", action="append", choices=TARGETS, help="Entry point(s); default both.")
+        parser.add_argument("--top", type=int, default=15, help="Slowest modules (self time) listed per target.")
+        parser.add_argument("--budget-ms", type=float, default=None,
+                            help="Median budget in ms (default STARTUP_IMPORT_BUDGET_MS; 0 disables).")
+        parser.add_argument("--no-urls", action="store_true", help="Import only the entry point, not ROOT_URLCONF.")
+
+    def handle(self, *args, **options):
+        budget = options["budget_ms"] if options["budget_ms"] is not None else budget_ms()
+        try:
+            report = startup_report(options["target"] or TARGETS, runs=options["runs"],
+                                    with_urls=not options["no_urls"], top=max(0, options["top"]))
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        failures = []
+        for target, result in report.items():
+            self.stdout.write(f"{target}: median {result['median_ms']:.1f} ms "
+                              f"(runs: {', '.join(f'{ms:.1f}' for ms in result['runs_ms'])})")
+            for name, self_ms in result["slowest"]:
+                self.stdout.write(f"  {self_ms:>8.2f} ms  {name}")
+            if result["heavy"]:
+                failures.append(f"{target} imports {', '.join(result['heavy'])} at startup")
+            if budget and result["median_ms"] > budget:
+                failures.append(f"{target} median {result['median_ms']:.1f} ms exceeds the {budget:.0f} ms budget")
+
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f"OK: none of {', '.join(HEAVY_MODULES)} imported" + (f", within {budget:.0f} ms" if budget else "")))
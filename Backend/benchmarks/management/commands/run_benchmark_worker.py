@@ -0,0 +1,25 @@
+# benchmarks/management/commands/run_benchmark_worker.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.jobs import BenchmarkWorkerPool
+
+
+class Command(BaseCommand):
+    help = "Run a dedicated benchmark worker pool that drains the BenchmarkJob queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker threads.")
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds between queue polls when idle.")
+
+    def handle(self, *args, **options):
+        pool = BenchmarkWorkerPool(size=options["workers"], poll_interval=options["poll"])
+        pool.start()
+        self.stdout.write(self.style.SUCCESS(f"Benchmark worker pool started ({pool.size} worker(s))."))
+        try:
+            while pool.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers...")
+            pool.stop(timeout=5)
@@ -0,0 +1,46 @@
+# benchmarks/management/commands/run_telemetry_archiver.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from benchmarks.retention import TelemetryArchiver, compact
+from benchmarks.telemetry import TelemetrySampler
+
+
+class Command(BaseCommand):
+    help = ("Record live telemetry to the database and keep it compacted into 1m/1h rollups; "
+            "with --once, run a single rollup/retention pass and exit.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Compact once (e.g. from cron) instead of recording.")
+        parser.add_argument("--flush", type=float, default=getattr(settings, "TELEMETRY_PERSIST_INTERVAL", 10.0),
+                            help="Seconds between sample flushes. With --once, pass the --flush of the running "
+                                 "archiver: buckets younger than two flushes are left for a later pass.")
+        parser.add_argument("--compact", type=float, default=getattr(settings, "TELEMETRY_COMPACT_INTERVAL", 300.0),
+                            help="Seconds between compaction passes.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            stats = compact(flush_interval=options["flush"])
+            self.stdout.write(self.style.SUCCESS(", ".join(f"{k}={v}" for k, v in stats.items())))
+            return
+
+        sampler = TelemetrySampler(
+            interval=getattr(settings, "TELEMETRY_SAMPLE_INTERVAL", 1.0),
+            capacity=getattr(settings, "TELEMETRY_BUFFER_SIZE", 600),
+        )
+        archiver = TelemetryArchiver(sampler, flush_interval=options["flush"], compact_interval=options["compact"])
+        sampler.start()
+        archiver.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"Recording telemetry every {sampler.interval}s (flush {archiver.flush_interval}s, "
+            f"compact {archiver.compact_interval}s)."))
+        try:
+            while archiver.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping archiver...")
+            archiver.stop(timeout=5)
+            archiver.flush()
+            sampler.stop(timeout=5)
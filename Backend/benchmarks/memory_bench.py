@@ -0,0 +1,170 @@
+# benchmarks/memory_bench.py
+"""
+Memory subsystem benchmark.
+
+Bandwidth: STREAM-style copy/scale/add/triad kernels over float64 NumPy
+arrays sized to MIN_LLC_MULTIPLE times the last-level cache, best of a few
+repeats. Only the RAM bound can make them smaller; such a run measured the
+cache, so it is flagged fits_in_cache and scores 0 (comparisons skip it).
+Bytes are counted the STREAM way (copy/scale 16 B, add/triad 24 B per
+element). NumPy has no fused multiply-add ufunc, so triad is two passes
+and the reported triad figure is a conservative lower bound.
+
+Latency: a randomized pointer chase (Sattolo cycle, one hop per 64-byte
+cache line) across growing working sets. Each hop is a dependent load, so
+prefetchers cannot help. The chase runs in the interpreter, so every hop
+also pays a fixed interpreter cost; "ns_over_l1" subtracts the L1-resident
+figure to isolate the cache/DRAM part.
+"""
+import glob
+import time
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+CACHE_LINE = 64
+MIN_LLC_MULTIPLE = 4
+DEFAULT_LLC_BYTES = 32 * 1024 * 1024
+LATENCY_WORKING_SETS = [16 << 10, 256 << 10, 2 << 20, 8 << 20, 32 << 20, 128 << 20, 512 << 20]
+LATENCY_HOPS = 1_000_000
+
+# Reference figures that map to 1000 points (a current desktop running single-threaded NumPy).
+REFERENCE_TRIAD_GBPS = 15.0
+REFERENCE_LATENCY_NS = 100.0
+
+
+def _parse_size(text: str) -> int:
+    text = text.strip().upper()
+    mult = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}.get(text[-1:], 1)
+    return int(text.rstrip("KMG")) * mult
+
+
+def llc_bytes() -> int:
+    """Size of the highest-level CPU cache from sysfs, or a 32 MiB guess."""
+    best_level, best_size = 0, 0
+    for index in glob.glob("/sys/devices/system/cpu/cpu0/cache/index*"):
+        try:
+            with open(f"{index}/level") as fh:
+                level = int(fh.read())
+            with open(f"{index}/size") as fh:
+                size = _parse_size(fh.read())
+        except (OSError, ValueError):
+            continue
+        if level > best_level or (level == best_level and size > best_size):
+            best_level, best_size = level, size
+    return best_size or DEFAULT_LLC_BYTES
+
+
+def _array_elements(llc: int) -> int:
+    """float64 elements per array: MIN_LLC_MULTIPLE x LLC, bounded only by 1/8 of available RAM."""
+    target = MIN_LLC_MULTIPLE * llc
+    return max(1 << 20, min(target, psutil.virtual_memory().available // 8)) // 8
+
+
+def _best(fn: Callable[[], None], repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best or 0.0
+
+
+def measure_bandwidth(repeats: int = 5) -> Dict:
+    import numpy as np
+
+    llc = llc_bytes()
+    n = _array_elements(llc)
+    a = np.full(n, 1.0)
+    b = np.full(n, 2.0)
+    c = np.zeros(n)
+    scalar = 3.0
+
+    def triad():
+        np.multiply(c, scalar, out=a)
+        np.add(a, b, out=a)
+
+    kernels = {
+        "copy": (lambda: np.copyto(c, a), 16),
+        "scale": (lambda: np.multiply(c, scalar, out=b), 16),
+        "add": (lambda: np.add(a, b, out=c), 24),
+        "triad": (triad, 24),
+    }
+    result = {}
+    for name, (fn, bytes_per_elem) in kernels.items():
+        fn()  # touch pages before timing
+        seconds = _best(fn, repeats)
+        result[f"{name}_gbps"] = round(bytes_per_elem * n / seconds / 1e9, 3) if seconds else 0.0
+    result["array_mb"] = round(n * 8 / (1024 * 1024), 1)
+    result["llc_mb"] = round(llc / (1024 * 1024), 1)
+    result["fits_in_cache"] = n * 8 < MIN_LLC_MULTIPLE * llc
+    return result
+
+
+def _chase_ns(working_set: int, hops: int) -> float:
+    import numpy as np
+
+    lines = max(2, working_set // CACHE_LINE)
+    stride = CACHE_LINE // 8
+    order = np.random.default_rng(42).permutation(lines)
+    chain = np.zeros(lines * stride, dtype=np.int64)
+    # Sattolo-style single cycle: each visited line points at the next one in `order`
+    chain[order * stride] = np.roll(order, -1) * stride
+    mv = memoryview(chain)
+    pos = int(order[0]) * stride
+    for _ in range(min(hops, lines)):  # warm the TLB/caches for this working set
+        pos = mv[pos]
+    start = time.perf_counter()
+    for _ in range(hops):
+        pos = mv[pos]
+    return (time.perf_counter() - start) / hops * 1e9
+
+
+def measure_latency(max_working_set_mb: int = 256, hops: int = LATENCY_HOPS) -> List[Dict]:
+    limit = min(max_working_set_mb * 1024 * 1024, psutil.virtual_memory().available // 4)
+    sizes = [s for s in LATENCY_WORKING_SETS if s <= limit] or LATENCY_WORKING_SETS[:1]
+    curve = []
+    base = None
+    for size in sizes:
+        ns = _chase_ns(size, hops)
+        base = ns if base is None else base
+        curve.append({
+            "working_set_kb": size // 1024,
+            "ns_per_access": round(ns, 2),
+            "ns_over_l1": round(max(0.0, ns - base), 2),
+        })
+    return curve
+
+
+def memory_score(triad_gbps: float, latency_ns: float) -> float:
+    """Geometric mean of bandwidth and latency points (1000 = reference machine)."""
+    bw_points = triad_gbps / REFERENCE_TRIAD_GBPS * 1000.0
+    lat_points = REFERENCE_LATENCY_NS / latency_ns * 1000.0 if latency_ns > 0 else 0.0
+    return round((bw_points * lat_points) ** 0.5, 2) if bw_points > 0 and lat_points > 0 else 0.0
+
+
+def run_memory_benchmark(max_array_mb: int = 256, progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Returns:
+      {
+        "copy_gbps", "scale_gbps", "add_gbps", "triad_gbps", "array_mb", "llc_mb", "fits_in_cache",
+        "latency_curve": [{"working_set_kb", "ns_per_access", "ns_over_l1"}, ...],
+        "latency_ns": ns_per_access at the largest working set,
+        "memory_score": points (0 when fits_in_cache)
+      }
+    max_array_mb bounds the latency working sets; bandwidth arrays always span MIN_LLC_MULTIPLE x LLC.
+    """
+    if progress:
+        progress("bandwidth")
+    result = measure_bandwidth()
+    if progress:
+        progress("latency")
+    curve = measure_latency(max_working_set_mb=max_array_mb)
+    latency = curve[-1]["ns_per_access"] if curve else 0.0
+    result.update({
+        "latency_curve": curve,
+        "latency_ns": latency,
+        "memory_score": 0.0 if result["fits_in_cache"] else memory_score(result["triad_gbps"], latency),
+    })
+    return result
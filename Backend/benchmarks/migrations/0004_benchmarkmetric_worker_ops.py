@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0003_benchmarkjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmarkmetric',
+            name='worker_ops',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
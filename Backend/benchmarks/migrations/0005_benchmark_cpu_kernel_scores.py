@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0004_benchmarkmetric_worker_ops'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmark',
+            name='cpu_kernel_scores',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
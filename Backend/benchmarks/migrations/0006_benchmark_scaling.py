@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0005_benchmark_cpu_kernel_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmark',
+            name='single_thread_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.CreateModel(
+            name='BenchmarkScalingPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('variant', models.CharField(max_length=20)),
+                ('workers', models.IntegerField()),
+                ('gflops', models.FloatField()),
+                ('speedup', models.FloatField()),
+                ('efficiency', models.FloatField()),
+                ('benchmark', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scaling_points', to='benchmarks.benchmark')),
+            ],
+            options={
+                'ordering': ['variant', 'workers'],
+            },
+        ),
+    ]
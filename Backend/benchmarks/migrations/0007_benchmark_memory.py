@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0006_benchmark_scaling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_add_gbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_copy_gbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_latency_curve',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_latency_ns',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_scale_gbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='mem_triad_gbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='memory_score',
+            field=models.FloatField(default=0),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0007_benchmark_memory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmark',
+            name='disk_fsync_p50_ms',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='disk_rand_read_iops',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='disk_rand_read_p99_us',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='disk_seq_read_mbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='disk_seq_write_mbps',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='storage_class',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='storage_results',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='storage_score',
+            field=models.FloatField(default=0),
+        ),
+    ]
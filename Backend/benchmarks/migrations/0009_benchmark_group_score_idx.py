@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0008_benchmark_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmark',
+            index=models.Index(fields=['cpu_model', 'gpu_model', 'ram_gb', 'overall_score'], name='bench_group_score_idx'),
+        ),
+    ]
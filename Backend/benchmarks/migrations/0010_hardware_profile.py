@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0009_benchmark_group_score_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HardwareProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cpu_model', models.CharField(max_length=200)),
+                ('gpu_model', models.CharField(max_length=200)),
+                ('ram_gb', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='benchmark',
+            name='bench_group_score_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='hardwareprofile',
+            constraint=models.UniqueConstraint(fields=('cpu_model', 'gpu_model', 'ram_gb'), name='unique_hardware_profile'),
+        ),
+        migrations.AddField(
+            model_name='benchmark',
+            name='profile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='benchmarks', to='benchmarks.hardwareprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='benchmark',
+            index=models.Index(fields=['profile', 'overall_score'], name='bench_profile_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='benchmark',
+            index=models.Index(fields=['user', 'profile', 'overall_score'], name='bench_user_profile_score_idx'),
+        ),
+    ]
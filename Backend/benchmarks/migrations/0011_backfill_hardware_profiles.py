@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:19
+
+from django.db import migrations
+
+from benchmarks.hardware import canonical_cpu, canonical_gpu, nominal_ram_gb
+
+BATCH = 2000
+
+
+def backfill_profiles(apps, schema_editor):
+    """Attach every existing Benchmark to the HardwareProfile of its canonicalised CPU/GPU/RAM."""
+    Benchmark = apps.get_model('benchmarks', 'Benchmark')
+    HardwareProfile = apps.get_model('benchmarks', 'HardwareProfile')
+
+    profiles = {}
+    pending = []
+    rows = Benchmark.objects.filter(profile__isnull=True).only('id', 'cpu_model', 'gpu_model', 'ram_gb')
+    for bench in rows.iterator(chunk_size=BATCH):
+        key = (canonical_cpu(bench.cpu_model), canonical_gpu(bench.gpu_model), nominal_ram_gb(bench.ram_gb))
+        if key not in profiles:
+            profiles[key], _ = HardwareProfile.objects.get_or_create(cpu_model=key[0], gpu_model=key[1], ram_gb=key[2])
+        bench.profile = profiles[key]
+        pending.append(bench)
+        if len(pending) >= BATCH:
+            Benchmark.objects.bulk_update(pending, ['profile'])
+            pending = []
+    if pending:
+        Benchmark.objects.bulk_update(pending, ['profile'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0010_hardware_profile'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0011_backfill_hardware_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hardwareprofile',
+            name='score_sketches',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
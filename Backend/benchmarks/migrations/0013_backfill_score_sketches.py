@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:25
+
+from django.db import migrations
+
+from benchmarks.sketch import DDSketch
+
+FIELDS = ("overall_score", "cpu_score", "gpu_score")
+
+
+def backfill_sketches(apps, schema_editor):
+    """Build every profile's score sketches from the benchmarks already attached to it."""
+    Benchmark = apps.get_model('benchmarks', 'Benchmark')
+    HardwareProfile = apps.get_model('benchmarks', 'HardwareProfile')
+
+    sketches = {}
+    rows = Benchmark.objects.filter(profile__isnull=False).values('profile_id', *FIELDS)
+    for row in rows.iterator(chunk_size=2000):
+        per_field = sketches.setdefault(row['profile_id'], {f: DDSketch() for f in FIELDS})
+        for field in FIELDS:
+            per_field[field].add(row[field] or 0.0)
+    for profile_id, per_field in sketches.items():
+        HardwareProfile.objects.filter(id=profile_id).update(
+            score_sketches={field: sketch.to_dict() for field, sketch in per_field.items()}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0012_hardwareprofile_score_sketches'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0013_backfill_score_sketches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmark',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='bench_user_time_idx'),
+        ),
+    ]
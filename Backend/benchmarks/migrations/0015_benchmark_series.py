@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0014_benchmark_history_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BenchmarkSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channels', models.JSONField(default=list)),
+                ('length', models.IntegerField(default=0)),
+                ('encoding', models.CharField(default='f32', max_length=10)),
+                ('data', models.BinaryField(default=b'')),
+                ('benchmark', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='benchmarks.benchmark')),
+            ],
+        ),
+    ]
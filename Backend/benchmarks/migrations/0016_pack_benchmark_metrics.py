@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:33
+
+from itertools import groupby
+
+from django.db import migrations
+
+from benchmarks.series import pack_samples, to_samples
+
+BATCH = 500
+
+
+def pack_metrics(apps, schema_editor):
+    """Fold each benchmark's BenchmarkMetric rows into one BenchmarkSeries blob."""
+    BenchmarkMetric = apps.get_model('benchmarks', 'BenchmarkMetric')
+    BenchmarkSeries = apps.get_model('benchmarks', 'BenchmarkSeries')
+
+    rows = (BenchmarkMetric.objects.order_by('benchmark_id', 'time', 'id')
+            .values('benchmark_id', 'time', 'cpu', 'gpu', 'temp', 'worker_ops'))
+    pending = []
+    for benchmark_id, samples in groupby(rows.iterator(chunk_size=5000), key=lambda r: r['benchmark_id']):
+        channels, length, encoding, data = pack_samples(list(samples))
+        pending.append(BenchmarkSeries(benchmark_id=benchmark_id, channels=channels, length=length,
+                                       encoding=encoding, data=data))
+        if len(pending) >= BATCH:
+            BenchmarkSeries.objects.bulk_create(pending)
+            pending = []
+    if pending:
+        BenchmarkSeries.objects.bulk_create(pending)
+
+
+def unpack_metrics(apps, schema_editor):
+    BenchmarkMetric = apps.get_model('benchmarks', 'BenchmarkMetric')
+    BenchmarkSeries = apps.get_model('benchmarks', 'BenchmarkSeries')
+
+    for series in BenchmarkSeries.objects.iterator(chunk_size=BATCH):
+        BenchmarkMetric.objects.bulk_create([
+            BenchmarkMetric(benchmark_id=series.benchmark_id, time=s['time'], cpu=s['cpu'] or 0.0,
+                            gpu=s['gpu'] or 0.0, temp=s['temp'] or 0.0, worker_ops=s['worker_ops'])
+            for s in to_samples(series.channels, series.length, series.encoding, series.data)
+        ])
+    BenchmarkSeries.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0015_benchmark_series'),
+    ]
+
+    operations = [
+        migrations.RunPython(pack_metrics, unpack_metrics),
+    ]
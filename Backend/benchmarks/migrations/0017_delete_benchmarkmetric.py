@@ -0,0 +1,16 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0016_pack_benchmark_metrics'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='BenchmarkMetric',
+        ),
+    ]
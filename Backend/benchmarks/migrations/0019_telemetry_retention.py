@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0018_benchmarkseries_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetrySample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(db_index=True)),
+                ('cpu', models.FloatField(default=0)),
+                ('gpu', models.FloatField(default=0)),
+                ('temp', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TelemetryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('1m', '1 minute'), ('1h', '1 hour')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+                ('cpu_min', models.FloatField(default=0)),
+                ('cpu_max', models.FloatField(default=0)),
+                ('cpu_mean', models.FloatField(default=0)),
+                ('cpu_p95', models.FloatField(default=0)),
+                ('gpu_min', models.FloatField(default=0)),
+                ('gpu_max', models.FloatField(default=0)),
+                ('gpu_mean', models.FloatField(default=0)),
+                ('gpu_p95', models.FloatField(default=0)),
+                ('temp_min', models.FloatField(default=0)),
+                ('temp_max', models.FloatField(default=0)),
+                ('temp_mean', models.FloatField(default=0)),
+                ('temp_p95', models.FloatField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resolution', 'bucket'), name='unique_telemetry_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0019_telemetry_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='benchmark',
+            name='gpu_kernel_scores',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
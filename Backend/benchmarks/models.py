@@ -1,7 +1,27 @@
 #benchmarks/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
+from .series import ENCODING_F32, decode_arrays, pack_samples, to_samples
+
+class HardwareProfile(models.Model):
+    """Canonical CPU/GPU/RAM combination; benchmarks/hardware.py maps raw collector strings onto it."""
+    cpu_model = models.CharField(max_length=200)
+    gpu_model = models.CharField(max_length=200)
+    ram_gb = models.IntegerField(default=0)  # nominal size (16), not usable RAM (15.6)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # {"overall_score": DDSketch.to_dict(), "cpu_score": ..., "gpu_score": ...}, kept current by benchmarks/signals.py
+    score_sketches = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cpu_model', 'gpu_model', 'ram_gb'], name='unique_hardware_profile'),
+        ]
+
+    def __str__(self):
+        return f"{self.cpu_model} + {self.gpu_model} ({self.ram_gb} GB)"
+
+
 class Benchmark(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='benchmarks')
     type = models.CharField(max_length=50)
@@ -11,23 +31,175 @@ class Benchmark(models.Model):
     cpu_model = models.CharField(max_length=200, default="Unknown CPU")
     gpu_model = models.CharField(max_length=200, default="Unknown GPU")
     ram_gb = models.FloatField(default=0)
+    profile = models.ForeignKey(HardwareProfile, on_delete=models.PROTECT, null=True, blank=True, related_name='benchmarks')
 
     # 🔹 Performance results
     cpu_score = models.FloatField(default=0)
     gpu_score = models.FloatField(default=0)
     overall_score = models.FloatField(default=0)
     avg_temp = models.FloatField(default=0)
+    cpu_kernel_scores = models.JSONField(default=dict, blank=True)  # per-kernel results from cpu_kernels.run_cpu_suite
+    gpu_kernel_scores = models.JSONField(default=dict, blank=True)  # per-test results from gpu_kernels.run_gpu_suite
+    single_thread_score = models.FloatField(default=0)  # matmul GFLOPS with one worker (scaling runs only)
+
+    # 🔹 Memory subsystem (benchmarks/memory_bench.py, memory runs only)
+    memory_score = models.FloatField(default=0)
+    mem_copy_gbps = models.FloatField(default=0)
+    mem_scale_gbps = models.FloatField(default=0)
+    mem_add_gbps = models.FloatField(default=0)
+    mem_triad_gbps = models.FloatField(default=0)
+    mem_latency_ns = models.FloatField(default=0)  # pointer-chase latency at the largest working set
+    mem_latency_curve = models.JSONField(default=list, blank=True)  # [{"working_set_kb", "ns_per_access", "ns_over_l1"}]
+
+    # 🔹 Storage I/O (benchmarks/storage_bench.py, storage runs only)
+    storage_score = models.FloatField(default=0)
+    disk_seq_read_mbps = models.FloatField(default=0)   # O_DIRECT where supported, else cold buffered reads
+    disk_seq_write_mbps = models.FloatField(default=0)
+    disk_rand_read_iops = models.FloatField(default=0)  # 4 KiB, queue depth 1
+    disk_rand_read_p99_us = models.FloatField(default=0)
+    disk_fsync_p50_ms = models.FloatField(default=0)
+    storage_class = models.CharField(max_length=10, blank=True, default="")  # "SSD"/"HDD" measured, "" if unclear
+    storage_results = models.JSONField(default=dict, blank=True)  # full run_storage_benchmark() output
+
+    class Meta:
+        indexes = [
+            # hardware-group leaderboard (benchmarks/leaderboard.py): rank = COUNT of higher scores
+            models.Index(fields=['profile', 'overall_score'], name='bench_profile_score_idx'),
+            # the user's own best run in a group
+            models.Index(fields=['user', 'profile', 'overall_score'], name='bench_user_profile_score_idx'),
+            # keyset-paginated history (benchmarks/pagination.py)
+            models.Index(fields=['user', '-timestamp', '-id'], name='bench_user_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # benchmarks/signals.py locks the stored row in pre_save and adjusts the sketches in
+        # post_save; one transaction around both makes concurrent saves of a row take turns
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} | {self.cpu_model} + {self.gpu_model} | {self.overall_score:.1f}"
 
 
-class BenchmarkMetric(models.Model):
-    benchmark = models.ForeignKey(Benchmark, on_delete=models.CASCADE, related_name='metrics')
-    time = models.IntegerField()  # time in seconds or measurement point
-    cpu = models.FloatField()     # CPU usage %
-    gpu = models.FloatField()     # GPU usage %
-    temp = models.FloatField()    # Temperature in Celsius
+class BenchmarkSeries(models.Model):
+    """A run's per-sample timeline as packed float32 columns (benchmarks/series.py)."""
+    benchmark = models.OneToOneField(Benchmark, on_delete=models.CASCADE, related_name='series')
+    channels = models.JSONField(default=list)  # ["time", "cpu", "gpu", "temp", "ops.0", ..., "core.0", ...]
+    length = models.IntegerField(default=0)    # samples per channel
+    encoding = models.CharField(max_length=10, default=ENCODING_F32)
+    data = models.BinaryField(default=b"")
+    updated_at = models.DateTimeField(auto_now=True)  # part of the downsampling cache key (benchmarks/downsample.py)
+
+    @classmethod
+    def from_samples(cls, benchmark, samples, compress=True):
+        channels, length, encoding, data = pack_samples(samples, compress=compress)
+        return cls(benchmark=benchmark, channels=channels, length=length, encoding=encoding, data=data)
+
+    def arrays(self):
+        """{channel: numpy float32 view}; no copy beyond decompression."""
+        return decode_arrays(self.channels, self.length, self.encoding, self.data)
+
+    def samples(self):
+        """[{"time", "cpu", "gpu", "temp", "worker_ops"}, ...] as the API returns them."""
+        return to_samples(self.channels, self.length, self.encoding, self.data)
+
+    def __str__(self):
+        return f"{self.benchmark_id} series: {self.length} x {len(self.channels)} ({self.encoding}, {len(self.data)} B)"
+
+
+class BenchmarkScalingPoint(models.Model):
+    """One point of a thread-scaling sweep (benchmarks/scaling.py)."""
+    benchmark = models.ForeignKey(Benchmark, on_delete=models.CASCADE, related_name='scaling_points')
+    variant = models.CharField(max_length=20)  # "spread" (one thread per core first) or "packed" (SMT siblings first)
+    workers = models.IntegerField()
+    gflops = models.FloatField()
+    speedup = models.FloatField()     # vs. one worker
+    efficiency = models.FloatField()  # speedup / workers
+
+    class Meta:
+        ordering = ['variant', 'workers']
+
+    def __str__(self):
+        return f"{self.benchmark_id} {self.variant} x{self.workers}: {self.gflops:.1f} GFLOPS ({self.efficiency:.0%})"
+
+
+class BenchmarkJob(models.Model):
+    """Queued benchmark run, executed by the worker pool in benchmarks/jobs.py."""
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='benchmark_jobs')
+    type = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+
+    # 🔹 Queue state
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    attempts = models.IntegerField(default=0)
+    worker_id = models.CharField(max_length=200, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # 🔹 Progress and results
+    progress = models.FloatField(default=0)  # 0-100 %
+    stage = models.CharField(max_length=50, blank=True, default="")
+    partial_results = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    benchmark = models.ForeignKey(Benchmark, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+
+    def __str__(self):
+        return f"job #{self.id} {self.user.username} | {self.type} | {self.status} ({self.progress:.0f}%)"
+
+
+class TelemetrySample(models.Model):
+    """A persisted live-telemetry sample; rolled up and pruned by benchmarks/retention.py."""
+    timestamp = models.DateTimeField(db_index=True)
+    cpu = models.FloatField(default=0)   # CPU usage %
+    gpu = models.FloatField(default=0)   # GPU usage %
+    temp = models.FloatField(default=0)  # Temperature in Celsius
+
+    def __str__(self):
+        return f"{self.timestamp:%Y-%m-%d %H:%M:%S} CPU:{self.cpu}% GPU:{self.gpu}% {self.temp}°C"
+
+
+class TelemetryRollup(models.Model):
+    """Aggregate of the raw samples in one 1-minute or 1-hour bucket."""
+    RESOLUTION_1M = "1m"
+    RESOLUTION_1H = "1h"
+    RESOLUTION_CHOICES = [(RESOLUTION_1M, "1 minute"), (RESOLUTION_1H, "1 hour")]
+
+    resolution = models.CharField(max_length=4, choices=RESOLUTION_CHOICES)
+    bucket = models.DateTimeField()  # bucket start
+    count = models.IntegerField(default=0)
+
+    # 🔹 Per-channel aggregates
+    cpu_min = models.FloatField(default=0)
+    cpu_max = models.FloatField(default=0)
+    cpu_mean = models.FloatField(default=0)
+    cpu_p95 = models.FloatField(default=0)
+    gpu_min = models.FloatField(default=0)
+    gpu_max = models.FloatField(default=0)
+    gpu_mean = models.FloatField(default=0)
+    gpu_p95 = models.FloatField(default=0)
+    temp_min = models.FloatField(default=0)
+    temp_max = models.FloatField(default=0)
+    temp_mean = models.FloatField(default=0)
+    temp_p95 = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resolution', 'bucket'], name='unique_telemetry_rollup'),
+        ]
 
     def __str__(self):
-        return f"{self.benchmark.type} - t:{self.time}s CPU:{self.cpu}% GPU:{self.gpu}%"
+        return f"{self.resolution} {self.bucket:%Y-%m-%d %H:%M} n={self.count} CPU {self.cpu_mean:.1f}% (p95 {self.cpu_p95:.1f})"
@@ -0,0 +1,149 @@
+# benchmarks/response_cache.py
+"""
+Versioned response cache for the hardware-group endpoints (compare, bottleneck).
+
+Entries live in the cache alias named by BENCHMARK_CACHE_ALIAS (a bounded
+local-memory LRU cache by default, see CACHES in sdu/settings.py). Every
+HardwareProfile has a version number stored in the same cache, and an entry's
+key embeds the versions of all profiles in its group. benchmarks/signals.py
+bumps a profile's version whenever one of its Benchmark rows is saved or
+deleted, so a write orphans exactly that group's entries; the orphans then age
+out through the cache's own eviction.
+
+Versions start from a clock value rather than 0: if the cache evicts a version
+key, the fresh one can never equal a number an old entry was stored under.
+
+The local-memory backend is per process. When benchmarks are written by a
+separate `run_benchmark_worker` process, point BENCHMARK_CACHE_ALIAS at a
+shared backend (Redis, Memcached, database); otherwise web processes only see
+those writes once BENCHMARK_CACHE_TIMEOUT expires.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+KEY_PREFIX = "bench"
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def get_cache():
+    return caches[_setting("BENCHMARK_CACHE_ALIAS", "default")]
+
+
+# --- hit/miss counters ---
+class CacheStats:
+    """Per-namespace hit/miss counters for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._invalidations = 0
+
+    def record(self, namespace: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(namespace, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            namespaces = {}
+            for name, counts in self._counts.items():
+                total = counts["hits"] + counts["misses"]
+                namespaces[name] = {**counts, "hit_rate": round(counts["hits"] / total, 4) if total else None}
+            return {"namespaces": namespaces, "invalidations": self._invalidations}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._invalidations = 0
+
+
+stats = CacheStats()
+
+
+# --- group versions ---
+def _version_key(profile_id: int) -> str:
+    return f"{KEY_PREFIX}:v:{profile_id}"
+
+
+def group_versions(profile_ids: List[int]) -> List[int]:
+    cache = get_cache()
+    keys = [_version_key(pid) for pid in profile_ids]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)  # add(): keep a version another request just set
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def invalidate_group(*profile_ids: Optional[int]) -> None:
+    """Orphan every cached entry of the groups containing these profiles."""
+    cache = get_cache()
+    for pid in {p for p in profile_ids if p is not None}:
+        key = _version_key(pid)
+        try:
+            cache.incr(key)
+        except ValueError:  # never read, or evicted
+            cache.set(key, time.time_ns(), timeout=None)
+        stats.record_invalidation()
+
+
+def invalidate_on_write(*profile_ids: Optional[int]) -> None:
+    """
+    Invalidate now and again once the surrounding transaction commits: a reader
+    racing the uncommitted write can re-cache the old rows under the first bump.
+    """
+    invalidate_group(*profile_ids)
+    transaction.on_commit(lambda: invalidate_group(*profile_ids))
+
+
+# --- cached computations ---
+def cached_for_group(namespace: str, profile_ids: Iterable[int], compute: Callable, *parts) -> object:
+    """
+    Return compute() for this group and extra key `parts`, cached until a
+    benchmark in one of the group's profiles changes. Groups without any
+    profile are not cached (a new profile would not invalidate them).
+    """
+    ids = sorted(set(profile_ids))
+    if not ids:
+        return compute()
+    versions = group_versions(ids)
+    group = ",".join(f"{pid}.{version}" for pid, version in zip(ids, versions))
+    digest = hashlib.sha1("|".join([group, *map(str, parts)]).encode()).hexdigest()
+    key = f"{KEY_PREFIX}:{namespace}:{digest}"
+
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        stats.record(namespace, hit=True)
+        return value
+    stats.record(namespace, hit=False)
+    value = compute()
+    cache.set(key, value, _setting("BENCHMARK_CACHE_TIMEOUT", 300))
+    return value
+
+
+def server_disk_total_gb(path: str = "/") -> float:
+    """Size of the server's disk; it only changes when the volume is resized."""
+    cache = get_cache()
+    key = f"{KEY_PREFIX}:host:disk_total_gb"
+    total = cache.get(key)
+    if total is None:
+        import psutil
+        total = psutil.disk_usage(path).total / (1024 ** 3)
+        cache.set(key, total, _setting("BENCHMARK_CACHE_HOST_TIMEOUT", 3600))
+    return total
@@ -0,0 +1,298 @@
+# benchmarks/retention.py
+"""
+Retention and rollups for persisted live telemetry.
+
+The sampler's ring buffer (benchmarks/telemetry.py) only covers the last few
+minutes. With TELEMETRY_PERSIST enabled, a TelemetryArchiver thread flushes
+new samples into TelemetrySample rows and periodically runs compact():
+
+  1. every complete 1-minute and 1-hour bucket since the last rollup is
+     aggregated into a TelemetryRollup (count, min/max/mean/p95 per channel),
+     both levels straight from the raw samples so the p95 is exact;
+  2. raw samples older than TELEMETRY_RAW_RETENTION_HOURS (and already
+     covered by an hourly rollup) are deleted, as are rollups past their
+     own retention windows.
+
+Every rollup window and every delete chunk (TELEMETRY_DELETE_CHUNK rows) is
+its own short transaction, so SQLite's single write lock is released between
+them and the sampler, job workers and requests keep writing while a large
+backlog is compacted.
+
+history() answers range queries from the finest resolution that still holds
+the start of the range and fits the point budget. When not even the hourly
+rollups fit, the response carries "budget_exceeded": true.
+"""
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import TelemetryRollup, TelemetrySample
+
+CHANNELS = ("cpu", "gpu", "temp")
+RAW = "raw"
+STEPS = {
+    TelemetryRollup.RESOLUTION_1M: timedelta(minutes=1),
+    TelemetryRollup.RESOLUTION_1H: timedelta(hours=1),
+}
+RESOLUTIONS = (RAW, *STEPS)
+# how much time one rollup transaction covers
+WINDOWS = {
+    TelemetryRollup.RESOLUTION_1M: timedelta(hours=1),
+    TelemetryRollup.RESOLUTION_1H: timedelta(days=1),
+}
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def retention(resolution: str) -> timedelta:
+    if resolution == RAW:
+        return timedelta(hours=_setting("TELEMETRY_RAW_RETENTION_HOURS", 24))
+    if resolution == TelemetryRollup.RESOLUTION_1M:
+        return timedelta(days=_setting("TELEMETRY_1M_RETENTION_DAYS", 7))
+    return timedelta(days=_setting("TELEMETRY_1H_RETENTION_DAYS", 365))
+
+
+def floor_time(moment: datetime, step: timedelta) -> datetime:
+    epoch = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    return epoch + ((moment - epoch) // step) * step
+
+
+# --- recording ---
+def persist_samples(samples: List[Dict]) -> int:
+    """Store sampler dicts ({"timestamp": epoch, "cpu", "gpu", "temp"})."""
+    rows = [
+        TelemetrySample(timestamp=datetime.fromtimestamp(s["timestamp"], tz=dt_timezone.utc),
+                        cpu=s.get("cpu") or 0.0, gpu=s.get("gpu") or 0.0, temp=s.get("temp") or 0.0)
+        for s in samples
+    ]
+    TelemetrySample.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+# --- rollups ---
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def aggregate(rows: List[tuple]) -> Dict[str, float]:
+    """(cpu, gpu, temp) tuples -> count and min/max/mean/p95 per channel."""
+    result = {"count": len(rows)}
+    for i, channel in enumerate(CHANNELS):
+        values = [row[i] for row in rows]
+        result.update({
+            f"{channel}_min": min(values),
+            f"{channel}_max": max(values),
+            f"{channel}_mean": round(sum(values) / len(values), 3),
+            f"{channel}_p95": _p95(values),
+        })
+    return result
+
+
+def rollup_window(resolution: str, start: datetime, end: datetime) -> int:
+    """(Re)build the `resolution` buckets in [start, end) from raw samples; returns buckets written."""
+    step = STEPS[resolution]
+    buckets: Dict[datetime, List[tuple]] = {}
+    samples = (TelemetrySample.objects.filter(timestamp__gte=start, timestamp__lt=end)
+               .order_by("timestamp").values_list("timestamp", *CHANNELS))
+    for timestamp, *values in samples.iterator(chunk_size=5000):
+        buckets.setdefault(floor_time(timestamp, step), []).append(tuple(values))
+    rollups = [TelemetryRollup(resolution=resolution, bucket=bucket, **aggregate(rows))
+               for bucket, rows in buckets.items()]
+    update_fields = ["count"] + [f"{c}_{stat}" for c in CHANNELS for stat in ("min", "max", "mean", "p95")]
+    with transaction.atomic():
+        TelemetryRollup.objects.bulk_create(rollups, update_conflicts=True,
+                                            unique_fields=["resolution", "bucket"], update_fields=update_fields)
+    return len(rollups)
+
+
+def _rolled_until(resolution: str) -> Optional[datetime]:
+    last = TelemetryRollup.objects.filter(resolution=resolution).order_by("-bucket").values_list("bucket", flat=True).first()
+    return last + STEPS[resolution] if last else None
+
+
+def _next_sample_at(start: datetime, end: datetime) -> Optional[datetime]:
+    return (TelemetrySample.objects.filter(timestamp__gte=start, timestamp__lt=end)
+            .order_by("timestamp").values_list("timestamp", flat=True).first())
+
+
+def rollup_pending(resolution: str, now: datetime, flush_interval: Optional[float] = None) -> int:
+    """
+    Roll every complete bucket after the newest existing rollup of this resolution.
+    `flush_interval` is that of the archiver writing the samples (default TELEMETRY_PERSIST_INTERVAL):
+    samples reach the database up to one flush late, so buckets that recent are left for a later pass.
+    Stretches without samples are skipped with one indexed lookup instead of being read window by window.
+    """
+    step = STEPS[resolution]
+    if flush_interval is None:
+        flush_interval = _setting("TELEMETRY_PERSIST_INTERVAL", 10.0)
+    end = floor_time(now - timedelta(seconds=2 * flush_interval), step)
+    start = _rolled_until(resolution) or datetime.min.replace(tzinfo=dt_timezone.utc)
+    written = 0
+    while start < end:
+        next_sample = _next_sample_at(start, end)
+        if next_sample is None:
+            break
+        start = max(start, floor_time(next_sample, step))
+        window_end = min(end, start + WINDOWS[resolution])
+        written += rollup_window(resolution, start, window_end)
+        start = window_end
+    return written
+
+
+# --- pruning ---
+def delete_chunked(queryset, chunk: Optional[int] = None) -> int:
+    """Delete `queryset` a chunk of ids at a time, one short transaction per chunk."""
+    chunk = chunk or _setting("TELEMETRY_DELETE_CHUNK", 2000)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list("id", flat=True)[:chunk])
+            if not ids:
+                return deleted
+            deleted += queryset.model.objects.filter(id__in=ids).delete()[0]
+
+
+def compact(now: Optional[datetime] = None, flush_interval: Optional[float] = None) -> Dict[str, int]:
+    """One full pass: roll up pending buckets, then prune everything past retention."""
+    now = now or timezone.now()
+    stats = {
+        "rolled_1m": rollup_pending(TelemetryRollup.RESOLUTION_1M, now, flush_interval),
+        "rolled_1h": rollup_pending(TelemetryRollup.RESOLUTION_1H, now, flush_interval),
+    }
+    # raw rows go only once the hourly rollup covers them
+    raw_cutoff = now - retention(RAW)
+    hourly_until = _rolled_until(TelemetryRollup.RESOLUTION_1H)
+    raw_cutoff = min(raw_cutoff, hourly_until) if hourly_until else None
+    stats["deleted_raw"] = delete_chunked(TelemetrySample.objects.filter(timestamp__lt=raw_cutoff)) if raw_cutoff else 0
+    for resolution in STEPS:
+        stats[f"deleted_{resolution}"] = delete_chunked(TelemetryRollup.objects.filter(
+            resolution=resolution, bucket__lt=now - retention(resolution)))
+    return stats
+
+
+# --- queries ---
+def raw_step() -> timedelta:
+    return timedelta(seconds=_setting("TELEMETRY_SAMPLE_INTERVAL", 1.0))
+
+
+def choose_resolution(start: datetime, end: datetime, max_points: int, now: Optional[datetime] = None) -> str:
+    """
+    Finest resolution that still holds `start` (retention) and returns at
+    most `max_points` points for the range; hourly rollups otherwise, even
+    when those exceed the budget (history() then flags it).
+    """
+    now = now or timezone.now()
+    span = end - start
+    for resolution, step in ((RAW, raw_step()), *STEPS.items()):
+        if start >= now - retention(resolution) and span / step <= max_points:
+            return resolution
+    return TelemetryRollup.RESOLUTION_1H
+
+
+def history(start: datetime, end: datetime, max_points: int, resolution: Optional[str] = None) -> Dict:
+    """Points of [start, end); "budget_exceeded" says when more than max_points came back."""
+    resolution = resolution or choose_resolution(start, end, max_points)
+    if resolution == RAW:
+        rows = TelemetrySample.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by("timestamp")
+        points = [{"timestamp": s.timestamp.timestamp(), "cpu": s.cpu, "gpu": s.gpu, "temp": s.temp} for s in rows]
+        step = raw_step()
+    else:
+        rows = TelemetryRollup.objects.filter(resolution=resolution, bucket__gte=floor_time(start, STEPS[resolution]),
+                                              bucket__lt=end).order_by("bucket")
+        points = []
+        for r in rows:
+            point = {"timestamp": r.bucket.timestamp(), "count": r.count}
+            for c in CHANNELS:
+                # "cpu"/"gpu"/"temp" carry the mean so charts plot every resolution the same way
+                point.update({c: getattr(r, f"{c}_mean"), f"{c}_min": getattr(r, f"{c}_min"),
+                              f"{c}_max": getattr(r, f"{c}_max"), f"{c}_p95": getattr(r, f"{c}_p95")})
+            points.append(point)
+        step = STEPS[resolution]
+    return {
+        "resolution": resolution,
+        "step_seconds": step.total_seconds(),
+        "start": start.timestamp(),
+        "end": end.timestamp(),
+        "max_points": max_points,
+        "budget_exceeded": len(points) > max_points,
+        "points": points,
+    }
+
+
+# --- background archiver ---
+class TelemetryArchiver:
+    """Flushes new sampler output to the database and compacts it on a timer."""
+
+    def __init__(self, sampler, flush_interval: float = 10.0, compact_interval: float = 300.0):
+        self.sampler = sampler
+        self.flush_interval = max(1.0, float(flush_interval))
+        self.compact_interval = max(self.flush_interval, float(compact_interval))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_ts = time.time()
+        self._last_compact = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="telemetry-archiver", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def flush(self) -> int:
+        samples = self.sampler.since(self._last_ts)
+        if not samples:
+            return 0
+        written = persist_samples(samples)
+        self._last_ts = samples[-1]["timestamp"]
+        return written
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() - self._last_compact >= self.compact_interval:
+                    self._last_compact = time.monotonic()
+                    compact(flush_interval=self.flush_interval)
+            except Exception:
+                pass
+            finally:
+                close_old_connections()
+
+
+_archiver: Optional[TelemetryArchiver] = None
+_archiver_lock = threading.Lock()
+
+
+def get_archiver(sampler) -> TelemetryArchiver:
+    """Process-wide archiver for `sampler`, started on first use."""
+    global _archiver
+    with _archiver_lock:
+        if _archiver is None:
+            _archiver = TelemetryArchiver(
+                sampler,
+                flush_interval=_setting("TELEMETRY_PERSIST_INTERVAL", 10.0),
+                compact_interval=_setting("TELEMETRY_COMPACT_INTERVAL", 300.0),
+            )
+    _archiver.start()
+    return _archiver
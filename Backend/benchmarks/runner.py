@@ -0,0 +1,275 @@
+# benchmarks/runner.py
+import psutil
+from typing import Callable, Dict, Optional
+from django.conf import settings
+
+from .models import Benchmark, BenchmarkScalingPoint, BenchmarkSeries
+from .utils import get_cpu_temp
+from .gpu_telemetry import read_gpu
+from .cpu_kernels import run_cpu_suite
+from .gpu_kernels import run_gpu_suite
+from .scaling import run_scaling_sweep
+from .hardware import get_or_create_profile
+from .leaderboard import group_sketches, score_distribution
+from .response_cache import invalidate_on_write, server_disk_total_gb
+from .series import pack_samples
+from .memory_bench import run_memory_benchmark
+from .storage_bench import run_storage_benchmark
+
+
+# (start, done) progress percent of each step; the ranges only increase, so a job's
+# progress never moves backwards whichever optional steps it runs
+STEP_PROGRESS = {
+    "cpu": (10, 40),
+    "scaling": (40, 50),
+    "memory": (50, 60),
+    "storage": (60, 70),
+    "gpu": (70, 90),
+}
+
+
+def _noop_progress(percent: float, stage: str, **partial) -> None:
+    pass
+
+
+def execute_benchmark(user, bench_type: str = "cpu", params: Optional[Dict] = None,
+                      progress: Optional[Callable] = None) -> Dict:
+    """
+    Run one full benchmark for `user`: collect system info, stress CPU/GPU,
+    store results and build the response payload.
+
+    `progress(percent, stage, **partial)` is called between steps so the job
+    worker can publish progress and partial results while the run is going.
+    Returns the same payload the old synchronous /run/ endpoint responded with.
+    """
+    from diagnostics.utils.system_collector import get_static_info, on_inventory_disk, record_storage_class
+    from diagnostics.utils.bottleneck_analyzer import analyze_bottlenecks
+    from users.models import UserSpecs
+    from .serializers import BenchmarkSerializer
+
+    params = params or {}
+    report = progress or _noop_progress
+    bench_type = (bench_type or "cpu").lower()
+
+    # --- Step 1: Hardware snapshot (cached static inventory) ---
+    report(5, "collecting")
+    sysinfo = get_static_info() or {}
+    cpu_model = sysinfo.get("cpu", {}).get("model", "Unknown CPU")
+    gpu_model = sysinfo.get("gpu", {}).get("model", "Unknown GPU")
+
+    ram_total_repr = sysinfo.get("ram", {}).get("total", "0")
+    try:
+        ram_gb = float(str(ram_total_repr).split()[0])
+    except Exception:
+        ram_gb = 0.0
+
+    # --- Step 2: Run CPU kernel suite / GPU suite safely ---
+    start, done = STEP_PROGRESS["cpu"]
+    report(start, "cpu_stress")
+    try:
+        cpu_result = run_cpu_suite(
+            params.get("kernels"),
+            duration_seconds=int(params.get("cpu_duration", 10)),
+            progress=lambda kernel: report(start, f"cpu:{kernel}"),
+        )
+    except Exception:
+        cpu_result = {"cpu_score": 0.0, "avg_cpu": 0.0, "duration": 0.0, "kernels": {}}
+    report(done, "cpu_done", cpu_result=cpu_result)
+
+    scaling_result = {}
+    if bench_type == "scaling" or params.get("scaling"):
+        start, done = STEP_PROGRESS["scaling"]
+        report(start, "cpu_scaling")
+        try:
+            scaling_result = run_scaling_sweep(
+                duration_seconds=int(params.get("scaling_duration", 3)),
+                progress=lambda variant, k: report(start, f"scaling:{variant}:{k}"),
+            )
+        except Exception:
+            scaling_result = {}
+        report(done, "scaling_done", scaling_result=scaling_result)
+
+    memory_result = {}
+    if bench_type == "memory" or params.get("memory"):
+        start, done = STEP_PROGRESS["memory"]
+        report(start, "memory")
+        try:
+            memory_result = run_memory_benchmark(
+                max_array_mb=getattr(settings, "MEMORY_BENCH_MAX_MB", 256),
+                progress=lambda stage: report(start, f"memory:{stage}"),
+            )
+        except Exception:
+            memory_result = {}
+        report(done, "memory_done", memory_result=memory_result)
+
+    storage_result = {}
+    if bench_type == "storage" or params.get("storage"):
+        start, done = STEP_PROGRESS["storage"]
+        report(start, "storage")
+        try:
+            storage_result = run_storage_benchmark(
+                directory=getattr(settings, "STORAGE_BENCH_DIR", None),
+                file_mb=getattr(settings, "STORAGE_BENCH_FILE_MB", 256),
+                phase_seconds=getattr(settings, "STORAGE_BENCH_PHASE_SECONDS", 3.0),
+                progress=lambda stage: report(start, f"storage:{stage}"),
+            )
+            # a scratch dir on another device (a data disk, tmpfs) says nothing about the root disk
+            if on_inventory_disk(storage_result["directory"]):
+                record_storage_class(storage_result.get("storage_class"))
+        except Exception:
+            storage_result = {}
+        report(done, "storage_done", storage_result=storage_result)
+
+    gpu_result = {}
+    if bench_type in ["gpu", "hybrid"]:
+        start, done = STEP_PROGRESS["gpu"]
+        report(start, "gpu_suite")
+        try:
+            gpu_result = run_gpu_suite(
+                params.get("gpu_tests"),
+                device=params.get("gpu_device"),
+                duration_seconds=int(params.get("gpu_duration", 10)),
+                progress=lambda test: report(start, f"gpu:{test}"),
+            )
+        except Exception:
+            gpu_result = {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": 0.0, "kernels": {}}
+        report(done, "gpu_done", gpu_result=gpu_result)
+
+    # --- Step 3: Safe temperature reading ---
+    temp = get_cpu_temp() or 0.0
+    gpu_reading = read_gpu()
+    gpu_usage = round(gpu_reading["gpu_percent"] or 0.0, 2)
+    if not temp and gpu_reading["temp_c"]:
+        temp = gpu_reading["temp_c"]
+
+    # --- Step 4: Compute scores ---
+    cpu_score = float(cpu_result.get("cpu_score", 0.0) or 0.0)
+    gpu_score = float(gpu_result.get("gpu_score", 0.0) or 0.0)
+    overall_score = cpu_score + gpu_score
+
+    # --- Step 5: Create or update benchmark safely ---
+    report(92, "saving")
+    defaults = {
+        "type": bench_type,
+        "profile": get_or_create_profile(cpu_model, gpu_model, ram_gb),
+        "cpu_score": cpu_score,
+        "gpu_score": gpu_score,
+        "overall_score": overall_score,
+        "avg_temp": float(temp),
+        "cpu_kernel_scores": cpu_result.get("kernels", {}),
+        "gpu_kernel_scores": gpu_result.get("kernels", {}),
+    }
+    if scaling_result:
+        # like the scaling points below, only a scaling run replaces the single-thread score
+        defaults["single_thread_score"] = scaling_result.get("summary", {}).get("single_thread_score", 0.0)
+    if memory_result:
+        # memory fields are only touched by memory runs, so a later CPU-only run keeps them
+        defaults.update({
+            "memory_score": memory_result.get("memory_score", 0.0),
+            "mem_copy_gbps": memory_result.get("copy_gbps", 0.0),
+            "mem_scale_gbps": memory_result.get("scale_gbps", 0.0),
+            "mem_add_gbps": memory_result.get("add_gbps", 0.0),
+            "mem_triad_gbps": memory_result.get("triad_gbps", 0.0),
+            "mem_latency_ns": memory_result.get("latency_ns", 0.0),
+            "mem_latency_curve": memory_result.get("latency_curve", []),
+        })
+    if storage_result:
+        defaults.update({
+            "storage_score": storage_result.get("storage_score", 0.0),
+            "disk_seq_read_mbps": storage_result.get("seq_read_direct_mbps") or storage_result.get("seq_read_mbps", 0.0),
+            "disk_seq_write_mbps": storage_result.get("seq_write_mbps", 0.0),
+            "disk_rand_read_iops": storage_result.get("random_read", {}).get("iops", 0.0),
+            "disk_rand_read_p99_us": storage_result.get("random_read", {}).get("p99_us", 0.0),
+            "disk_fsync_p50_ms": storage_result.get("fsync", {}).get("p50_ms", 0.0),
+            "storage_class": storage_result.get("storage_class") or "",
+            "storage_results": storage_result,
+        })
+    benchmark, created = Benchmark.objects.update_or_create(
+        user=user,
+        cpu_model=cpu_model,
+        gpu_model=gpu_model,
+        ram_gb=ram_gb,
+        defaults=defaults,
+    )
+
+    if scaling_result.get("points"):
+        BenchmarkScalingPoint.objects.filter(benchmark=benchmark).delete()
+        BenchmarkScalingPoint.objects.bulk_create([
+            BenchmarkScalingPoint(benchmark=benchmark, **point) for point in scaling_result["points"]
+        ])
+
+    # --- Step 6: Store the per-second stress timeline ---
+    try:
+        gpu_avg = float(gpu_result.get("avg_gpu", gpu_usage) or 0.0)
+        timeline = cpu_result.get("timeline") or [
+            {"time": 0, "cpu": cpu_result.get("avg_cpu", 0.0), "worker_ops": []}
+        ]
+        samples = [
+            {
+                "time": point["time"],
+                "cpu": float(point.get("cpu") or 0.0),
+                "gpu": gpu_avg,
+                "temp": float(temp or 0.0),
+                "worker_ops": point.get("worker_ops", []),
+            }
+            for point in timeline
+        ]
+        # the benchmark row is reused per hardware snapshot; keep only this run's series
+        channels, length, encoding, data = pack_samples(
+            samples, compress=getattr(settings, "BENCHMARK_SERIES_COMPRESSION", True))
+        BenchmarkSeries.objects.update_or_create(benchmark=benchmark, defaults={
+            "channels": channels, "length": length, "encoding": encoding, "data": data,
+        })
+    except Exception:
+        pass
+    # the series and scaling points are written without touching the Benchmark row: drop the group's cached responses
+    invalidate_on_write(benchmark.profile_id)
+
+    # --- Step 7: Update user's specs ---
+    try:
+        UserSpecs.objects.update_or_create(
+            user=user,
+            defaults={
+                "cpu_model": cpu_model,
+                "gpu_model": gpu_model,
+                "ram_gb": ram_gb,
+                "storage_gb": server_disk_total_gb()
+            }
+        )
+    except Exception:
+        pass
+
+    # --- Step 8: Bottleneck analysis ---
+    try:
+        bottleneck_data = analyze_bottlenecks({
+            "cpu_threads": psutil.cpu_count(logical=True) or 1,
+            "total_ram_gb": ram_gb,
+            "gpu_info": [{"name": gpu_model}],
+            "disk_total_gb": server_disk_total_gb(),
+            "mem_triad_gbps": benchmark.mem_triad_gbps,
+            "mem_latency_ns": benchmark.mem_latency_ns,
+            "storage_type": benchmark.storage_class or sysinfo.get("storage", {}).get("type"),
+            "disk_rand_read_iops": benchmark.disk_rand_read_iops,
+        })
+    except Exception:
+        bottleneck_data = {}
+
+    # --- Step 9: Build response ---
+    peers = score_distribution(group_sketches([benchmark.profile_id])["overall_score"], benchmark.overall_score)
+    efficiency = (round(min(100.0, benchmark.overall_score / peers["p90"] * 100.0), 2)
+                  if peers["count"] > 1 and peers["p90"] else 100.0)
+    data = dict(BenchmarkSerializer(benchmark).data)
+    data.update({
+        "raw_cpu_result": cpu_result,
+        "raw_gpu_result": gpu_result,
+        "raw_scaling_result": scaling_result,
+        "raw_memory_result": memory_result,
+        "raw_storage_result": storage_result,
+        "bottleneckAnalysis": bottleneck_data,
+        "topScore": benchmark.overall_score,
+        "efficiencyPercent": efficiency,
+        "percentile": peers["percentile"],
+        "peerScores": {k: peers[k] for k in ("count", "p50", "p90", "p99")},
+        "bottleneckComponent": None
+    })
+    return {"benchmark": benchmark, "data": data}
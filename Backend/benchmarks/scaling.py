@@ -0,0 +1,142 @@
+# benchmarks/scaling.py
+"""
+Thread-scaling sweep for the matmul kernel.
+
+Runs the stress pool at 1, 2, 4, ... N workers, plus the physical core
+count, in two placements:
+  - "spread": one worker per physical core first (SMT siblings only once
+    every core is busy), pinned, so points up to the physical core count
+    measure pure core scaling;
+  - "packed": workers fill both SMT siblings of a core before moving on,
+    so comparing it with "spread" at the same worker count shows what SMT
+    is worth.
+Hosts without SMT (or without sched_setaffinity) only get the "spread" curve.
+"""
+import glob
+import os
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as fh:
+            return int(fh.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_topology() -> List[Dict]:
+    """[{"cpu", "package", "core"}] for every CPU this process may run on."""
+    allowed = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(psutil.cpu_count() or 1))
+    topo = []
+    for cpu in allowed:
+        base = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+        package = _read_int(f"{base}/physical_package_id")
+        core = _read_int(f"{base}/core_id")
+        topo.append({
+            "cpu": cpu,
+            "package": package if package is not None else 0,
+            "core": core if core is not None else cpu,
+        })
+    return topo
+
+
+def placements(topo: List[Dict]) -> Dict[str, List[int]]:
+    """CPU order for the "spread" and "packed" placements."""
+    cores: Dict[tuple, List[int]] = {}
+    for entry in topo:
+        cores.setdefault((entry["package"], entry["core"]), []).append(entry["cpu"])
+    siblings = [sorted(cpus) for _, cpus in sorted(cores.items())]
+    depth = max(len(s) for s in siblings) if siblings else 1
+    spread = [s[i] for i in range(depth) for s in siblings if i < len(s)]
+    packed = [cpu for s in siblings for cpu in s]
+    result = {"spread": spread}
+    if depth > 1:
+        result["packed"] = packed
+    return result
+
+
+def worker_counts(n: int, physical: Optional[int] = None) -> List[int]:
+    """Powers of two below n, n itself and, when it fits, the physical core count."""
+    counts, k = {n}, 1
+    while k < n:
+        counts.add(k)
+        k *= 2
+    if physical and physical < n:
+        counts.add(physical)
+    return sorted(counts)
+
+
+def summarize_scaling(points: List[Dict], physical_cores: int, logical_cpus: int) -> Dict:
+    """Single-thread score, SMT uplift and a rough verdict on what limits scaling."""
+    spread = {p["workers"]: p for p in points if p["variant"] == "spread"}
+    single = spread.get(1, {}).get("gflops", 0.0)
+    at_cores = spread.get(physical_cores) or spread.get(max((k for k in spread if k <= physical_cores), default=1), {})
+    at_all = spread.get(logical_cpus, at_cores)
+    smt_uplift = (at_all.get("gflops", 0.0) / at_cores["gflops"] - 1.0) if at_cores.get("gflops") else 0.0
+    core_efficiency = at_cores.get("efficiency", 0.0)
+
+    if physical_cores <= 1:
+        verdict = "single-core host: limited by core count"
+    elif core_efficiency >= 0.8:
+        verdict = "scales with cores: limited by core count"
+    elif core_efficiency >= 0.5:
+        verdict = "sub-linear core scaling: shared cache / memory bandwidth contention"
+    else:
+        verdict = "poor core scaling: memory bandwidth or thermal/power limits"
+    if logical_cpus > physical_cores and smt_uplift < 0.1:
+        verdict += "; SMT adds little for this kernel"
+
+    return {
+        "single_thread_score": round(single, 3),
+        "physical_cores": physical_cores,
+        "logical_cpus": logical_cpus,
+        "efficiency_at_physical_cores": round(core_efficiency, 3),
+        "smt_uplift": round(smt_uplift, 3),
+        "verdict": verdict,
+    }
+
+
+def run_scaling_sweep(duration_seconds: int = 3, mat_size: int = 300,
+                      progress: Optional[Callable[[str, int], None]] = None) -> Dict:
+    """
+    Returns:
+      {
+        "points": [{"variant", "workers", "gflops", "speedup", "efficiency"}, ...],
+        "summary": summarize_scaling(...)
+      }
+    """
+    from .stress_pool import get_cpu_pool
+
+    pool = get_cpu_pool()
+    topo = cpu_topology()
+    order = placements(topo)
+    logical = min(len(topo), pool.size)
+    physical = len({(t["package"], t["core"]) for t in topo})
+    pin = hasattr(os, "sched_setaffinity")
+
+    points = []
+    baseline = None
+    for variant, cpu_order in order.items():
+        for k in worker_counts(logical, physical):
+            if variant == "packed" and k == 1:
+                continue  # identical to spread at one worker
+            if progress:
+                progress(variant, k)
+            result = pool.run(duration_seconds=duration_seconds, mat_size=mat_size,
+                              workers=k, cpus=cpu_order[:k] if pin else None)
+            gflops = result.get("gflops", 0.0)
+            if baseline is None:
+                baseline = gflops
+            speedup = gflops / baseline if baseline else 0.0
+            points.append({
+                "variant": variant,
+                "workers": k,
+                "gflops": round(gflops, 3),
+                "speedup": round(speedup, 3),
+                "efficiency": round(speedup / k, 3),
+            })
+
+    return {"points": points, "summary": summarize_scaling(points, physical, logical)}
@@ -0,0 +1,293 @@
+# benchmarks/sensors.py
+"""
+Temperature sensors, discovered once and then read through open file descriptors.
+
+psutil.sensors_temperatures() walks every hwmon chip and thermal zone and
+reads every label and value on each call, and get_cpu_temp() then picked a
+chip by name. At sampler rates that walk was most of the sampler's CPU time.
+Here discovery runs once per process and records the files that matter:
+
+  package   CPU package temperature: coretemp "Package id N", k10temp/zenpower
+            "Tdie" (else "Tctl"), or the chip's first sensor for single-sensor
+            chips such as cpu_thermal; failing all that, the first sensor of any
+            non-GPU chip, then a thermal zone (x86_pkg_temp preferred)
+  cores     per-core ("Core N") or per-CCD ("Tccd N") sensors of the same chip
+  gpu_edge  amdgpu/radeon "edge" sensor, or nouveau's temp1
+
+Each file stays open and a read is one os.pread(fd, 32, 0) per sensor (hwmon
+regenerates the value on every read from offset 0). A failed read (driver
+reloaded, device gone) triggers a re-discovery, at most once per
+SENSOR_REDISCOVER_INTERVAL seconds. Reads hold the lock that re-discovery
+takes to swap in the new files, so the old descriptors are only closed once
+no reader can still be using them (a closed fd number may be reused by an
+unrelated open()). Without a hwmon tree (macOS, Windows),
+readings fall back to psutil.
+"""
+import glob
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+HWMON_ROOT = "/sys/class/hwmon"
+THERMAL_ROOT = "/sys/class/thermal"
+CPU_CHIPS = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal")
+GPU_CHIPS = ("amdgpu", "radeon", "nouveau")
+PACKAGE_LABELS = ("package id", "tdie", "tctl")  # preference order within a chip
+CORE_LABELS = ("core ", "tccd")
+CPU_ZONES = ("x86_pkg_temp", "cpu-thermal", "cpu_thermal", "soc_thermal")
+
+
+class SysfsAttribute:
+    """A sysfs file kept open; value() re-reads it from offset 0 (sysfs regenerates on every such read)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def value(self) -> Optional[int]:
+        try:
+            return int(os.pread(self.fd, 32, 0).split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def open_first(*patterns: str) -> Optional[SysfsAttribute]:
+    """The first file matching any of the glob patterns that opens, or None."""
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                return SysfsAttribute(path)
+            except OSError:
+                continue
+    return None
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _index(path: str) -> int:
+    match = re.search(r"(\d+)(?!.*\d)", os.path.basename(path.rstrip("/")))
+    return int(match.group(1)) if match else 0
+
+
+def _chip_sensors(directory: str) -> List[Tuple[str, str]]:
+    """[(label, temp*_input path)] of one hwmon chip; older drivers keep the files under device/."""
+    for base in (directory, os.path.join(directory, "device")):
+        inputs = sorted(glob.glob(os.path.join(base, "temp*_input")), key=lambda p: int(re.findall(r"temp(\d+)", p)[-1]))
+        if inputs:
+            return [(_read_text(p[:-len("_input")] + "_label") or os.path.basename(p)[:-len("_input")], p)
+                    for p in inputs]
+    return []
+
+
+def _pick(sensors: List[Tuple[str, str]], labels) -> Optional[str]:
+    for wanted in labels:
+        for label, path in sensors:
+            if label.lower().startswith(wanted):
+                return path
+    return None
+
+
+def discover(hwmon_root: str = HWMON_ROOT, thermal_root: str = THERMAL_ROOT) -> Dict:
+    """Choose the sensor files: {"package": path, "cores": [(label, path)], "gpu_edge": path, "chip": name}."""
+    chips = []
+    for directory in sorted(glob.glob(os.path.join(hwmon_root, "hwmon*")), key=_index):
+        sensors = _chip_sensors(directory)
+        if sensors:
+            chips.append((_read_text(os.path.join(directory, "name")) or os.path.basename(directory), sensors))
+
+    found = {"package": None, "cores": [], "gpu_edge": None, "chip": None}
+    for wanted in CPU_CHIPS:
+        chip = next(((name, sensors) for name, sensors in chips if name == wanted), None)
+        if chip:
+            name, sensors = chip
+            found["chip"] = name
+            found["package"] = _pick(sensors, PACKAGE_LABELS) or sensors[0][1]
+            found["cores"] = [(label, path) for label, path in sensors
+                              if label.lower().startswith(CORE_LABELS)]
+            break
+    if found["package"] is None:
+        other = next(((name, sensors) for name, sensors in chips if name not in GPU_CHIPS), None)
+        if other:
+            found["chip"], found["package"] = other[0], other[1][0][1]
+    if found["package"] is None:
+        zones = [(_read_text(os.path.join(z, "type")), os.path.join(z, "temp"))
+                 for z in sorted(glob.glob(os.path.join(thermal_root, "thermal_zone*")), key=_index)]
+        zones = [(kind, path) for kind, path in zones if os.path.exists(path)]
+        zone = next(((k, p) for wanted in CPU_ZONES for k, p in zones if k == wanted), zones[0] if zones else None)
+        if zone:
+            found["chip"], found["package"] = zone
+
+    gpu = next(((name, sensors) for name, sensors in chips if name in GPU_CHIPS), None)
+    if gpu:
+        found["gpu_edge"] = _pick(gpu[1], ("edge",)) or gpu[1][0][1]
+    return found
+
+
+def _celsius(millidegrees: Optional[int]) -> Optional[float]:
+    return round(millidegrees / 1000.0, 2) if millidegrees is not None else None
+
+
+def _psutil_cpu_temp() -> Optional[float]:
+    import psutil
+    try:
+        temps = psutil.sensors_temperatures()
+        # Choose a sensible sensor if available
+        for key in ('coretemp', 'cpu-thermal', 'k10temp'):
+            if key in temps and temps[key]:
+                return round(temps[key][0].current, 2)
+        if temps:
+            first_key = next(iter(temps))
+            if temps[first_key]:
+                return round(temps[first_key][0].current, 2)
+    except Exception:
+        pass
+    return None
+
+
+_NO_SENSORS = {"chip": None, "package": None, "cores": [], "gpu_edge": None}
+
+
+class TemperatureSensors:
+    """The discovered sensors as open attributes; read() is a handful of preads."""
+
+    def __init__(self, hwmon_root: str = HWMON_ROOT, thermal_root: str = THERMAL_ROOT,
+                 rediscover_interval: float = 30.0):
+        self.hwmon_root = hwmon_root
+        self.thermal_root = thermal_root
+        self.rediscover_interval = rediscover_interval
+        self.use_psutil = not os.path.isdir(hwmon_root) and not os.path.isdir(thermal_root)
+        self._lock = threading.Lock()
+        self._state = None
+        self._discovered_at = 0.0
+        self.discoveries = 0
+        if not self.use_psutil:
+            self.rediscover()
+
+    def rediscover(self) -> None:
+        found = discover(self.hwmon_root, self.thermal_root)
+
+        def attribute(path):
+            try:
+                return SysfsAttribute(path) if path else None
+            except OSError:
+                return None
+
+        state = {
+            "chip": found["chip"],
+            "package": attribute(found["package"]),
+            "cores": [(label, a) for label, a in ((label, attribute(p)) for label, p in found["cores"]) if a],
+            "gpu_edge": attribute(found["gpu_edge"]),
+        }
+        with self._lock:
+            old, self._state = self._state, state
+            self._discovered_at = time.monotonic()
+            self.discoveries += 1
+        # readers take the lock, so none of them still holds `old`
+        if old:
+            self._close(old)
+
+    def _close(self, state) -> None:
+        for attribute in [state["package"], state["gpu_edge"], *(a for _, a in state["cores"])]:
+            if attribute:
+                attribute.close()
+
+    def _read_state(self, state) -> Tuple[Dict, bool]:
+        failed = False
+
+        def read(attribute):
+            nonlocal failed
+            if attribute is None:
+                return None
+            value = attribute.value()
+            failed = failed or value is None
+            return _celsius(value)
+
+        return {
+            "package": read(state["package"]),
+            "cores": [{"label": label, "temp": read(a)} for label, a in state["cores"]],
+            "gpu_edge": read(state["gpu_edge"]),
+        }, failed
+
+    def _may_rediscover(self) -> bool:
+        return time.monotonic() - self._discovered_at >= self.rediscover_interval
+
+    def _read_locked(self) -> Tuple[Dict, bool]:
+        with self._lock:
+            return self._read_state(self._state)
+
+    def _package_locked(self) -> Tuple[Optional[int], bool]:
+        """(millidegrees, whether a sensor exists) read under the lock."""
+        with self._lock:
+            attribute = self._state["package"]
+            return (attribute.value() if attribute else None), attribute is not None
+
+    def read(self) -> Dict:
+        """{"package": °C, "cores": [{"label", "temp"}], "gpu_edge": °C}; None where there is no sensor."""
+        if self.use_psutil:
+            return {"package": _psutil_cpu_temp(), "cores": [], "gpu_edge": None}
+        readings, failed = self._read_locked()
+        if failed and self._may_rediscover():
+            self.rediscover()
+            readings, _ = self._read_locked()
+        return readings
+
+    def package(self) -> Optional[float]:
+        """CPU package temperature in °C: one pread."""
+        if self.use_psutil:
+            return _psutil_cpu_temp()
+        value, present = self._package_locked()
+        if present and value is None and self._may_rediscover():
+            self.rediscover()
+            value, _ = self._package_locked()
+        return _celsius(value)
+
+    def describe(self) -> Dict:
+        """Which files were chosen (for diagnostics)."""
+        if self.use_psutil:
+            return {"source": "psutil"}
+        with self._lock:
+            state = self._state
+        return {
+            "source": "sysfs",
+            "chip": state["chip"],
+            "package": state["package"].path if state["package"] else None,
+            "cores": [a.path for _, a in state["cores"]],
+            "gpu_edge": state["gpu_edge"].path if state["gpu_edge"] else None,
+        }
+
+    def close(self) -> None:
+        """Close every descriptor; later reads return None until rediscover() runs."""
+        with self._lock:
+            old, self._state = self._state, _NO_SENSORS
+            if old:
+                self._close(old)
+
+
+_sensors: Optional[TemperatureSensors] = None
+_sensors_lock = threading.Lock()
+
+
+def get_sensors() -> TemperatureSensors:
+    """Process-wide sensors, discovered on first use."""
+    global _sensors
+    with _sensors_lock:
+        if _sensors is None:
+            _sensors = TemperatureSensors(
+                rediscover_interval=getattr(settings, "SENSOR_REDISCOVER_INTERVAL", 30.0))
+        return _sensors
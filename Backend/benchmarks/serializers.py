@@ -1,21 +1,70 @@
 # benchmarks/serializers.py
 from rest_framework import serializers
-from .models import Benchmark, BenchmarkMetric
+from .models import Benchmark, BenchmarkJob, BenchmarkScalingPoint, HardwareProfile
 from users.models import UserSpecs
 
-class BenchmarkMetricSerializer(serializers.ModelSerializer):
+class BenchmarkScalingPointSerializer(serializers.ModelSerializer):
     class Meta:
-        model = BenchmarkMetric
-        fields = ['time', 'cpu', 'gpu', 'temp']
+        model = BenchmarkScalingPoint
+        fields = ['variant', 'workers', 'gflops', 'speedup', 'efficiency']
+
+class HardwareProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HardwareProfile
+        fields = ['id', 'cpu_model', 'gpu_model', 'ram_gb']
 
 class BenchmarkSerializer(serializers.ModelSerializer):
-    metrics = BenchmarkMetricSerializer(many=True, read_only=True)
+    profile = HardwareProfileSerializer(read_only=True)
+    # per-sample rows decoded from the packed BenchmarkSeries ({"time", "cpu", "gpu", "temp", "worker_ops"})
+    metrics = serializers.SerializerMethodField()
+    scaling_points = BenchmarkScalingPointSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Benchmark
+        fields = [
+            'id', 'type', 'timestamp', 'cpu_model', 'gpu_model', 'ram_gb', 'profile',
+            'cpu_score', 'gpu_score', 'overall_score', 'avg_temp', 'cpu_kernel_scores',
+            'gpu_kernel_scores', 'single_thread_score', 'memory_score', 'mem_copy_gbps', 'mem_scale_gbps',
+            'mem_add_gbps', 'mem_triad_gbps', 'mem_latency_ns', 'mem_latency_curve',
+            'storage_score', 'disk_seq_read_mbps', 'disk_seq_write_mbps', 'disk_rand_read_iops',
+            'disk_rand_read_p99_us', 'disk_fsync_p50_ms', 'storage_class', 'storage_results',
+            'scaling_points', 'metrics'
+        ]
+
+    def get_metrics(self, obj):
+        # views may hand over already downsampled rows (benchmarks/downsample.py)
+        downsampled = self.context.get("metrics")
+        if downsampled is not None and obj.id in downsampled:
+            return downsampled[obj.id]
+        try:
+            return obj.series.samples()
+        except Benchmark.series.RelatedObjectDoesNotExist:
+            return []
+
+
+class BenchmarkSummarySerializer(serializers.ModelSerializer):
+    """History listing without the per-run series and raw result blobs."""
+    profile = HardwareProfileSerializer(read_only=True)
 
     class Meta:
         model = Benchmark
         fields = [
-            'id', 'type', 'timestamp', 'cpu_model', 'gpu_model', 'ram_gb',
-            'cpu_score', 'gpu_score', 'overall_score', 'avg_temp', 'metrics'
+            'id', 'type', 'timestamp', 'cpu_model', 'gpu_model', 'ram_gb', 'profile',
+            'cpu_score', 'gpu_score', 'overall_score', 'avg_temp', 'single_thread_score',
+            'memory_score', 'mem_triad_gbps', 'mem_latency_ns',
+            'storage_score', 'disk_seq_read_mbps', 'disk_rand_read_iops', 'storage_class',
+        ]
+
+
+class BenchmarkJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source='id', read_only=True)
+    benchmark_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = BenchmarkJob
+        fields = [
+            'job_id', 'type', 'status', 'progress', 'stage', 'partial_results',
+            'error', 'benchmark_id', 'created_at', 'started_at', 'finished_at'
         ]
 
 
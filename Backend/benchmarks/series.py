@@ -0,0 +1,130 @@
+# benchmarks/series.py
+"""
+Packed storage for a benchmark's per-sample time series.
+
+A run's samples are stored as one blob instead of one row per sample:
+
+  - one float32 column per channel, little-endian, laid out back to back
+    (channel-major), so channel i of an n-sample series is the byte range
+    [i*n*4, (i+1)*n*4);
+  - optionally zlib-compressed (encoding "f32-zlib" instead of "f32"),
+    kept only when it actually saves space;
+  - channel names travel with the blob: "time", "cpu", "gpu", "temp", then
+    "ops.<k>" for stress worker k and "core.<k>" for logical CPU k.
+    Samples with fewer workers/cores than the widest one hold NaN there.
+
+decode_arrays() gives zero-copy NumPy views over the (decompressed) bytes;
+to_samples() rebuilds the historical BenchmarkMetric JSON rows with only the
+standard library. float32 keeps ~7 significant digits, plenty for
+percentages, temperatures and ops/sec counters.
+"""
+import math
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ENCODING_F32 = "f32"
+ENCODING_F32_ZLIB = "f32-zlib"
+BASE_CHANNELS = ("time", "cpu", "gpu", "temp")
+OPS_PREFIX = "ops."
+CORE_PREFIX = "core."
+
+_NAN = float("nan")
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _width(samples: Sequence[Dict], key: str) -> int:
+    return max((len(s.get(key) or []) for s in samples), default=0)
+
+
+def _column(values) -> bytes:
+    col = array("f", values)
+    if _BIG_ENDIAN:
+        col.byteswap()
+    return col.tobytes()
+
+
+def pack_samples(samples: Sequence[Dict], compress: bool = True) -> Tuple[List[str], int, str, bytes]:
+    """
+    [{"time", "cpu", "gpu", "temp", "worker_ops": [...], "cores": [...]}, ...]
+    -> (channels, length, encoding, blob).
+    """
+    n = len(samples)
+    ops_width = _width(samples, "worker_ops")
+    core_width = _width(samples, "cores")
+    channels = list(BASE_CHANNELS)
+    channels += [f"{OPS_PREFIX}{k}" for k in range(ops_width)]
+    channels += [f"{CORE_PREFIX}{k}" for k in range(core_width)]
+
+    columns = [_column(float(s.get(name) or 0.0) for s in samples) for name in BASE_CHANNELS]
+    for key, width in (("worker_ops", ops_width), ("cores", core_width)):
+        for k in range(width):
+            columns.append(_column(
+                float(s[key][k]) if k < len(s.get(key) or []) else _NAN for s in samples
+            ))
+    blob = b"".join(columns)
+
+    encoding = ENCODING_F32
+    if compress and blob:
+        packed = zlib.compress(blob, 6)
+        if len(packed) < len(blob) * 0.9:
+            blob, encoding = packed, ENCODING_F32_ZLIB
+    return channels, n, encoding, blob
+
+
+def _raw(encoding: str, blob) -> memoryview:
+    if encoding == ENCODING_F32_ZLIB:
+        return memoryview(zlib.decompress(blob))
+    if encoding == ENCODING_F32:
+        return memoryview(blob)
+    raise ValueError(f"Unknown series encoding: {encoding!r}")
+
+
+def decode_arrays(channels: Sequence[str], length: int, encoding: str, blob):
+    """{channel: numpy float32 array}; each array is a view into one shared buffer (no per-channel copy)."""
+    import numpy as np
+
+    matrix = np.frombuffer(_raw(encoding, blob), dtype="<f4").reshape(len(channels), length) if length else \
+        np.empty((len(channels), 0), dtype="<f4")
+    return {name: matrix[i] for i, name in enumerate(channels)}
+
+
+def _columns(channels: Sequence[str], length: int, encoding: str, blob) -> Dict[str, memoryview]:
+    raw = _raw(encoding, blob)
+    if _BIG_ENDIAN:
+        swapped = array("f")
+        swapped.frombytes(raw)
+        swapped.byteswap()
+        raw = memoryview(swapped.tobytes())
+    floats = raw.cast("B").cast("f")
+    return {name: floats[i * length:(i + 1) * length] for i, name in enumerate(channels)}
+
+
+def _clean(value: float, digits: int = 2) -> Optional[float]:
+    return None if math.isnan(value) else round(value, digits)
+
+
+def to_samples(channels: Sequence[str], length: int, encoding: str, blob,
+               indices: Optional[Sequence[int]] = None) -> List[Dict]:
+    """The stored series (or just the samples at `indices`) as the metric rows the API has always returned."""
+    if not length:
+        return []
+    cols = _columns(channels, length, encoding, blob)
+    ops = [cols[c] for c in channels if c.startswith(OPS_PREFIX)]
+    cores = [cols[c] for c in channels if c.startswith(CORE_PREFIX)]
+    time, cpu, gpu, temp = (cols[c] for c in BASE_CHANNELS)
+
+    samples = []
+    for i in (range(length) if indices is None else indices):
+        sample = {
+            "time": int(round(time[i])),
+            "cpu": _clean(cpu[i]),
+            "gpu": _clean(gpu[i]),
+            "temp": _clean(temp[i]),
+            "worker_ops": [v for v in (_clean(col[i]) for col in ops) if v is not None],
+        }
+        if cores:
+            sample["cores"] = [v for v in (_clean(col[i]) for col in cores) if v is not None]
+        samples.append(sample)
+    return samples
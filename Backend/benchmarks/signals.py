@@ -0,0 +1,50 @@
+# benchmarks/signals.py
+"""
+Keep the per-profile score sketches (benchmarks/leaderboard.py) and the group
+response cache (benchmarks/response_cache.py) in step with Benchmark rows.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .leaderboard import SKETCHED_FIELDS, adjust_sketches
+from .models import Benchmark
+from .response_cache import invalidate_on_write
+
+
+def _scores(values):
+    return {field: values.get(field) for field in SKETCHED_FIELDS}
+
+
+@receiver(pre_save, sender=Benchmark)
+def remember_previous_scores(sender, instance, using=None, **kwargs):
+    """
+    update_or_create() overwrites rows in place; note what the sketch currently holds for this one.
+    The row stays locked until Benchmark.save()'s transaction commits, so two concurrent saves
+    cannot both subtract the same old scores. Writes that skip signals (bulk_create, update())
+    still need rebuild_sketches().
+    """
+    instance._sketch_previous = None
+    if instance.pk:
+        instance._sketch_previous = (Benchmark.objects.using(using).select_for_update().filter(pk=instance.pk)
+                                     .values("profile_id", *SKETCHED_FIELDS).first())
+
+
+@receiver(post_save, sender=Benchmark)
+def update_group_sketch(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, "_sketch_previous", None)
+    # any column may appear in a cached response, so every save invalidates
+    invalidate_on_write(instance.profile_id, previous["profile_id"] if previous else None)
+    if raw:
+        return  # fixture loading; rebuild_sketches() afterwards
+    current = {"profile_id": instance.profile_id, **{f: getattr(instance, f) for f in SKETCHED_FIELDS}}
+    if previous == current:
+        return
+    if previous:
+        adjust_sketches(previous["profile_id"], _scores(previous), -1)
+    adjust_sketches(instance.profile_id, _scores(current), 1)
+
+
+@receiver(post_delete, sender=Benchmark)
+def remove_from_group_sketch(sender, instance, **kwargs):
+    invalidate_on_write(instance.profile_id)
+    adjust_sketches(instance.profile_id, _scores({f: getattr(instance, f) for f in SKETCHED_FIELDS}), -1)
@@ -0,0 +1,111 @@
+# benchmarks/sketch.py
+"""
+DDSketch-style quantile sketch for per-hardware-group score distributions.
+
+Values go into logarithmic buckets: bucket k holds (gamma^(k-1), gamma^k] with
+gamma = (1 + a) / (1 - a), so any quantile is returned within relative error
+`a` of the true value (1% by default). The sketch is a small dict of bucket
+counts, so it is:
+  - mergeable (add the counts), which makes multi-profile groups cheap;
+  - updatable in both directions (a changed or deleted benchmark is removed
+    by decrementing its bucket);
+  - bounded in size by the score range, not by the number of benchmarks
+    (scores from 1 to 1e6 at 1% need under 700 buckets).
+
+Scores <= 0 (components that were not benchmarked) are kept in a separate
+zero bucket.
+"""
+import math
+from typing import Dict, Optional
+
+DEFAULT_ACCURACY = 0.01
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy: float = DEFAULT_ACCURACY,
+                 buckets: Optional[Dict[int, int]] = None, zero_count: int = 0):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = dict(buckets or {})
+        self.zero_count = zero_count
+
+    # --- updates ---
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value is None:
+            return
+        if value <= 0:
+            self.zero_count = max(0, self.zero_count + count)
+            return
+        key = self._key(value)
+        n = self.buckets.get(key, 0) + count
+        if n > 0:
+            self.buckets[key] = n
+        else:
+            self.buckets.pop(key, None)
+
+    def remove(self, value: float) -> None:
+        self.add(value, -1)
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy.")
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.zero_count += other.zero_count
+        return self
+
+    # --- queries ---
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def _value(self, key: int) -> float:
+        # midpoint (in relative terms) of the bucket, which bounds the error by `a`
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1); None for an empty sketch."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.buckets))
+
+    def percentile_of(self, value: float) -> Optional[float]:
+        """Share of recorded values (0-100) that are <= `value`, within one bucket."""
+        total = self.count
+        if total == 0:
+            return None
+        if value <= 0:
+            return round(100.0 * self.zero_count / total, 2)
+        limit = self._key(value)
+        below = self.zero_count + sum(n for key, n in self.buckets.items() if key <= limit)
+        return round(100.0 * below / total, 2)
+
+    # --- storage ---
+    def to_dict(self) -> Dict:
+        return {
+            "a": self.relative_accuracy,
+            "zero": self.zero_count,
+            "buckets": {str(k): n for k, n in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "DDSketch":
+        data = data or {}
+        return cls(
+            relative_accuracy=data.get("a", DEFAULT_ACCURACY),
+            buckets={int(k): int(n) for k, n in (data.get("buckets") or {}).items()},
+            zero_count=int(data.get("zero", 0)),
+        )
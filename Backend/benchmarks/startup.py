@@ -0,0 +1,84 @@
+# benchmarks/startup.py
+"""
+Cold-start import cost of the backend, measured with `python -X importtime`.
+
+A target (sdu.wsgi / sdu.asgi) is imported in a fresh interpreter together
+with ROOT_URLCONF, because Django only loads the URLconf, and through it
+every view module, on the first request. The interpreter reports each
+module's self and cumulative import time in microseconds; the total is the
+sum of the cumulative times of the top-level imports, which includes
+django.setup() run by the target's module body.
+
+HEAVY_MODULES must never load at startup. Each belongs to one benchmark
+or collector backend and is imported inside the function that needs it.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+TARGETS = ("sdu.wsgi", "sdu.asgi")
+HEAVY_MODULES = ("numpy", "psutil", "pyopencl", "pynvml", "GPUtil", "cpuinfo", "wmi", "pythoncom")
+
+
+def parse_importtime(stderr: str) -> Dict:
+    """{"total_us", "modules": {name: (self_us, cumulative_us)}} from -X importtime output."""
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        stripped = name.strip()
+        modules[stripped] = (int(self_us), int(cumulative_us))
+        if name.startswith(" ") and not name.startswith("  "):  # one space after "|": a top-level import
+            total += int(cumulative_us)
+    return {"total_us": total, "modules": modules}
+
+
+def measure(target: str, with_urls: bool = True) -> Dict:
+    """Import `target` (and the URLconf) in a fresh interpreter and parse its importtime report."""
+    statement = f"import {target}"
+    if with_urls:
+        statement += f"; import {settings.ROOT_URLCONF}"
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "sdu.settings"))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=settings.BASE_DIR,
+                               env=env, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"importing {target} failed: {errors[-1] if errors else completed.returncode}")
+    return parse_importtime(completed.stderr)
+
+
+def heavy_modules(report: Dict) -> List[str]:
+    return [name for name in HEAVY_MODULES if name in report["modules"]]
+
+
+def startup_report(targets: Sequence[str] = TARGETS, runs: int = 3, with_urls: bool = True,
+                   top: int = 10) -> Dict[str, Dict]:
+    """
+    {target: {"median_ms", "runs_ms", "heavy", "slowest"}} over `runs` fresh
+    interpreters; "slowest" lists the modules with the largest self time in
+    the median run.
+    """
+    results = {}
+    for target in targets:
+        reports = sorted((measure(target, with_urls) for _ in range(max(1, runs))), key=lambda r: r["total_us"])
+        median = reports[len(reports) // 2]
+        results[target] = {
+            "median_ms": round(statistics.median(r["total_us"] for r in reports) / 1000.0, 1),
+            "runs_ms": [round(r["total_us"] / 1000.0, 1) for r in reports],
+            "heavy": sorted({name for r in reports for name in heavy_modules(r)}),
+            "slowest": sorted(((name, round(self_us / 1000.0, 2)) for name, (self_us, _) in median["modules"].items()),
+                              key=lambda item: -item[1])[:top],
+        }
+    return results
+
+
+def budget_ms() -> Optional[float]:
+    return getattr(settings, "STARTUP_IMPORT_BUDGET_MS", None)
@@ -0,0 +1,333 @@
+# benchmarks/storage_bench.py
+"""
+Storage I/O benchmark, safe to run on production hosts.
+
+Everything happens on one scratch file inside a fresh temporary directory
+(removed afterwards). The file is at most `file_mb` and never more than 10%
+of the free space, and every phase stops at `phase_seconds` even if it has
+not covered the whole file:
+
+  - sequential write (1 MiB blocks, fsync at the end);
+  - sequential read, three ways: buffered read() with the page cache for the
+    file dropped first (posix_fadvise DONTNEED), O_DIRECT into a page-aligned
+    buffer where the OS/filesystem supports it, and a walk over an mmap of
+    the file;
+  - 4 KiB random reads at queue depth 1 (O_DIRECT when available, so the
+    device is measured rather than the page cache) with latency percentiles;
+  - fsync latency of small appends.
+
+The 4K random read latency is also what classify_storage() uses to tell
+SSDs from spinning disks. A directory on a memory-backed filesystem (tmpfs,
+ramfs: often /tmp or /dev/shm) is never classified, since it would
+always look like a very fast SSD.
+"""
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+BLOCK = 4096
+SEQ_CHUNK = 1024 * 1024
+MAX_RANDOM_OPS = 20000
+MAX_FSYNC_OPS = 200
+
+# Reference figures that map to 1000 points (a SATA SSD at queue depth 1).
+REFERENCE_SEQ_MBPS = 500.0
+REFERENCE_RAND_IOPS = 10000.0
+
+# 4K random read p50 boundaries used to classify the device
+SSD_MAX_P50_US = 500.0
+HDD_MIN_P50_US = 2000.0
+
+MEMORY_FILESYSTEMS = ("tmpfs", "ramfs", "devtmpfs", "hugetlbfs")
+MOUNTINFO = "/proc/self/mountinfo"
+
+
+def filesystem_type(path: str, mountinfo: str = MOUNTINFO) -> Optional[str]:
+    """
+    Filesystem type of the mount holding `path`, from mountinfo; None where there is none.
+    The mount whose device number matches the path's st_dev wins (so stacked mounts resolve
+    to the visible one); otherwise the longest mount point containing the path.
+    """
+    try:
+        with open(mountinfo) as fh:
+            lines = fh.read().splitlines()
+        st = os.stat(path)
+    except OSError:
+        return None
+    device = f"{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+    real = os.path.realpath(path)
+    by_device, by_prefix, longest = None, None, -1
+    for line in lines:
+        fields, _, rest = line.partition(" - ")
+        fields, rest = fields.split(), rest.split()
+        if len(fields) < 5 or not rest:
+            continue
+        mount_point = fields[4].replace("\\040", " ")
+        if fields[2] == device:
+            by_device = rest[0]
+        if (real == mount_point or real.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) >= longest:
+            by_prefix, longest = rest[0], len(mount_point)
+    return by_device or by_prefix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def _drop_cache(fd: int) -> bool:
+    """Evict this file's clean pages from the page cache; False where the OS has no posix_fadvise."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return True
+    except OSError:
+        return False
+
+
+def _open_direct(path: str) -> Optional[int]:
+    """O_DIRECT descriptor, or None on platforms/filesystems (e.g. tmpfs) that reject it."""
+    flag = getattr(os, "O_DIRECT", 0)
+    if not flag:
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | flag)
+    except OSError:
+        return None
+    probe = mmap.mmap(-1, BLOCK)
+    try:
+        os.preadv(fd, [probe], 0)  # some filesystems only fail on the first read
+    except OSError:
+        os.close(fd)
+        return None
+    finally:
+        probe.close()
+    return fd
+
+
+def _mbps(nbytes: int, seconds: float) -> float:
+    return round(nbytes / (1024 * 1024) / seconds, 2) if seconds > 0 else 0.0
+
+
+def _seq_write(path: str, size: int, deadline_s: float) -> Dict:
+    block = os.urandom(SEQ_CHUNK)  # incompressible, so compressing filesystems cannot cheat
+    written = 0
+    start = time.perf_counter()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        while written < size and time.perf_counter() - start < deadline_s:
+            written += os.write(fd, block)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return {"bytes": written, "mbps": _mbps(written, time.perf_counter() - start)}
+
+
+def _seq_read_buffered(path: str, size: int, deadline_s: float) -> Dict:
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        cold = _drop_cache(fd)
+        done = 0
+        start = time.perf_counter()
+        while done < size and time.perf_counter() - start < deadline_s:
+            chunk = os.read(fd, SEQ_CHUNK)
+            if not chunk:
+                break
+            done += len(chunk)
+        return {"mbps": _mbps(done, time.perf_counter() - start), "cold_cache": cold}
+    finally:
+        os.close(fd)
+
+
+def _seq_read_direct(path: str, size: int, deadline_s: float) -> Optional[Dict]:
+    fd = _open_direct(path)
+    if fd is None:
+        return None
+    buf = mmap.mmap(-1, SEQ_CHUNK)  # anonymous mmap is page aligned, as O_DIRECT requires
+    try:
+        done = 0
+        start = time.perf_counter()
+        while done < size and time.perf_counter() - start < deadline_s:
+            n = os.preadv(fd, [buf], done)
+            if n <= 0:
+                break
+            done += n
+        return {"mbps": _mbps(done, time.perf_counter() - start)}
+    finally:
+        buf.close()
+        os.close(fd)
+
+
+def _seq_read_mmap(path: str, size: int, deadline_s: float) -> Dict:
+    with open(path, "rb") as fh:
+        cold = _drop_cache(fh.fileno())
+        mm = mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+        try:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            done = 0
+            start = time.perf_counter()
+            view = memoryview(mm)
+            try:
+                while done < size and time.perf_counter() - start < deadline_s:
+                    end = min(size, done + SEQ_CHUNK)
+                    bytes(view[done:end])  # fault the pages in and copy them out, like a reader would
+                    done = end
+            finally:
+                view.release()
+            return {"mbps": _mbps(done, time.perf_counter() - start), "cold_cache": cold}
+        finally:
+            mm.close()
+
+
+def _random_read(path: str, size: int, deadline_s: float) -> Dict:
+    fd = _open_direct(path)
+    direct = fd is not None
+    if fd is None:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        _drop_cache(fd)
+    buf = mmap.mmap(-1, BLOCK)
+    blocks = max(1, size // BLOCK)
+    rng = random.Random(42)
+    if hasattr(os, "preadv"):
+        read = lambda offset: os.preadv(fd, [buf], offset)  # noqa: E731 (reads into the aligned buffer)
+    else:
+        read = lambda offset: os.pread(fd, BLOCK, offset)  # noqa: E731
+    latencies = []
+    try:
+        start = time.perf_counter()
+        while len(latencies) < MAX_RANDOM_OPS and time.perf_counter() - start < deadline_s:
+            offset = rng.randrange(blocks) * BLOCK
+            t0 = time.perf_counter_ns()
+            read(offset)
+            latencies.append((time.perf_counter_ns() - t0) / 1000.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        buf.close()
+        os.close(fd)
+    latencies.sort()
+    return {
+        "iops": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "ops": len(latencies),
+        "direct": direct,
+        "p50_us": round(percentile(latencies, 50), 1),
+        "p95_us": round(percentile(latencies, 95), 1),
+        "p99_us": round(percentile(latencies, 99), 1),
+    }
+
+
+def _fsync_latency(directory: str, deadline_s: float) -> Dict:
+    path = os.path.join(directory, "fsync.dat")
+    block = os.urandom(BLOCK)
+    latencies = []
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        start = time.perf_counter()
+        while len(latencies) < MAX_FSYNC_OPS and time.perf_counter() - start < deadline_s:
+            os.write(fd, block)
+            t0 = time.perf_counter_ns()
+            os.fsync(fd)
+            latencies.append((time.perf_counter_ns() - t0) / 1e6)
+    finally:
+        os.close(fd)
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def classify_storage(random_p50_us: float) -> Optional[str]:
+    """"SSD" / "HDD" from the 4K random read p50, or None when the figure is ambiguous."""
+    if not random_p50_us:
+        return None
+    if random_p50_us <= SSD_MAX_P50_US:
+        return "SSD"
+    if random_p50_us >= HDD_MIN_P50_US:
+        return "HDD"
+    return None
+
+
+def storage_score(seq_read_mbps: float, seq_write_mbps: float, rand_iops: float) -> float:
+    """Geometric mean of sequential read/write and random read points (1000 = reference SSD)."""
+    points = [
+        seq_read_mbps / REFERENCE_SEQ_MBPS * 1000.0,
+        seq_write_mbps / REFERENCE_SEQ_MBPS * 1000.0,
+        rand_iops / REFERENCE_RAND_IOPS * 1000.0,
+    ]
+    if any(p <= 0 for p in points):
+        return 0.0
+    return round((points[0] * points[1] * points[2]) ** (1.0 / 3.0), 2)
+
+
+def run_storage_benchmark(directory: Optional[str] = None, file_mb: int = 256, phase_seconds: float = 3.0,
+                          progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Returns:
+      {
+        "directory", "file_mb",
+        "seq_write_mbps", "seq_read_mbps", "seq_read_direct_mbps" (None without O_DIRECT),
+        "mmap_read_mbps", "cold_cache", "filesystem",
+        "random_read": {"iops", "ops", "direct", "p50_us", "p95_us", "p99_us"},
+        "fsync": {"ops", "p50_ms", "p99_ms"},
+        "storage_class": "SSD" | "HDD" | None (None on tmpfs/ramfs or when the page cache was in the way),
+        "storage_score": points
+      }
+    """
+    def step(name):
+        if progress:
+            progress(name)
+
+    base = directory or tempfile.gettempdir()
+    free = shutil.disk_usage(base).free
+    size = min(int(file_mb) * 1024 * 1024, free // 10)
+    size -= size % SEQ_CHUNK
+    if size < SEQ_CHUNK:
+        raise RuntimeError(f"Not enough free space in {base} for the storage benchmark.")
+
+    workdir = tempfile.mkdtemp(prefix="sdu-storage-", dir=base)
+    path = os.path.join(workdir, "bench.dat")
+    filesystem = filesystem_type(workdir)
+    in_memory = filesystem in MEMORY_FILESYSTEMS
+    try:
+        step("seq_write")
+        write = _seq_write(path, size, phase_seconds)
+        size = write["bytes"] - write["bytes"] % SEQ_CHUNK  # reads only cover what was written in time
+        step("seq_read")
+        buffered = _seq_read_buffered(path, size, phase_seconds)
+        step("seq_read_direct")
+        direct = _seq_read_direct(path, size, phase_seconds)
+        step("mmap_read")
+        mapped = _seq_read_mmap(path, size, phase_seconds)
+        step("random_read")
+        rand = _random_read(path, size, phase_seconds)
+        step("fsync")
+        fsync = _fsync_latency(workdir, min(phase_seconds, 2.0))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # O_DIRECT is the uncached figure when we have it
+    seq_read = direct["mbps"] if direct else buffered["mbps"]
+    return {
+        "directory": base,
+        "file_mb": round(size / (1024 * 1024), 1),
+        "seq_write_mbps": write["mbps"],
+        "seq_read_mbps": buffered["mbps"],
+        "seq_read_direct_mbps": direct["mbps"] if direct else None,
+        "mmap_read_mbps": mapped["mbps"],
+        "cold_cache": buffered["cold_cache"],
+        "filesystem": filesystem,
+        "random_read": rand,
+        "fsync": fsync,
+        "storage_class": (classify_storage(rand["p50_us"])
+                          if not in_memory and (rand["direct"] or buffered["cold_cache"]) else None),
+        "storage_score": storage_score(seq_read, write["mbps"], rand["iops"]),
+    }
@@ -0,0 +1,138 @@
+# benchmarks/streams.py
+"""
+Server-Sent Events stream of live telemetry.
+
+Every connection reads from the one process-wide TelemetrySampler, so adding
+clients does not add sampling work. The client is authenticated once when the
+stream opens. Each push sends only the newest sample: while a slow client is
+still receiving, the generator is not resumed, and when it is, intermediate
+samples are skipped instead of queued.
+
+EventSource cannot set headers, so browsers authenticate with a stream ticket
+(?ticket=) instead of putting the access JWT in the URL, where access and proxy
+logs would record it. A ticket is signed for this endpoint only, expires after
+TELEMETRY_STREAM_TICKET_SECONDS and is redeemed once; with the local-memory
+cache "once" holds per process.
+
+Needs an ASGI server (sdu/asgi.py); under WSGI Django would buffer the endless
+async iterator instead of streaming it, so the view answers 501 there and
+clients fall back to polling live/?since=.
+"""
+import asyncio
+import json
+import secrets
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError, AuthenticationFailed
+
+from .telemetry import get_sampler
+
+TICKET_SALT = "benchmarks.streams.ticket"
+
+
+def _ticket_seconds() -> int:
+    return getattr(settings, "TELEMETRY_STREAM_TICKET_SECONDS", 30)
+
+
+def issue_ticket(user) -> str:
+    """A signed, single-use ticket that opens one live stream for `user`."""
+    return signing.dumps({"user": user.pk, "nonce": secrets.token_urlsafe(16)}, salt=TICKET_SALT)
+
+
+def _redeem_ticket(raw: str):
+    """User id of an unexpired ticket seen for the first time, else None."""
+    try:
+        payload = signing.loads(raw, salt=TICKET_SALT, max_age=_ticket_seconds())
+    except signing.BadSignature:  # also covers SignatureExpired
+        return None
+    if not cache.add(f"sdu:stream-ticket:{payload['nonce']}", 1, _ticket_seconds()):
+        return None  # already redeemed
+    return payload["user"]
+
+
+async def _authenticate(request):
+    """User from an Authorization: Bearer JWT, or from a ?ticket= issued by live/stream/ticket/."""
+    parts = request.headers.get("Authorization", "").split()
+    if len(parts) == 2 and parts[0] == "Bearer":
+        auth = JWTAuthentication()
+        try:
+            validated = auth.get_validated_token(parts[1])
+            return await sync_to_async(auth.get_user)(validated)
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None
+
+    raw = request.GET.get("ticket")
+    user_id = await sync_to_async(_redeem_ticket)(raw) if raw else None
+    if user_id is None:
+        return None
+    return await get_user_model().objects.filter(pk=user_id).afirst()
+
+
+def _event(sample) -> str:
+    return f"id: {sample['timestamp']}\nevent: sample\ndata: {json.dumps(sample)}\n\n"
+
+
+async def _sample_stream(interval: float, last_event_id=None):
+    sampler = get_sampler()
+    keepalive = getattr(settings, "TELEMETRY_STREAM_KEEPALIVE", 15.0)
+    last_ts = None
+    last_write = time.monotonic()
+
+    # resume after a reconnect: replay what the ring buffer still holds
+    if last_event_id is not None:
+        for sample in sampler.since(last_event_id):
+            last_ts = sample["timestamp"]
+            yield _event(sample)
+
+    yield f"retry: {int(interval * 1000)}\n\n"
+    while True:
+        sample = sampler.latest()
+        if sample is not None and sample["timestamp"] != last_ts:
+            last_ts = sample["timestamp"]
+            last_write = time.monotonic()
+            yield _event(sample)
+        elif time.monotonic() - last_write >= keepalive:
+            last_write = time.monotonic()
+            yield ": keepalive\n\n"
+        await asyncio.sleep(interval)
+
+
+async def live_stream(request):
+    """
+    Stream live metric samples as Server-Sent Events.
+    Query params:
+      - ticket (optional): stream ticket from live/stream/ticket/ when no Authorization header can be sent
+      - interval (optional): seconds between pushes, clamped to TELEMETRY_STREAM_MIN_INTERVAL..60
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Streaming needs an ASGI server; poll live/?since= instead."}, status=501)
+
+    user = await _authenticate(request)
+    if user is None or not user.is_active:
+        return JsonResponse({"error": "Authentication credentials were not provided or are invalid."}, status=401)
+
+    default_interval = getattr(settings, "TELEMETRY_STREAM_INTERVAL", 1.0)
+    min_interval = getattr(settings, "TELEMETRY_STREAM_MIN_INTERVAL", 0.2)
+    try:
+        interval = float(request.GET.get("interval", default_interval))
+    except ValueError:
+        interval = default_interval
+    interval = min(max(interval, min_interval), 60.0)
+
+    try:
+        last_event_id = float(request.headers.get("Last-Event-ID"))
+    except (TypeError, ValueError):
+        last_event_id = None
+
+    response = StreamingHttpResponse(_sample_stream(interval, last_event_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # keep nginx from buffering the stream
+    return response
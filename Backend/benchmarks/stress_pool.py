@@ -0,0 +1,305 @@
+# benchmarks/stress_pool.py
+"""
+Long-lived pool of CPU stress worker processes.
+
+Workers are spawned once (and can be pre-warmed when the benchmark job pool
+starts), import NumPy once, and then sit blocked on their command queue. A
+run sends every worker a "run" command; each worker allocates its operands
+and reports ready, and the parent only starts the clock once all of them
+have. The time from command to all-ready is returned as startup latency,
+separately from the score.
+
+The "spawn" start method is used so workers never inherit the threads, locks
+or DB connections of the Django process they were started from, and so each
+worker can cap its BLAS thread pool before NumPy is first imported.
+
+The kernel multiplies two preallocated n x n float64 matrices into a
+preallocated output (np.dot(a, b, out=c)); each multiply is 2*n^3 floating
+point operations, which turns the op count into a GFLOPS score that is
+comparable across mat_size values and machines.
+"""
+import os
+import atexit
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+READY_TIMEOUT = 60.0
+DONE_TIMEOUT = 10.0
+BLAS_THREAD_ENV = (
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS",
+)
+
+
+def matmul_flops(mat_size: int) -> int:
+    """Floating point operations in one n x n matrix multiply (n multiplies + n adds per output)."""
+    return 2 * mat_size ** 3
+
+
+def _limit_blas_threads() -> None:
+    """One BLAS thread per worker: N workers each starting an N-thread pool oversubscribes the cores."""
+    for var in BLAS_THREAD_ENV:
+        os.environ[var] = "1"
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=1)
+    except Exception:
+        pass
+
+
+def _set_affinity(cpu, default_cpus) -> None:
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, {cpu} if cpu is not None else default_cpus)
+    except OSError:
+        pass
+
+
+def _stress_worker(index, commands, results, go_event, stop_event, counters):
+    """
+    Worker process: wait for commands; on "run", prepare, report ready, wait
+    for the shared go signal and multiply matrices until stop_event is set.
+    Each worker is the only writer of counters[index], so no lock is taken;
+    the parent just reads the slots.
+    """
+    _limit_blas_threads()
+    import numpy as _np
+    _limit_blas_threads()  # threadpoolctl only sees BLAS libraries once NumPy has loaded them
+    default_cpus = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    results.put(("spawned", None, index))
+
+    while True:
+        cmd = commands.get()
+        if cmd[0] == "exit":
+            break
+        if cmd[0] != "run":
+            continue
+        _, run_id, mat_size, cpu = cmd
+        _set_affinity(cpu, default_cpus)
+        # operands are generated once; the timed loop does no allocation or RNG work
+        a = _np.random.rand(mat_size, mat_size)
+        b = _np.random.rand(mat_size, mat_size)
+        c = _np.empty((mat_size, mat_size))
+        _np.dot(a, b, out=c)  # warm caches/BLAS
+        results.put(("ready", run_id, index))
+        go_event.wait()
+        while not stop_event.is_set():
+            _np.dot(a, b, out=c)
+            counters[index] += 1
+        results.put(("done", run_id, index))
+
+
+class CpuStressPool:
+    """Pre-forked stress workers, one per logical core by default."""
+
+    def __init__(self, size: Optional[int] = None, pin_workers: bool = False):
+        self.size = size or psutil.cpu_count(logical=True) or 1
+        self.pin_workers = pin_workers
+        self._ctx = mp.get_context("spawn")
+        self._workers = []
+        self._commands = []
+        self._results = None
+        self._go = None
+        self._stop = None
+        self._counters = None
+        self._run_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers) and all(p.is_alive() for p in self._workers)
+
+    def start(self) -> float:
+        """Spawn any missing workers and wait until they are idle. Returns seconds spent."""
+        with self._lock:
+            return self._start_locked()
+
+    def _start_locked(self) -> float:
+        if self.started:
+            return 0.0
+        self._shutdown_locked()
+        t0 = time.perf_counter()
+        ctx = self._ctx
+        self._results = ctx.Queue()
+        self._go = ctx.Event()
+        self._stop = ctx.Event()
+        self._counters = ctx.Array('Q', self.size, lock=False)  # one op counter per worker
+        for i in range(self.size):
+            commands = ctx.Queue()
+            p = ctx.Process(
+                target=_stress_worker,
+                args=(i, commands, self._results, self._go, self._stop, self._counters),
+                name=f"cpu-stress-{i}",
+                daemon=True,
+            )
+            p.start()
+            self._workers.append(p)
+            self._commands.append(commands)
+        self._collect("spawned", None, self.size, READY_TIMEOUT)
+        return time.perf_counter() - t0
+
+    def stop(self) -> None:
+        with self._lock:
+            self._shutdown_locked()
+
+    def _shutdown_locked(self) -> None:
+        for commands in self._commands:
+            try:
+                commands.put(("exit",))
+            except Exception:
+                pass
+        if self._stop is not None:
+            self._stop.set()
+            self._go.set()
+        for p in self._workers:
+            p.join(timeout=2)
+            if p.is_alive():
+                p.terminate()
+        self._workers, self._commands = [], []
+
+    def _collect(self, kind: str, run_id, expected: int, timeout: float) -> None:
+        """Wait for `expected` messages of `kind` for `run_id`, discarding stale ones."""
+        deadline = time.monotonic() + timeout
+        seen = 0
+        while seen < expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"CPU stress workers did not report '{kind}' in time ({seen}/{expected}).")
+            try:
+                msg_kind, msg_run, _ = self._results.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if msg_kind == kind and msg_run == run_id:
+                seen += 1
+
+    def _worker_cpus(self):
+        """CPU for each worker when pinning is enabled (round-robin over the allowed set)."""
+        if not self.pin_workers or not hasattr(os, "sched_getaffinity"):
+            return [None] * self.size
+        allowed = sorted(os.sched_getaffinity(0))
+        return [allowed[i % len(allowed)] for i in range(self.size)]
+
+    def run(self, duration_seconds: int = 10, mat_size: int = 300, sample_interval: float = 1.0,
+            workers: Optional[int] = None, cpus: Optional[List[int]] = None) -> Dict:
+        """
+        Run one measured stress window on the warm workers.
+        The per-worker counters are sampled every `sample_interval` seconds.
+        `workers` limits the run to the first k workers (the rest stay idle) and
+        `cpus` pins worker i to cpus[i], overriding pin_workers.
+        Returns:
+          {
+            "cpu_score": gflops,
+            "gflops": total_gflops (2*n^3 flops per multiply),
+            "ops_per_sec": matrix_multiplies_per_sec,
+            "mat_size": n,
+            "avg_cpu": average_cpu_percent,
+            "duration": elapsed_seconds,
+            "startup_latency": seconds_from_command_to_all_workers_ready,
+            "spawn_time": seconds_spent_spawning_workers_for_this_run (0 when warm),
+            "workers": worker_count,
+            "worker_ops": [total_ops_per_worker, ...],
+            "timeline": [{"time": seconds, "cpu": cpu_percent, "worker_ops": [ops_per_sec_per_worker, ...]}, ...]
+          }
+        """
+        with self._lock:
+            spawn_time = self._start_locked()
+            active = max(1, min(int(workers or self.size), self.size))
+            targets = list(cpus)[:active] if cpus else self._worker_cpus()[:active]
+            targets += [None] * (active - len(targets))
+            run_id = next(self._run_ids)
+            self._go.clear()
+            self._stop.clear()
+            counters = self._counters
+            for i in range(self.size):
+                counters[i] = 0
+
+            t0 = time.perf_counter()
+            for commands, cpu in zip(self._commands[:active], targets):
+                commands.put(("run", run_id, mat_size, cpu))
+            try:
+                self._collect("ready", run_id, active, READY_TIMEOUT)
+            except TimeoutError:
+                self._shutdown_locked()
+                raise
+            startup_latency = time.perf_counter() - t0
+
+            cpu_samples = []
+            timeline = []
+            psutil.cpu_percent(interval=None)
+            self._go.set()
+            start = time.perf_counter()
+            last_t, last_ops = start, [0] * active
+            try:
+                # sample CPU usage and per-worker counters on a fixed tick while workers run
+                next_tick = start
+                end = start + duration_seconds
+                while True:
+                    next_tick = min(next_tick + sample_interval, end)
+                    time.sleep(max(0.0, next_tick - time.perf_counter()))
+                    now = time.perf_counter()
+                    snapshot = counters[:active]
+                    dt = now - last_t
+                    cpu = psutil.cpu_percent(interval=None)
+                    cpu_samples.append(cpu)
+                    timeline.append({
+                        "time": round(now - start, 2),
+                        "cpu": cpu,
+                        "worker_ops": [round((c - p) / dt, 2) if dt > 0 else 0.0 for c, p in zip(snapshot, last_ops)],
+                    })
+                    last_t, last_ops = now, snapshot
+                    if now >= end:
+                        break
+            finally:
+                self._stop.set()
+                elapsed = time.perf_counter() - start
+                worker_ops = counters[:active]
+                ops = sum(worker_ops)
+                try:
+                    self._collect("done", run_id, active, DONE_TIMEOUT)
+                except TimeoutError:
+                    self._shutdown_locked()
+                self._go.clear()
+
+        avg_cpu = round(sum(cpu_samples) / len(cpu_samples), 2) if cpu_samples else 0.0
+        ops_per_sec = ops / elapsed if elapsed > 0 else 0.0
+        gflops = ops_per_sec * matmul_flops(mat_size) / 1e9
+        return {
+            "cpu_score": round(gflops, 3),
+            "gflops": round(gflops, 3),
+            "ops_per_sec": round(ops_per_sec, 2),
+            "mat_size": mat_size,
+            "avg_cpu": avg_cpu,
+            "duration": round(elapsed, 2),
+            "startup_latency": round(startup_latency, 4),
+            "spawn_time": round(spawn_time, 4),
+            "workers": active,
+            "worker_ops": list(worker_ops),
+            "timeline": timeline,
+        }
+
+
+_pool: Optional[CpuStressPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuStressPool:
+    """Process-wide stress pool; workers are spawned on first run or by prewarm_cpu_pool()."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from django.conf import settings
+            _pool = CpuStressPool(pin_workers=getattr(settings, "BENCHMARK_CPU_PIN_WORKERS", False))
+            atexit.register(_pool.stop)
+        return _pool
+
+
+def prewarm_cpu_pool() -> None:
+    """Spawn the stress workers in the background so the first run finds them idle."""
+    threading.Thread(target=get_cpu_pool().start, name="cpu-pool-prewarm", daemon=True).start()
@@ -0,0 +1,117 @@
+# benchmarks/telemetry.py
+"""
+Background telemetry sampler.
+
+One daemon thread per backend process samples CPU/GPU/temperature at a fixed
+interval into a fixed-size ring buffer. Readers (the live/ endpoint) only take
+a lock and copy from the buffer, so a poll never waits on a measurement.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from .utils import get_cpu_temp, get_gpu_usage_and_vram
+
+
+class TelemetrySampler:
+    """Fills a ring buffer of {"time", "timestamp", "cpu", "gpu", "temp"} samples."""
+
+    def __init__(self, interval: float = 1.0, capacity: int = 600):
+        self.interval = max(0.05, float(interval))
+        self.capacity = max(1, int(capacity))
+        self._buffer = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = time.time()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._started_at = time.time()
+            # prime psutil so the first non-blocking read covers a real interval
+            import psutil
+            psutil.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._loop, name="telemetry-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def sample_once(self) -> Dict:
+        """Take one non-blocking sample and append it to the buffer."""
+        now = time.time()
+        import psutil
+        cpu = psutil.cpu_percent(interval=None)
+        gpu_percent = get_gpu_usage_and_vram().get("gpu_percent")
+        temp = get_cpu_temp()
+        sample = {
+            "time": int(round(now - self._started_at)),
+            "timestamp": round(now, 3),
+            "cpu": round(cpu, 2) if cpu is not None else 0.0,
+            "gpu": gpu_percent if gpu_percent is not None else 0.0,
+            "temp": temp if temp is not None else 0.0,
+        }
+        with self._lock:
+            self._buffer.append(sample)
+        return sample
+
+    def latest(self) -> Optional[Dict]:
+        with self._lock:
+            return self._buffer[-1] if self._buffer else None
+
+    def since(self, timestamp: float) -> List[Dict]:
+        """All buffered samples taken strictly after `timestamp` (epoch seconds), oldest first."""
+        with self._lock:
+            snapshot = list(self._buffer)
+        # samples are appended in time order, so scan back from the newest one
+        start = len(snapshot)
+        while start > 0 and snapshot[start - 1]["timestamp"] > timestamp:
+            start -= 1
+        return snapshot[start:]
+
+    def _loop(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception:
+                pass
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # fell behind (slow sensor read); resync instead of bursting
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+
+_sampler: Optional[TelemetrySampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> TelemetrySampler:
+    """Process-wide sampler, started on first use (with its archiver when TELEMETRY_PERSIST is on)."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = TelemetrySampler(
+                interval=getattr(settings, "TELEMETRY_SAMPLE_INTERVAL", 1.0),
+                capacity=getattr(settings, "TELEMETRY_BUFFER_SIZE", 600),
+            )
+    _sampler.start()
+    if getattr(settings, "TELEMETRY_PERSIST", False):
+        from .retention import get_archiver
+        get_archiver(_sampler)
+    return _sampler
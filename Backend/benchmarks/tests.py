@@ -1,3 +1,1283 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from .hardware import canonical_cpu, canonical_gpu, get_or_create_profile, nominal_ram_gb
+from .leaderboard import group_profile_ids, group_sketches, hardware_group, rank_in_group, rebuild_sketches
+from .models import Benchmark, BenchmarkSeries, HardwareProfile, TelemetryRollup, TelemetrySample
+from .response_cache import get_cache, invalidate_group, stats
+from .series import ENCODING_F32, ENCODING_F32_ZLIB, decode_arrays, pack_samples, to_samples
+from .sketch import DDSketch
+
+
+class DDSketchTests(TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        import random
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(7, 1) for _ in range(20000))
+        sketch = DDSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1.0, delta=0.011)
+        self.assertAlmostEqual(sketch.percentile_of(values[len(values) // 2]), 50.0, delta=1.0)
+
+    def test_remove_merge_and_roundtrip(self):
+        a, b = DDSketch(), DDSketch()
+        for v in (10, 20, 30):
+            a.add(v)
+        b.add(40)
+        b.add(0)
+        a.merge(b)
+        a.remove(20)
+        restored = DDSketch.from_dict(a.to_dict())
+        self.assertEqual(restored.count, 4)
+        self.assertEqual(restored.zero_count, 1)
+        self.assertAlmostEqual(restored.quantile(1.0), 40, delta=0.4)
+
+
+class PackedSeriesTests(TestCase):
+    samples = [
+        {"time": 0, "cpu": 12.5, "gpu": 3.0, "temp": 55.25, "worker_ops": [101.5, 99.75]},
+        {"time": 1, "cpu": 97.3, "gpu": 3.0, "temp": 61.0, "worker_ops": [250.0, 249.5, 12.0]},
+        {"time": 2, "cpu": 99.1, "gpu": 3.0, "temp": 63.5, "worker_ops": []},
+    ]
+
+    def test_roundtrip_keeps_metric_json_shape(self):
+        packed = pack_samples(self.samples, compress=False)
+        self.assertEqual(packed[0], ["time", "cpu", "gpu", "temp", "ops.0", "ops.1", "ops.2"])
+        self.assertEqual(packed[2], ENCODING_F32)
+        self.assertEqual(len(packed[3]), 7 * 3 * 4)
+        self.assertEqual(to_samples(*packed), self.samples)  # ragged worker lists come back as sent
+
+    def test_compression_and_zero_copy_arrays(self):
+        long_run = [{"time": t, "cpu": 100.0, "gpu": 0.0, "temp": 70.0, "worker_ops": [500.0] * 8} for t in range(600)]
+        channels, length, encoding, data = pack_samples(long_run)
+        self.assertEqual(encoding, ENCODING_F32_ZLIB)
+        self.assertLess(len(data), 12 * 600 * 4 / 10)
+
+        plain = pack_samples(long_run, compress=False)
+        arrays = decode_arrays(*plain)
+        self.assertEqual(arrays["cpu"].dtype.str, "<f4")
+        self.assertFalse(arrays["cpu"].flags.owndata)  # a view over the stored bytes
+        self.assertEqual(float(arrays["ops.7"].sum()), 500.0 * 600)
+
+
+class DownsampleTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        stats.reset()
+        self.user = User.objects.create(username="me")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _long_run(self, n=10000, spike_at=4321):
+        import math
+        samples = [{"time": t, "cpu": 60 + 30 * math.sin(t / 50), "gpu": 0.0, "temp": 55.0, "worker_ops": [1.0]}
+                   for t in range(n)]
+        samples[spike_at]["temp"] = 98.0  # one-sample thermal spike
+        benchmark = Benchmark.objects.create(user=self.user, type="cpu")
+        BenchmarkSeries.from_samples(benchmark, samples).save()
+        return benchmark
+
+    def test_methods_keep_the_spike_within_budget(self):
+        import numpy as np
+        from .downsample import select_indices
+        y = np.full(10000, 55.0)
+        y[4321] = 98.0
+        arrays = {"time": np.arange(10000.0), "cpu": np.sin(np.arange(10000) / 50), "temp": y}
+        for method in ("lttb", "minmax"):
+            idx = select_indices(arrays, 200, method)
+            self.assertLessEqual(len(idx), 200)
+            self.assertIn(4321, idx)
+            self.assertEqual((idx[0], idx[-1]), (0, 9999))
+        # tiny budgets with three varying channels: the shared end points must not push the union over N
+        rng = np.random.default_rng(3)
+        for size in (4, 5, 6, 7, 8, 9, 10, 11, 50, 101, 10000, 100000):
+            varying = {"time": np.arange(float(size)), "cpu": rng.random(size), "gpu": rng.random(size),
+                       "temp": rng.random(size)}
+            for points in (3, 4, 5):
+                for method in ("lttb", "minmax"):
+                    if points < size:
+                        idx = select_indices(varying, points, method)
+                        self.assertLessEqual(len(idx), points, (size, points, method))
+                        self.assertEqual((idx[0], idx[-1]), (0, size - 1))
+
+    def test_detail_and_history_downsample_and_cache(self):
+        benchmark = self._long_run()
+        url = f"/api/benchmarks/{benchmark.id}/"
+        full = self.client.get(url).data["metrics"]
+        self.assertEqual(len(full), 10000)
+
+        for _ in range(2):
+            metrics = self.client.get(url, {"points": 300, "method": "minmax"}).data["metrics"]
+        self.assertLessEqual(len(metrics), 300)
+        self.assertEqual(max(m["temp"] for m in metrics), 98.0)
+        self.assertEqual(set(metrics[0]), {"time", "cpu", "gpu", "temp", "worker_ops"})
+        self.assertEqual(stats.snapshot()["namespaces"]["series"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+        page = self.client.get("/api/benchmarks/", {"points": 100}).data
+        self.assertLessEqual(len(page["results"][0]["metrics"]), 100)
+
+    def test_bad_points_are_rejected(self):
+        benchmark = self._long_run(n=10, spike_at=5)
+        for params in ({"points": 2}, {"points": "x"}, {"points": 50, "method": "avg"}):
+            self.assertEqual(self.client.get(f"/api/benchmarks/{benchmark.id}/", params).status_code, 400)
+        self.assertEqual(len(self.client.get(f"/api/benchmarks/{benchmark.id}/", {"points": 50}).data["metrics"]), 10)
+
+
+class HardwareCanonicalizationTests(TestCase):
+    def test_cpu_spellings_collapse(self):
+        for raw in ("Intel(R) Core(TM) i7-9700K CPU @ 3.60GHz", "Intel Core i7-9700K", "Core i7-9700K"):
+            self.assertEqual(canonical_cpu(raw), "Intel Core i7-9700K")
+        self.assertEqual(canonical_cpu("AMD Ryzen 7 5800X 8-Core Processor"), "AMD Ryzen 7 5800X")
+        self.assertEqual(canonical_cpu("Standard"), "Unknown CPU")
+
+    def test_gpu_spellings_collapse(self):
+        for raw in ("NVIDIA GA102 [GeForce RTX 3080]", "NVIDIA GeForce RTX 3080", "GeForce RTX 3080"):
+            self.assertEqual(canonical_gpu(raw), "NVIDIA GeForce RTX 3080")
+        self.assertEqual(canonical_gpu("Intel(R) UHD Graphics 630"), "Intel UHD Graphics 630")
+
+    def test_ram_snaps_to_nominal_size(self):
+        self.assertEqual([nominal_ram_gb(x) for x in (15.6, 16, 7.7, 31.2, 0)], [16, 16, 8, 32, 0])
+
+    def test_profile_is_shared_across_spellings(self):
+        a = get_or_create_profile("Intel(R) Core(TM) i7-9700K CPU @ 3.60GHz", "GeForce RTX 3080", 15.6)
+        b = get_or_create_profile("Intel Core i7-9700K", "NVIDIA GA102 [GeForce RTX 3080]", 16)
+        self.assertEqual(a.id, b.id)
+        self.assertEqual(HardwareProfile.objects.count(), 1)
+
+
+class LeaderboardTests(TestCase):
+    cpu = "Test CPU"
+    gpu = "Test GPU"
+
+    def setUp(self):
+        get_cache().clear()  # row ids are reused between tests, so versions must not survive
+        self.user = User.objects.create(username="me")
+        self.other = User.objects.create(username="other")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _bench(self, user, score, ram=16.0, cpu=None):
+        cpu = cpu or self.cpu
+        return Benchmark.objects.create(user=user, type="cpu", cpu_model=cpu, gpu_model=self.gpu, ram_gb=ram,
+                                        overall_score=score, profile=get_or_create_profile(cpu, self.gpu, ram))
+
+    def test_rank_counts_higher_scores_only(self):
+        for score in (900, 800, 800, 500):
+            self._bench(self.other, score)
+        group = hardware_group(group_profile_ids(self.cpu, self.gpu, 16.0))
+        self.assertEqual(rank_in_group(group, 1000), 1)
+        self.assertEqual(rank_in_group(group, 800), 2)  # ties share the better rank
+        self.assertEqual(rank_in_group(group, 600), 4)
+        self.assertEqual(rank_in_group(group, 100), 5)
+
+    def test_group_respects_ram_size_and_models(self):
+        self._bench(self.other, 900, ram=15.6)
+        self._bench(self.other, 900, ram=31.2)               # 32 GB profile
+        self._bench(self.other, 900, cpu="Another CPU")      # different group
+        self.assertEqual(hardware_group(group_profile_ids(self.cpu, self.gpu, 16.0)).count(), 1)
+        self.assertEqual(hardware_group(group_profile_ids(self.cpu, self.gpu)).count(), 2)
+
+    def test_compare_query_count_does_not_grow_with_group(self):
+        self._bench(self.user, 500)
+        params = {"cpu_model": self.cpu, "gpu_model": self.gpu, "ram_gb": 16.0}
+
+        for score in (100, 700, 900):
+            self._bench(self.other, score)
+        # profile ids, top5 (series joined) + scaling prefetch, user's best, rank, score sketches, group size
+        with self.assertNumQueries(7) as ctx:
+            small = self.client.get("/api/benchmarks/compare/", params)
+        queries = len(ctx.captured_queries)
+
+        profile = get_or_create_profile(self.cpu, self.gpu, 16.0)
+        Benchmark.objects.bulk_create([
+            Benchmark(user=self.other, type="cpu", cpu_model=self.cpu, gpu_model=self.gpu,
+                      ram_gb=16.0, overall_score=score, profile=profile)
+            for score in range(0, 1000, 10)
+        ])
+        invalidate_group(profile.id)  # bulk_create skips the signals
+        with self.assertNumQueries(queries):
+            large = self.client.get("/api/benchmarks/compare/", params)
+
+        self.assertEqual(small.data["user_rank"], 3)
+        self.assertEqual(large.data["user_rank"], 3 + 49)  # 510..990 beat 500
+        self.assertEqual(large.data["count"], 104)
+        self.assertEqual(len(large.data["top5"]), 5)
+
+
+class ScoreSketchSignalTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create(username="me")
+        self.profile = get_or_create_profile("Test CPU", "Test GPU", 16)
+
+    def _overall(self):
+        return group_sketches([self.profile.id])["overall_score"]
+
+    def test_save_update_and_delete_keep_sketch_in_step(self):
+        rows = [Benchmark.objects.create(user=self.user, type="cpu", profile=self.profile, overall_score=s)
+                for s in (100, 200, 300, 400)]
+        self.assertEqual(self._overall().count, 4)
+        self.assertAlmostEqual(self._overall().quantile(1.0), 400, delta=4)
+
+        rows[0].overall_score = 1000  # update in place, as update_or_create does
+        rows[0].save()
+        sketch = self._overall()
+        self.assertEqual(sketch.count, 4)
+        self.assertAlmostEqual(sketch.quantile(1.0), 1000, delta=10)
+        self.assertAlmostEqual(sketch.quantile(0.0), 200, delta=2)
+
+        rows[1].delete()
+        self.assertEqual(self._overall().count, 3)
+
+    def test_rebuild_matches_incremental(self):
+        for s in (5, 50, 500):
+            Benchmark.objects.create(user=self.user, type="cpu", profile=self.profile, overall_score=s)
+        incremental = HardwareProfile.objects.get(id=self.profile.id).score_sketches
+        rebuild_sketches(self.profile.id)
+        self.assertEqual(HardwareProfile.objects.get(id=self.profile.id).score_sketches, incremental)
+
+    def test_bottleneck_reports_percentile_against_p90(self):
+        for i, s in enumerate((100, 200, 300, 400, 500, 600, 700, 800, 900, 5000)):  # one outlier
+            Benchmark.objects.create(user=self.user if i == 4 else User.objects.create(username=f"u{i}"),
+                                     type="cpu", profile=self.profile, overall_score=s)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        data = client.get("/api/benchmarks/bottleneck/").data
+        self.assertAlmostEqual(data["percentile"], 50.0, delta=0.5)
+        self.assertEqual(data["peer_scores"]["count"], 10)
+        self.assertGreater(data["efficiency_percent"], 50)       # vs p90 (~900)
+        self.assertLess(data["efficiency_percent_vs_top"], 15)   # vs the 5000 outlier
+
+
+class ScoreSketchLockingTests(TransactionTestCase):
+    def test_previous_scores_are_read_under_a_row_lock_in_the_save_transaction(self):
+        from django.db import connection
+        from django.db.models import QuerySet
+        from django.db.models.signals import pre_save
+        get_cache().clear()
+        profile = get_or_create_profile("Test CPU", "Test GPU", 16)
+        row = Benchmark.objects.create(user=User.objects.create(username="me"), type="cpu", profile=profile,
+                                       overall_score=100)
+        atomic = []
+
+        def watch(sender, **kwargs):
+            atomic.append(connection.in_atomic_block)
+
+        pre_save.connect(watch, sender=Benchmark)
+        self.addCleanup(pre_save.disconnect, watch, sender=Benchmark)
+        row.overall_score = 200
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True,
+                               side_effect=QuerySet.select_for_update) as lock:
+            row.save()
+        self.assertEqual(atomic, [True])
+        self.assertTrue(any(call.args[0].model is Benchmark for call in lock.call_args_list))
+        self.assertAlmostEqual(group_sketches([profile.id])["overall_score"].quantile(1.0), 200, delta=2)
+        self.assertEqual(group_sketches([profile.id])["overall_score"].count, 1)
+
+
+class ResponseCacheTests(TestCase):
+    cpu = "Test CPU"
+    gpu = "Test GPU"
+
+    def setUp(self):
+        get_cache().clear()
+        stats.reset()
+        self.user = User.objects.create(username="me")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.params = {"cpu_model": self.cpu, "gpu_model": self.gpu, "ram_gb": 16.0}
+
+    def _bench(self, score, cpu=None, user=None):
+        cpu = cpu or self.cpu
+        return Benchmark.objects.create(user=user or self.user, type="cpu", cpu_model=cpu, gpu_model=self.gpu,
+                                        ram_gb=16.0, overall_score=score, profile=get_or_create_profile(cpu, self.gpu, 16))
+
+    def test_repeat_compare_is_served_from_cache(self):
+        self._bench(500)
+        first = self.client.get("/api/benchmarks/compare/", self.params).data
+        with self.assertNumQueries(1):  # profile ids only
+            second = self.client.get("/api/benchmarks/compare/", self.params).data
+        self.assertEqual(first, second)
+        counters = self.client.get("/api/benchmarks/cache/stats/").data["namespaces"]
+        self.assertEqual(counters["compare"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_writes_invalidate_only_their_group(self):
+        mine = self._bench(500)
+        other = User.objects.create(username="other")
+        self.client.get("/api/benchmarks/compare/", self.params)
+
+        self._bench(900, cpu="Another CPU", user=other)  # different group: entry survives
+        with self.assertNumQueries(1):
+            self.client.get("/api/benchmarks/compare/", self.params)
+
+        self._bench(900, user=other)
+        data = self.client.get("/api/benchmarks/compare/", self.params).data
+        self.assertEqual((data["count"], data["user_rank"]), (2, 2))
+
+        mine.overall_score = 1000  # update in place
+        mine.save()
+        self.assertEqual(self.client.get("/api/benchmarks/compare/", self.params).data["user_rank"], 1)
+
+    def test_bottleneck_is_invalidated_by_a_new_peer(self):
+        self._bench(500)
+        self._bench(500, user=User.objects.create(username="peer"))
+        self.assertEqual(self.client.get("/api/benchmarks/bottleneck/").data["peer_scores"]["count"], 2)
+        self._bench(1000, user=User.objects.create(username="fast"))
+        # the new peer is not the user's latest run, so the same benchmark's entry must be refreshed
+        data = self.client.get("/api/benchmarks/bottleneck/").data
+        self.assertEqual(data["peer_scores"]["count"], 3)
+        self.assertEqual(stats.snapshot()["namespaces"]["bottleneck"]["misses"], 2)
+
+
+class HistoryPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="me")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.profile = get_or_create_profile("Test CPU", "Test GPU", 16)
+
+    def _history(self, n):
+        rows = Benchmark.objects.bulk_create([
+            Benchmark(user=self.user, type="cpu", profile=self.profile, overall_score=i) for i in range(n)
+        ])
+        BenchmarkSeries.objects.bulk_create([
+            BenchmarkSeries.from_samples(b, [{"time": t, "cpu": 50.0, "gpu": 0.0, "temp": 0.0} for t in range(3)])
+            for b in rows
+        ])
+        return rows
+
+    def test_query_count_is_independent_of_history_size(self):
+        self._history(3)
+        with self.assertNumQueries(2):  # page (with profile and series joined), scaling points
+            small = self.client.get("/api/benchmarks/", {"limit": 50}).data
+        with self.assertNumQueries(1):
+            self.client.get("/api/benchmarks/", {"limit": 50, "summary": 1})
+
+        self._history(60)
+        with self.assertNumQueries(2):
+            large = self.client.get("/api/benchmarks/", {"limit": 50}).data
+        with self.assertNumQueries(1):
+            summary = self.client.get("/api/benchmarks/", {"limit": 50, "summary": 1}).data
+
+        self.assertEqual((len(small["results"]), small["next_cursor"]), (3, None))
+        self.assertEqual(len(large["results"]), 50)
+        self.assertEqual(len(large["results"][0]["metrics"]), 3)
+        self.assertNotIn("metrics", summary["results"][0])
+        self.assertEqual(summary["results"][0]["profile"]["cpu_model"], self.profile.cpu_model)
+
+    def test_cursor_walks_ties_without_gaps_or_repeats(self):
+        rows = self._history(25)
+        Benchmark.objects.update(timestamp=rows[0].timestamp)  # same timestamp: id breaks the tie
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 10, "summary": 1, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get("/api/benchmarks/", params).data
+            seen += [r["id"] for r in page["results"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, sorted((b.id for b in rows), reverse=True))
+
+    def test_bad_cursor_is_rejected(self):
+        self.assertEqual(self.client.get("/api/benchmarks/", {"cursor": "nope"}).status_code, 400)
+
+
+@override_settings(TELEMETRY_RAW_RETENTION_HOURS=24, TELEMETRY_1M_RETENTION_DAYS=7, TELEMETRY_DELETE_CHUNK=50,
+                   TELEMETRY_SAMPLE_INTERVAL=1.0)
+class TelemetryRetentionTests(TestCase):
+    def setUp(self):
+        from datetime import datetime, timedelta, timezone as tz
+        self.now = datetime(2026, 1, 2, 12, 0, tzinfo=tz.utc)
+        first = self.now - timedelta(hours=26)
+        # one sample every 30 s from 26 h to 22 h ago, with a single 95 % spike
+        TelemetrySample.objects.bulk_create([
+            TelemetrySample(timestamp=first + timedelta(seconds=30 * i),
+                            cpu=95.0 if i == 7 else 10.0 + i % 2, gpu=0.0, temp=50.0)
+            for i in range(4 * 120)
+        ])
+        self.first = first
+
+    def test_compact_rolls_up_then_prunes_in_chunks(self):
+        from datetime import timedelta
+        from .retention import compact
+        stats = compact(self.now)
+        self.assertEqual((stats["rolled_1m"], stats["rolled_1h"]), (240, 4))
+        self.assertEqual(stats["deleted_raw"], 240)  # the two hours past the 24 h window
+        self.assertEqual(TelemetrySample.objects.filter(timestamp__lt=self.now - timedelta(hours=24)).count(), 0)
+
+        minute = TelemetryRollup.objects.get(resolution="1m", bucket=self.first + timedelta(minutes=3))
+        self.assertEqual((minute.count, minute.cpu_min, minute.cpu_max, minute.cpu_p95), (2, 10.0, 95.0, 95.0))
+        hour = TelemetryRollup.objects.get(resolution="1h", bucket=self.first)
+        self.assertEqual((hour.count, hour.cpu_max, hour.cpu_p95), (120, 95.0, 11.0))
+        self.assertAlmostEqual(hour.cpu_mean, (60 * 10 + 59 * 11 + 95) / 120, places=2)
+
+        again = compact(self.now)  # idempotent: nothing new to roll or delete
+        self.assertEqual(sum(again.values()), 0)
+
+    def test_resolution_follows_range_and_retention(self):
+        from datetime import timedelta
+        from .retention import choose_resolution
+        now = self.now
+        self.assertEqual(choose_resolution(now - timedelta(minutes=5), now, 500, now), "raw")
+        self.assertEqual(choose_resolution(now - timedelta(hours=6), now, 500, now), "1m")
+        self.assertEqual(choose_resolution(now - timedelta(days=2), now, 500, now), "1h")
+        self.assertEqual(choose_resolution(now - timedelta(days=30), now - timedelta(days=30) + timedelta(minutes=5),
+                                           500, now), "1h")  # only hourly rollups go back that far
+
+    def test_rollup_lag_follows_the_archiver_flush_interval(self):
+        from datetime import timedelta
+        from .retention import compact, persist_samples
+        TelemetrySample.objects.all().delete()
+        now = self.now + timedelta(seconds=30)  # 12:00:30
+        minute = self.now - timedelta(minutes=2)  # the 11:58 bucket
+        persist_samples([{"timestamp": (minute + timedelta(seconds=s)).timestamp(), "cpu": 10.0} for s in (10, 50)])
+        compact(now, flush_interval=60)  # an archiver flushing every minute may still hold 11:58 samples
+        self.assertFalse(TelemetryRollup.objects.filter(resolution="1m", bucket=minute).exists())
+        persist_samples([{"timestamp": (minute + timedelta(seconds=40)).timestamp(), "cpu": 10.0}])
+        compact(now + timedelta(minutes=1), flush_interval=60)
+        self.assertEqual(TelemetryRollup.objects.get(resolution="1m", bucket=minute).count, 3)
+
+    def test_gaps_without_samples_are_skipped(self):
+        from datetime import timedelta
+        from .retention import compact, persist_samples, rollup_pending
+        later = self.now + timedelta(days=30)
+        persist_samples([{"timestamp": (later - timedelta(hours=2)).timestamp(), "cpu": 10.0}])
+        compact(later)
+        self.assertTrue(TelemetryRollup.objects.filter(resolution="1m", bucket=later - timedelta(hours=2)).exists())
+        with self.assertNumQueries(2):  # newest rollup + next sample; not one read per empty window
+            self.assertEqual(rollup_pending("1m", later + timedelta(days=3)), 0)
+
+    def test_history_flags_an_exceeded_point_budget(self):
+        from datetime import timedelta
+        from .retention import compact, history
+        compact(self.now)
+        data = history(self.first, self.first + timedelta(hours=4), max_points=2, resolution="1h")
+        self.assertEqual((len(data["points"]), data["max_points"], data["budget_exceeded"]), (4, 2, True))
+        self.assertFalse(history(self.first, self.first + timedelta(hours=4), max_points=10)["budget_exceeded"])
+
+    def test_history_endpoint_serves_rollups(self):
+        from datetime import timedelta
+        from .retention import compact
+        compact(self.now)
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="me"))
+        start = self.first + timedelta(hours=2)
+        data = client.get("/api/benchmarks/telemetry/history/", {
+            "start": start.timestamp(), "end": (start + timedelta(hours=1)).timestamp(), "resolution": "1m",
+        }).data
+        self.assertEqual((data["resolution"], len(data["points"])), ("1m", 60))
+        self.assertTrue(set(data["points"][0]).issuperset({"timestamp", "count", "cpu", "cpu_p95", "temp_max"}))
+        self.assertEqual(client.get("/api/benchmarks/telemetry/history/", {"resolution": "5m"}).status_code, 400)
+
+
+class GpuTelemetryTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.amd = self._card("card0", "amdgpu", {
+            "gpu_busy_percent": "37\n", "mem_info_vram_used": f"{1536 * 1024 * 1024}\n",
+            "mem_info_vram_total": f"{8192 * 1024 * 1024}\n", "hwmon/hwmon3/temp1_input": "61000\n",
+        })
+        self._card("card0-DP-1", "amdgpu", {})  # a connector, not a card
+        self.intel = self._card("card1", "i915", {})
+        self.rc6 = os.path.join(self.root, "card1", "gt", "gt0", "rc6_residency_ms")
+        os.makedirs(os.path.dirname(self.rc6))
+        self._write(self.rc6, "1000\n")
+
+    def _card(self, name, driver, files):
+        device = os.path.join(self.root, name, "device")
+        os.makedirs(os.path.join(self.root, "drivers", driver), exist_ok=True)
+        os.makedirs(device)
+        os.symlink(os.path.join(self.root, "drivers", driver), os.path.join(device, "driver"))
+        for relative, content in files.items():
+            os.makedirs(os.path.dirname(os.path.join(device, relative)), exist_ok=True)
+            self._write(os.path.join(device, relative), content)
+        return device
+
+    def _write(self, path, content):
+        with open(path, "w") as f:  # same inode, like a sysfs attribute changing underneath an open fd
+            f.write(content)
+
+    def test_sysfs_amdgpu_reads_through_persistent_handles(self):
+        from .gpu_telemetry import SysfsProvider
+        provider = SysfsProvider(0, root=self.root)
+        self.addCleanup(provider.close)
+        self.assertEqual(provider.read(), {"gpu_percent": 37.0, "temp_c": 61.0, "vram_used_mb": 1536,
+                                           "vram_total_mb": 8192, "name": "amdgpu (card0)"})
+        self._write(os.path.join(self.amd, "gpu_busy_percent"), "99\n")
+        self.assertEqual(provider.read()["gpu_percent"], 99.0)
+
+        reads = 2000
+        started = time.perf_counter()
+        for _ in range(reads):
+            provider.read()
+        self.assertLess((time.perf_counter() - started) / reads, 1e-3)
+
+    def test_sysfs_i915_busy_from_rc6_residency(self):
+        from .gpu_telemetry import SysfsProvider
+        provider = SysfsProvider(1, root=self.root)
+        self.addCleanup(provider.close)
+        self.assertIsNone(provider.read()["gpu_percent"])  # primes the counter
+        time.sleep(0.2)
+        self._write(self.rc6, "1050\n")  # idle 50 ms of ~200 ms
+        self.assertAlmostEqual(provider.read()["gpu_percent"], 75.0, delta=10.0)
+        with self.assertRaises(LookupError):
+            SysfsProvider(2, root=self.root)
+
+    def test_fake_provider_backs_the_utils_helpers(self):
+        from .gpu_telemetry import create_provider, get_provider, reset_provider
+        from .utils import get_gpu_usage_and_vram
+        self.addCleanup(reset_provider)
+        with override_settings(GPU_TELEMETRY_PROVIDER="fake"):
+            reset_provider()
+            get_provider().set(gpu_percent=42.123, vram_total_mb=4096)
+            self.assertEqual(get_gpu_usage_and_vram(), {"gpu_percent": 42.12, "vram_total_mb": 4096})
+            self.assertIs(get_provider(), get_provider())
+        with self.assertRaises(ValueError):
+            create_provider("nvidia-smi")
+
+
+class TemperatureSensorTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.hwmon = os.path.join(tmp.name, "hwmon")
+        self.thermal = os.path.join(tmp.name, "thermal")
+        self._chip("hwmon0", "acpitz", {"temp1": (None, 27800)})
+        self._chip("hwmon1", "coretemp", {"temp1": ("Package id 0", 55000), "temp2": ("Core 0", 52000),
+                                          "temp10": ("Core 8", 54500), "temp3": ("Core 1", 53000)})
+        self._chip("hwmon2", "amdgpu", {"temp1": ("edge", 47000), "temp2": ("junction", 58000)})
+
+    def _chip(self, directory, name, sensors):
+        path = os.path.join(self.hwmon, directory)
+        os.makedirs(path)
+        with open(os.path.join(path, "name"), "w") as f:
+            f.write(name + "\n")
+        for sensor, (label, millidegrees) in sensors.items():
+            if label:
+                with open(os.path.join(path, f"{sensor}_label"), "w") as f:
+                    f.write(label + "\n")
+            self._write(os.path.join(path, f"{sensor}_input"), millidegrees)
+        return path
+
+    def _write(self, path, value):
+        with open(path, "w") as f:
+            f.write(f"{value}\n" if value is not None else "")
+
+    def test_rediscovery_waits_for_readers_before_closing_their_files(self):
+        import threading
+        from .sensors import TemperatureSensors
+        sensors = TemperatureSensors(self.hwmon, self.thermal)
+        self.addCleanup(sensors.close)
+        real_pread = os.pread
+        seen = {}
+
+        def slow_pread(fd, length, offset):
+            if not seen:
+                seen["rediscovery"] = threading.Thread(target=sensors.rediscover)
+                seen["rediscovery"].start()
+                seen["rediscovery"].join(0.2)
+                seen["blocked"] = seen["rediscovery"].is_alive()  # waiting for this read to finish
+                os.fstat(fd)  # still open
+            return real_pread(fd, length, offset)
+
+        with mock.patch("benchmarks.sensors.os.pread", slow_pread):
+            self.assertEqual(sensors.package(), 55.0)
+        seen["rediscovery"].join()
+        self.assertTrue(seen["blocked"])
+        self.assertEqual((sensors.discoveries, sensors.package()), (2, 55.0))
+
+    def test_reads_after_close_touch_no_descriptor(self):
+        from .sensors import TemperatureSensors
+        sensors = TemperatureSensors(self.hwmon, self.thermal, rediscover_interval=0)
+        self.assertEqual(sensors.package(), 55.0)
+        sensors.close()
+        with mock.patch("benchmarks.sensors.os.pread", side_effect=AssertionError("pread on a closed sensor")):
+            self.assertEqual(sensors.read(), {"package": None, "cores": [], "gpu_edge": None})
+            self.assertIsNone(sensors.package())
+        self.assertEqual((sensors.describe()["package"], sensors.discoveries), (None, 1))
+        sensors.close()  # idempotent
+        sensors.rediscover()
+        self.addCleanup(sensors.close)
+        self.assertEqual(sensors.package(), 55.0)
+
+    def test_discovery_picks_package_cores_and_gpu_edge(self):
+        from .sensors import TemperatureSensors, discover
+        found = discover(self.hwmon, self.thermal)
+        self.assertEqual(found["chip"], "coretemp")
+        self.assertTrue(found["package"].endswith("hwmon1/temp1_input"))
+        self.assertEqual([label for label, _ in found["cores"]], ["Core 0", "Core 1", "Core 8"])
+        self.assertTrue(found["gpu_edge"].endswith("hwmon2/temp1_input"))
+
+        sensors = TemperatureSensors(self.hwmon, self.thermal)
+        self.addCleanup(sensors.close)
+        self.assertEqual(sensors.read(), {
+            "package": 55.0, "gpu_edge": 47.0,
+            "cores": [{"label": "Core 0", "temp": 52.0}, {"label": "Core 1", "temp": 53.0},
+                      {"label": "Core 8", "temp": 54.5}],
+        })
+        self._write(os.path.join(self.hwmon, "hwmon1", "temp1_input"), 71250)
+        self.assertEqual(sensors.package(), 71.25)
+        self.assertEqual(sensors.discoveries, 1)
+
+    def test_failed_read_rediscovers(self):
+        import shutil
+        from .sensors import TemperatureSensors
+        sensors = TemperatureSensors(self.hwmon, self.thermal, rediscover_interval=0)
+        self.addCleanup(sensors.close)
+        self.assertEqual(sensors.package(), 55.0)
+        # driver reload: the old chip goes away and comes back under a new hwmon index
+        self._write(os.path.join(self.hwmon, "hwmon1", "temp1_input"), None)
+        shutil.rmtree(os.path.join(self.hwmon, "hwmon1"))
+        self._chip("hwmon5", "coretemp", {"temp1": ("Package id 0", 60000)})
+        self.assertEqual(sensors.package(), 60.0)
+        self.assertEqual(sensors.discoveries, 2)
+
+    def test_thermal_zone_fallback(self):
+        from .sensors import discover
+        empty = os.path.join(self.thermal, "none")
+        for index, kind in enumerate(("acpitz", "x86_pkg_temp")):
+            zone = os.path.join(self.thermal, f"thermal_zone{index}")
+            os.makedirs(zone)
+            with open(os.path.join(zone, "type"), "w") as f:
+                f.write(kind + "\n")
+            self._write(os.path.join(zone, "temp"), 40000 + index)
+        found = discover(empty, self.thermal)
+        self.assertEqual(found["chip"], "x86_pkg_temp")
+        self.assertTrue(found["package"].endswith("thermal_zone1/temp"))
+
+
+def _opencl_cpu_device():
+    from .gpu_compute import select_device
+    return select_device("cpu")
+
+
+@skipUnless(_opencl_cpu_device(), "needs pyopencl with a CPU OpenCL device (e.g. PoCL)")
+class GpuComputeSessionTests(TestCase):
+    def setUp(self):
+        from .gpu_compute import clear_sessions
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(GPU_PROGRAM_CACHE_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.cache_dir = tmp.name
+        clear_sessions()
+        self.addCleanup(clear_sessions)
+
+    def test_session_program_and_buffers_are_reused(self):
+        from .gpu_compute import clear_sessions, get_session
+        from .utils import VEC_ADD_KERNEL
+        session = get_session("cpu")
+        self.assertIs(get_session("cpu"), session)
+        self.assertEqual(session.info["type"], "CPU")
+
+        program = session.program(VEC_ADD_KERNEL)
+        self.assertIs(session.program(VEC_ADD_KERNEL), program)
+        self.assertEqual((session.build_stats["compiles"], session.build_stats["memory_hits"]), (1, 1))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertIs(session.buffer("x", 1024), session.buffer("x", 1024))
+
+        clear_sessions()  # a fresh process: the binary comes from disk, not the compiler
+        fresh = get_session("cpu")
+        fresh.program(VEC_ADD_KERNEL)
+        self.assertEqual((fresh.build_stats["compiles"], fresh.build_stats["disk_hits"]), (0, 1))
+
+    def test_stress_test_runs_on_selected_cpu_device(self):
+        from .utils import run_gpu_stress_test
+        first = run_gpu_stress_test(duration_seconds=0.2, chunk_n=1 << 16, device="cpu")
+        self.assertGreater(first["gpu_score"], 0)
+        self.assertEqual((first["device"]["type"], first["program_cache"]), ("CPU", "compiled"))
+        second = run_gpu_stress_test(duration_seconds=0.2, chunk_n=1 << 16, device="cpu")
+        self.assertEqual(second["program_cache"], "memory")
+
+        self.assertIsNone(run_gpu_stress_test(duration_seconds=0.1, device="no-such-device")["device"])
+
+    def test_auto_takes_cpu_devices_only_when_allowed(self):
+        from .gpu_compute import describe, select_device
+        with override_settings(GPU_COMPUTE_ALLOW_CPU=False):
+            choice = select_device("auto")
+            self.assertTrue(choice is None or describe(choice[1])["type"] != "CPU")
+        with override_settings(GPU_COMPUTE_ALLOW_CPU=True):
+            self.assertIsNotNone(select_device("auto"))
+
+
+@skipUnless(_opencl_cpu_device(), "needs pyopencl with a CPU OpenCL device (e.g. PoCL)")
+class GpuSuiteTests(TestCase):
+    def test_suite_scores_every_test_from_profiling_events(self):
+        from .gpu_kernels import DEFAULT_TESTS, run_gpu_suite
+        result = run_gpu_suite(device="cpu", duration_seconds=0.5, scale=1 / 256)
+        self.assertEqual(list(result["kernels"]), DEFAULT_TESTS)
+        for name, test in result["kernels"].items():
+            self.assertGreater(test["rate"], 0, name)
+            self.assertGreaterEqual(test["repeats"], 3, name)
+        self.assertGreater(result["gpu_score"], 0)
+        self.assertTrue({"h2d_gbps", "d2h_gbps"} <= set(result["kernels"]["transfer_pinned"]))
+        self.assertGreater(result["kernels"]["overlap"]["speedup"], 0)
+
+    def test_unknown_tests_are_rejected(self):
+        from .gpu_kernels import validate_gpu_tests
+        self.assertEqual(validate_gpu_tests("FMA, fma,overlap"), ["fma", "overlap"])
+        with self.assertRaises(ValueError):
+            validate_gpu_tests(["fma", "raytrace"])
+
+
+class GpuBufferSizingTests(TestCase):
+    def _session(self, max_alloc_mb, global_mb):
+        from types import SimpleNamespace
+        return SimpleNamespace(device=SimpleNamespace(max_mem_alloc_size=max_alloc_mb * 1024 ** 2,
+                                                      global_mem_size=global_mb * 1024 ** 2))
+
+    def test_overlap_host_arrays_shrink_to_the_device(self):
+        from .gpu_kernels import OVERLAP_CHUNK_BYTES, OVERLAP_CHUNKS, _overlap
+        for max_alloc_mb, global_mb in ((4096, 16384), (32, 512), (64, 128)):
+            session = mock.Mock(**vars(self._session(max_alloc_mb, global_mb)))
+            sizes = []
+
+            def pinned(session, name, n):
+                sizes.append(n * 4)
+                raise RuntimeError("stop before launching")
+
+            with mock.patch("benchmarks.gpu_kernels._pinned", pinned), self.assertRaises(RuntimeError):
+                _overlap(session, scale=1.0, budget=0.1)
+            chunk = sizes[0] // OVERLAP_CHUNKS
+            self.assertLessEqual(chunk, OVERLAP_CHUNK_BYTES)
+            self.assertLessEqual(sizes[0], max_alloc_mb * 1024 ** 2)
+            self.assertLessEqual((4 + 2 * OVERLAP_CHUNKS) * chunk, global_mb * 1024 ** 2 // 2)
+        # last case: half of the 128 MB split over 20 chunk-sized buffers binds before the 64 MB allocation cap
+        self.assertEqual(sizes[0], 128 * 1024 ** 2 // 2 // 20 // 16 * 16 * OVERLAP_CHUNKS)
+
+    def test_transfer_buffers_fit_one_allocation(self):
+        from .gpu_kernels import _elements
+        self.assertEqual(_elements(self._session(4096, 16384), 64 * 1024 ** 2, buffers=2) * 4, 64 * 1024 ** 2)
+        self.assertEqual(_elements(self._session(16, 16384), 64 * 1024 ** 2, buffers=2) * 4, 16 * 1024 ** 2)
+        self.assertEqual(_elements(self._session(16, 16384), 64 * 1024 ** 2, span=8) * 4, 2 * 1024 ** 2)
+
+
+class StartupImportTests(TestCase):
+    def test_parse_sums_top_level_cumulative_times(self):
+        from .startup import parse_importtime
+        report = parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   child\n"
+            "import time:        50 |        150 | parent\n"
+            "import time:        30 |         30 | other\n"
+        )
+        self.assertEqual(report["total_us"], 180)
+        self.assertEqual(report["modules"]["child"], (100, 100))
+
+    def test_entry_points_stay_light(self):
+        from .startup import startup_report
+        for target, result in startup_report(runs=1, top=0).items():
+            self.assertEqual(result["heavy"], [], target)
+
+    @skipUnless(os.environ.get("SDU_STARTUP_BUDGET_TEST"), "wall-clock budget; opt in with SDU_STARTUP_BUDGET_TEST=1 "
+                                                          "or run `manage.py bench_startup`")
+    def test_entry_points_import_within_budget(self):
+        from django.conf import settings
+        from .startup import startup_report
+        for target, result in startup_report(runs=5, top=0).items():
+            self.assertLess(result["median_ms"], settings.STARTUP_IMPORT_BUDGET_MS, target)
+
+
+@override_settings(BENCHMARK_WORKER_AUTOSTART=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="me")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _job(self, **fields):
+        from .models import BenchmarkJob
+        return BenchmarkJob.objects.create(user=self.user, type="cpu", **fields)
+
+    def test_a_job_is_claimed_by_one_worker_only(self):
+        from .jobs import claim_next_job
+        first, second = self._job(), self._job()
+        self.assertEqual(claim_next_job("host:1:0").id, first.id)
+        self.assertEqual(claim_next_job("host:2:0").id, second.id)
+        self.assertIsNone(claim_next_job("host:3:0"))
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.worker_id, first.attempts), ("running", "host:1:0", 1))
+
+    def test_stale_jobs_are_requeued_until_max_attempts(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import requeue_stale_jobs
+        old = timezone.now() - timedelta(seconds=600)
+        stale = self._job(status="running", worker_id="elsewhere:1:0", heartbeat_at=old, attempts=1)
+        spent = self._job(status="running", worker_id="elsewhere:2:0", heartbeat_at=old, attempts=3)
+        alive = self._job(status="running", worker_id="elsewhere:3:0", heartbeat_at=timezone.now(), attempts=1)
+        with override_settings(BENCHMARK_JOB_STALE_SECONDS=300, BENCHMARK_JOB_MAX_ATTEMPTS=3):
+            self.assertEqual(requeue_stale_jobs(), 2)
+        for job in (stale, spent, alive):
+            job.refresh_from_db()
+        self.assertEqual((stale.status, stale.worker_id), ("queued", ""))
+        self.assertEqual(spent.status, "failed")
+        self.assertEqual(alive.status, "running")
+
+    def test_job_on_a_dead_local_process_is_requeued_at_once(self):
+        import socket
+        from django.utils import timezone
+        from .jobs import requeue_stale_jobs
+        job = self._job(status="running", worker_id=f"{socket.gethostname()}:999999999:0",
+                        heartbeat_at=timezone.now(), attempts=1)
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+
+    def test_a_failed_job_is_logged_and_keeps_its_error(self):
+        from .jobs import claim_next_job, run_job
+        self._job()
+        job = claim_next_job("host:1:0")
+        with mock.patch("benchmarks.runner.execute_benchmark", side_effect=RuntimeError("no GPU")), \
+                self.assertLogs("benchmarks.jobs", level="ERROR") as logs:
+            run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ("failed", "no GPU"))
+        self.assertIn(f"Benchmark job {job.id} failed", logs.output[0])
+        self.assertIn("RuntimeError: no GPU", logs.output[0])  # with the traceback
+
+    def test_status_and_result_endpoints(self):
+        queued = self._job(progress=0)
+        self.assertEqual(self.client.get(f"/api/benchmarks/jobs/{queued.id}/").data["status"], "queued")
+        self.assertEqual(self.client.get(f"/api/benchmarks/jobs/{queued.id}/result/").status_code, 202)
+        done = self._job(status="done", result={"overall_score": 1.0})
+        response = self.client.get(f"/api/benchmarks/jobs/{done.id}/result/")
+        self.assertEqual((response.status_code, response.data), (200, {"overall_score": 1.0}))
+        failed = self._job(status="failed", error="boom")
+        self.assertEqual(self.client.get(f"/api/benchmarks/jobs/{failed.id}/result/").status_code, 500)
+        others = self._job()
+        others.user = User.objects.create(username="other")
+        others.save()
+        self.assertEqual(self.client.get(f"/api/benchmarks/jobs/{others.id}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/benchmarks/jobs/{others.id}/result/").status_code, 404)
+
+
+@override_settings(BENCHMARK_WORKER_AUTOSTART=False)
+class JobHeartbeatTests(TransactionTestCase):
+    def test_heartbeat_advances_while_a_stage_reports_nothing(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import claim_next_job, run_job
+        from .models import BenchmarkJob
+        user = User.objects.create(username="me")
+        BenchmarkJob.objects.create(user=user, type="cpu")
+        job = claim_next_job("host:1:0")
+        claimed_at = job.heartbeat_at
+        seen = []
+
+        def silent_stage(*args, **kwargs):
+            time.sleep(0.3)
+            seen.append(BenchmarkJob.objects.get(id=job.id).heartbeat_at)
+            return {"data": {}, "benchmark": None}
+
+        with override_settings(BENCHMARK_JOB_HEARTBEAT_SECONDS=0.05), \
+                mock.patch("benchmarks.runner.execute_benchmark", silent_stage):
+            run_job(job)
+        self.assertGreater(seen[0], claimed_at)
+        self.assertLess(timezone.now() - seen[0], timedelta(seconds=1))
+        self.assertEqual(BenchmarkJob.objects.get(id=job.id).status, "done")
+
+
+def _filled_sampler(capacity=3):
+    """A stopped TelemetrySampler holding five samples stamped 1000.0 .. 1004.0."""
+    from .telemetry import TelemetrySampler
+    sampler = TelemetrySampler(interval=1.0, capacity=capacity)
+    with mock.patch("benchmarks.telemetry.get_cpu_temp", return_value=55.0), \
+            mock.patch("benchmarks.telemetry.get_gpu_usage_and_vram", return_value={"gpu_percent": 12.0}), \
+            mock.patch("benchmarks.telemetry.time.time", side_effect=[1000.0 + i for i in range(5)]):
+        for _ in range(5):
+            sampler.sample_once()
+    return sampler
+
+
+class TelemetrySamplerTests(TestCase):
+    def _sampler(self, capacity=3):
+        return _filled_sampler(capacity)
+
+    def test_ring_buffer_keeps_the_newest_samples(self):
+        sampler = self._sampler(capacity=3)
+        self.assertEqual([s["timestamp"] for s in sampler.since(0)], [1002.0, 1003.0, 1004.0])
+        self.assertEqual(sampler.latest()["timestamp"], 1004.0)
+        self.assertEqual((sampler.latest()["gpu"], sampler.latest()["temp"]), (12.0, 55.0))
+
+    def test_since_is_strictly_after(self):
+        sampler = self._sampler(capacity=10)
+        self.assertEqual([s["timestamp"] for s in sampler.since(1002.0)], [1003.0, 1004.0])
+        self.assertEqual([s["timestamp"] for s in sampler.since(1002.5)], [1003.0, 1004.0])
+        self.assertEqual(sampler.since(1004.0), [])
+
+    def test_live_endpoint_since(self):
+        sampler = self._sampler(capacity=10)
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="me"))
+        with mock.patch("benchmarks.views.get_sampler", return_value=sampler):
+            self.assertEqual(len(client.get("/api/benchmarks/live/", {"since": "1001.5"}).data), 3)
+            self.assertEqual(client.get("/api/benchmarks/live/").data["timestamp"], 1004.0)
+            self.assertEqual(client.get("/api/benchmarks/live/", {"since": "yesterday"}).status_code, 400)
+
+
+class LiveStreamTests(TestCase):
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        self.user = User.objects.create(username="me")
+        self.token = str(AccessToken.for_user(self.user))
+        self.sampler = _filled_sampler(capacity=10)
+
+    async def _open(self, headers=None, count=2, **query):
+        from django.test import AsyncClient
+        with mock.patch("benchmarks.streams.get_sampler", return_value=self.sampler):
+            response = await AsyncClient().get("/api/benchmarks/live/stream/", query, headers=headers or {})
+            if response.status_code != 200:
+                return response, []
+            chunks, stream = [], response.streaming_content
+            async for chunk in stream:
+                chunks.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+                if len(chunks) == count:
+                    break
+            await stream.aclose()
+            return response, chunks
+
+    async def test_stream_requires_a_valid_credential(self):
+        response, _ = await self._open()
+        self.assertEqual(response.status_code, 401)
+        response, _ = await self._open({"Authorization": "Bearer not-a-jwt"})
+        self.assertEqual(response.status_code, 401)
+        response, _ = await self._open(ticket="not-a-ticket")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_header_or_ticket_opens_the_stream(self):
+        from .streams import issue_ticket
+        for headers, query in (({"Authorization": f"Bearer {self.token}"}, {}), (None, {"ticket": issue_ticket(self.user)})):
+            response, chunks = await self._open(headers, **query)
+            self.assertEqual((response.status_code, response["Content-Type"]), (200, "text/event-stream"))
+            self.assertTrue(chunks[0].startswith("retry: "))
+            self.assertTrue(chunks[1].startswith("id: 1004.0\n"))
+
+    async def test_ticket_is_single_use_and_the_access_token_is_not_a_ticket(self):
+        from .streams import issue_ticket
+        ticket = issue_ticket(self.user)
+        self.assertEqual((await self._open(ticket=ticket))[0].status_code, 200)
+        self.assertEqual((await self._open(ticket=ticket))[0].status_code, 401)
+        self.assertEqual((await self._open(ticket=self.token))[0].status_code, 401)
+        self.assertEqual((await self._open(token=self.token))[0].status_code, 401)
+
+    async def test_expired_ticket_is_rejected(self):
+        from .streams import issue_ticket
+        ticket = issue_ticket(self.user)
+        with override_settings(TELEMETRY_STREAM_TICKET_SECONDS=-1):
+            response, _ = await self._open(ticket=ticket)
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket_endpoint_requires_login(self):
+        client = APIClient()
+        self.assertEqual(client.post("/api/benchmarks/live/stream/ticket/").status_code, 401)
+        client.force_authenticate(self.user)
+        response = client.post("/api/benchmarks/live/stream/ticket/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["expires_in"], 30)
+        self.assertNotIn(self.token, response.data["ticket"])
+
+    def test_wsgi_answers_501_instead_of_buffering(self):
+        from django.test import Client
+        response = Client().get("/api/benchmarks/live/stream/", headers={"Authorization": f"Bearer {self.token}"})
+        self.assertEqual(response.status_code, 501)
+
+    async def test_last_event_id_replays_the_buffer(self):
+        response, chunks = await self._open({"Authorization": f"Bearer {self.token}", "Last-Event-ID": "1002.0"},
+                                            count=3)
+        self.assertEqual([c.split("\n")[0] for c in chunks[:2]], ["id: 1003.0", "id: 1004.0"])
+        self.assertTrue(chunks[2].startswith("retry: "))
+
+
+class CpuStressPoolTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .stress_pool import CpuStressPool
+        cls.pool = CpuStressPool(size=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.stop()
+        super().tearDownClass()
+
+    def test_workers_are_spawned_once_and_reused(self):
+        first = self.pool.run(duration_seconds=0.3, mat_size=32, sample_interval=0.1)
+        pids = [p.pid for p in self.pool._workers]
+        second = self.pool.run(duration_seconds=0.3, mat_size=32, sample_interval=0.1)
+        self.assertEqual([p.pid for p in self.pool._workers], pids)
+        self.assertEqual(second["spawn_time"], 0.0)
+        self.assertGreaterEqual(first["spawn_time"], 0.0)
+        for result in (first, second):
+            self.assertGreater(result["startup_latency"], 0.0)
+            self.assertLess(result["startup_latency"], 10.0)
+            self.assertGreater(result["cpu_score"], 0.0)
+
+    def test_run_can_use_fewer_workers(self):
+        result = self.pool.run(duration_seconds=0.2, mat_size=32, sample_interval=0.1, workers=1)
+        self.assertEqual((result["workers"], len(result["worker_ops"])), (1, 1))
+        self.assertEqual(self.pool.run(duration_seconds=0.2, mat_size=32, workers=1)["spawn_time"], 0.0)
+
+
+class CpuStressCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .stress_pool import CpuStressPool
+        cls.pool = CpuStressPool(size=2)
+        cls.result = cls.pool.run(duration_seconds=0.6, mat_size=32, sample_interval=0.2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.stop()
+        super().tearDownClass()
+
+    def test_every_worker_counts_its_own_operations(self):
+        result = self.result
+        self.assertEqual(len(result["worker_ops"]), 2)
+        self.assertTrue(all(ops > 0 for ops in result["worker_ops"]))
+        self.assertAlmostEqual(result["ops_per_sec"] * result["duration"], sum(result["worker_ops"]),
+                               delta=0.02 * sum(result["worker_ops"]) + 1)
+
+    def test_timeline_has_a_rate_per_worker_and_tick(self):
+        timeline = self.result["timeline"]
+        self.assertEqual([point["time"] for point in timeline], sorted(point["time"] for point in timeline))
+        self.assertGreaterEqual(len(timeline), 3)
+        self.assertTrue(all(len(point["worker_ops"]) == 2 for point in timeline))
+        # rate x tick length adds back up to the counted operations
+        counted, last = 0.0, 0.0
+        for point in timeline:
+            counted += sum(point["worker_ops"]) * (point["time"] - last)
+            last = point["time"]
+        self.assertAlmostEqual(counted, sum(self.result["worker_ops"]), delta=0.05 * sum(self.result["worker_ops"]) + 2)
+
+
+class CpuMatmulKernelTests(TestCase):
+    def test_score_is_gflops_from_2n3_flops_per_multiply(self):
+        from .stress_pool import CpuStressPool, matmul_flops
+        self.assertEqual(matmul_flops(300), 54_000_000)
+        pool = CpuStressPool(size=1)
+        self.addCleanup(pool.stop)
+        result = pool.run(duration_seconds=0.3, mat_size=48, sample_interval=0.1)
+        self.assertEqual(result["mat_size"], 48)
+        self.assertAlmostEqual(result["gflops"], result["ops_per_sec"] * matmul_flops(48) / 1e9, places=2)
+        self.assertEqual(result["cpu_score"], result["gflops"])
+
+    def test_workers_cap_blas_at_one_thread(self):
+        from .stress_pool import BLAS_THREAD_ENV, _limit_blas_threads
+        threadpoolctl = mock.Mock()
+        with mock.patch.dict(os.environ, {"OMP_NUM_THREADS": "64"}), \
+                mock.patch.dict("sys.modules", {"threadpoolctl": threadpoolctl}):
+            _limit_blas_threads()
+            self.assertEqual({os.environ[var] for var in BLAS_THREAD_ENV}, {"1"})
+        threadpoolctl.threadpool_limits.assert_called_once_with(limits=1)
+
+
+class CpuSuiteTests(TestCase):
+    def test_validate_kernels(self):
+        from .cpu_kernels import DEFAULT_KERNELS, validate_kernels
+        self.assertEqual(validate_kernels(None), DEFAULT_KERNELS)
+        self.assertEqual(validate_kernels(" Sort, json,sort,"), ["sort", "json"])
+        self.assertEqual(validate_kernels(["", " "]), DEFAULT_KERNELS)
+        with self.assertRaises(ValueError):
+            validate_kernels(["sort", "raytrace"])
+
+    def test_composite_is_a_weighted_geometric_mean(self):
+        import math
+        from .cpu_kernels import composite_score
+        # matmul weighs 2: (4000^2 * 1000)^(1/3)
+        self.assertAlmostEqual(composite_score({"matmul": {"score": 4000.0}, "sort": {"score": 1000.0}}),
+                               round(math.exp((2 * math.log(4000) + math.log(1000)) / 3), 2))
+        self.assertEqual(composite_score({"sort": {"score": 500.0}, "json": {"score": 0.0}}), 500.0)  # failed kernels are skipped
+        self.assertEqual(composite_score({}), 0.0)
+
+    def test_suite_scores_against_the_reference_rates(self):
+        from .cpu_kernels import KERNELS, run_cpu_suite
+        seen = []
+        result = run_cpu_suite(["sort", "json"], progress=seen.append)
+        self.assertEqual(seen, ["sort", "json"])
+        for name, kernel in result["kernels"].items():
+            self.assertGreater(kernel["rate"], 0, name)
+            self.assertAlmostEqual(kernel["score"], kernel["rate"] / KERNELS[name].reference * 1000.0, delta=0.01)
+        self.assertGreater(result["cpu_score"], 0)
+
+
+class ScalingSweepTests(TestCase):
+    def test_worker_counts_include_the_physical_cores(self):
+        from .scaling import worker_counts
+        self.assertEqual(worker_counts(12, 6), [1, 2, 4, 6, 8, 12])
+        self.assertEqual(worker_counts(8, 4), [1, 2, 4, 8])
+        self.assertEqual(worker_counts(1, 1), [1])
+        self.assertEqual(worker_counts(4, 6), [1, 2, 4])  # pool smaller than the core count
+
+    def test_summary_uses_the_measured_physical_core_point(self):
+        from .scaling import run_scaling_sweep
+        # 6 cores x 2 SMT siblings; SMT adds 2 GFLOPS per extra thread
+        topo = [{"cpu": cpu, "package": 0, "core": cpu % 6} for cpu in range(12)]
+        pool = mock.Mock(size=12)
+        pool.run.side_effect = lambda workers, **kwargs: {"gflops": 10.0 * min(workers, 6) + 2.0 * max(0, workers - 6)}
+        with mock.patch("benchmarks.scaling.cpu_topology", return_value=topo), \
+                mock.patch("benchmarks.stress_pool.get_cpu_pool", return_value=pool):
+            result = run_scaling_sweep(duration_seconds=0)
+        spread = [p["workers"] for p in result["points"] if p["variant"] == "spread"]
+        self.assertEqual(spread, [1, 2, 4, 6, 8, 12])
+        summary = result["summary"]
+        self.assertEqual((summary["physical_cores"], summary["logical_cpus"]), (6, 12))
+        self.assertEqual(summary["efficiency_at_physical_cores"], 1.0)
+        self.assertEqual(summary["smt_uplift"], 0.2)  # 72 / 60, not 72 / 40 from the 4-worker point
+        self.assertNotIn("SMT adds little", summary["verdict"])
+
+
+@override_settings(BENCHMARK_WORKER_AUTOSTART=False)
+class RunnerTests(TestCase):
+    SCALING = {
+        "points": [{"variant": "spread", "workers": 1, "gflops": 10.0, "speedup": 1.0, "efficiency": 1.0}],
+        "summary": {"single_thread_score": 10.0},
+    }
+
+    def setUp(self):
+        self.user = User.objects.create(username="me")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _run(self, bench_type="cpu", params=None, **steps):
+        """execute_benchmark with every measuring step replaced; returns (payload, [(percent, stage)])."""
+        from .runner import execute_benchmark
+        returns = {
+            "run_cpu_suite": {"cpu_score": 100.0, "avg_cpu": 50.0, "duration": 1.0, "kernels": {}},
+            "run_scaling_sweep": self.SCALING,
+            "run_memory_benchmark": {"memory_score": 10.0, "triad_gbps": 20.0},
+            "run_storage_benchmark": {"storage_score": 10.0, "storage_class": "SSD"},
+            "run_gpu_suite": {"gpu_score": 50.0, "kernels": {}},
+            "get_cpu_temp": 50.0,
+            "read_gpu": {"gpu_percent": 0.0, "temp_c": None},
+        }
+        returns.update(steps)
+        reported = []
+        with mock.patch("diagnostics.utils.system_collector.get_static_info", return_value={
+                    "cpu": {"model": "Runner CPU"}, "gpu": {"model": "Runner GPU"}, "ram": {"total": "16 GB"}}), \
+                mock.patch("diagnostics.utils.system_collector.record_storage_class") as record:
+            patchers = [mock.patch(f"benchmarks.runner.{name}", return_value=value) for name, value in returns.items()]
+            for patcher in patchers:
+                patcher.start()
+            try:
+                outcome = execute_benchmark(self.user, bench_type, params,
+                                            progress=lambda percent, stage, **_: reported.append((percent, stage)))
+            finally:
+                for patcher in patchers:
+                    patcher.stop()
+        self.record_storage_class = record
+        return outcome, reported
+
+    def test_progress_never_moves_backwards(self):
+        _, reported = self._run("hybrid", {"scaling": True, "memory": True, "storage": True})
+        percents = [percent for percent, _ in reported]
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual([stage for _, stage in reported if stage.endswith("_done")],
+                         ["cpu_done", "scaling_done", "memory_done", "storage_done", "gpu_done"])
+
+    def test_only_scaling_runs_replace_the_single_thread_score(self):
+        outcome, _ = self._run("cpu", {"scaling": True})
+        benchmark = outcome["benchmark"]
+        self.assertEqual(benchmark.single_thread_score, 10.0)
+        outcome, _ = self._run("cpu")
+        self.assertEqual(outcome["benchmark"].id, benchmark.id)
+        self.assertEqual(outcome["benchmark"].single_thread_score, 10.0)
+        self.assertEqual(outcome["benchmark"].scaling_points.count(), 1)
+
+    def test_storage_class_is_recorded_only_for_the_inventory_disk(self):
+        storage = {"storage_score": 10.0, "storage_class": "SSD", "directory": "/scratch"}
+        for same_device in (True, False):
+            with mock.patch("diagnostics.utils.system_collector.on_inventory_disk", return_value=same_device) as check:
+                self._run("storage", run_storage_benchmark=storage)
+            check.assert_called_once_with("/scratch")
+            self.assertEqual(self.record_storage_class.called, same_device)
+
+    def test_run_endpoint_parses_step_flags(self):
+        from .models import BenchmarkJob
+        for key in ("scaling", "memory", "storage"):
+            for sent, expected in (("false", False), ("0", False), ("true", True), (True, True)):
+                response = self.client.post("/api/benchmarks/run/", {"type": "cpu", key: sent}, format="json")
+                self.assertEqual(response.status_code, 202)
+                self.assertIs(BenchmarkJob.objects.get(id=response.data["job_id"]).params[key], expected, (key, sent))
+
+
+class MemoryBenchmarkTests(TestCase):
+    def _memory(self, available):
+        return mock.patch("benchmarks.memory_bench.psutil.virtual_memory", return_value=mock.Mock(available=available))
+
+    def test_arrays_span_several_times_the_llc(self):
+        from .memory_bench import MIN_LLC_MULTIPLE, _array_elements
+        llc = 300 * 1024 * 1024  # larger than the old 256 MB cap
+        with self._memory(64 * 1024 ** 3):
+            self.assertGreaterEqual(_array_elements(llc) * 8, MIN_LLC_MULTIPLE * llc)
+        with self._memory(1024 ** 3):
+            self.assertEqual(_array_elements(llc) * 8, 1024 ** 3 // 8)  # the RAM bound still wins
+
+    def test_run_that_fits_in_cache_is_flagged_and_not_scored(self):
+        from .memory_bench import run_memory_benchmark
+        curve = [{"working_set_kb": 16, "ns_per_access": 50.0, "ns_over_l1": 0.0}]
+        with self._memory(64 * 1024 * 1024), \
+                mock.patch("benchmarks.memory_bench.llc_bytes", return_value=300 * 1024 * 1024), \
+                mock.patch("benchmarks.memory_bench.measure_latency", return_value=curve):
+            result = run_memory_benchmark()
+        self.assertTrue(result["fits_in_cache"])
+        self.assertGreater(result["triad_gbps"], 0)
+        self.assertEqual(result["memory_score"], 0.0)
+
+
+class StorageBenchmarkTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _mountinfo(self, *lines):
+        path = os.path.join(self.dir, "mountinfo")
+        with open(path, "w") as fh:
+            fh.write("\n".join(lines) + "\n")
+        return path
+
+    def test_filesystem_type_from_mountinfo(self):
+        from .storage_bench import filesystem_type
+        st = os.stat(self.dir)
+        device = f"{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+        stacked = self._mountinfo(
+            "28 1 254:0 / / rw,relatime - ext4 /dev/vda rw",
+            f"26 25 {device} / /elsewhere rw,relatime - ext4 /dev/vdb rw",
+            f"31 26 {device} / /elsewhere rw,relatime - tmpfs tmpfs rw",  # the later (visible) mount wins
+        )
+        self.assertEqual(filesystem_type(self.dir, stacked), "tmpfs")
+        by_prefix = self._mountinfo("28 1 999:0 / / rw - ext4 /dev/vda rw",
+                                    f"29 28 999:1 / {os.path.realpath(self.dir)} rw - ramfs ramfs rw")
+        self.assertEqual(filesystem_type(self.dir, by_prefix), "ramfs")
+        self.assertIsNone(filesystem_type(self.dir, os.path.join(self.dir, "missing")))
+
+    def test_memory_backed_directory_is_not_classified(self):
+        from .storage_bench import run_storage_benchmark
+        with mock.patch("benchmarks.storage_bench.filesystem_type", return_value="tmpfs"):
+            result = run_storage_benchmark(self.dir, file_mb=2, phase_seconds=0.1)
+        self.assertEqual(result["filesystem"], "tmpfs")
+        self.assertIsNone(result["storage_class"])
+        self.assertGreater(result["random_read"]["ops"], 0)
+
+    def test_inventory_disk_is_the_root_filesystem(self):
+        from diagnostics.utils.system_collector import on_inventory_disk
+        self.assertTrue(on_inventory_disk(os.path.abspath(os.sep)))
+        real_stat = os.stat
+        with mock.patch("diagnostics.utils.system_collector.os.stat",
+                        side_effect=lambda p: mock.Mock(st_dev=1) if p == self.dir else real_stat(p)):
+            self.assertFalse(on_inventory_disk(self.dir))
+        self.assertFalse(on_inventory_disk(os.path.join(self.dir, "missing")))
@@ -1,16 +1,32 @@
 from django.urls import path
 from .views import (
     user_benchmarks,
+    benchmark_detail,
     run_benchmark,
+    job_status,
+    job_result,
     live_metrics,
+    live_stream_ticket,
+    telemetry_history,
     compare_benchmarks,
     bottleneck_analysis,
+    cache_stats,
+    gpu_devices,
 )
+from .streams import live_stream
 
 urlpatterns = [
     path("", user_benchmarks, name="user_benchmarks"),
+    path("<int:benchmark_id>/", benchmark_detail, name="benchmark_detail"),
     path("run/", run_benchmark, name="run_benchmark"),
+    path("jobs/<int:job_id>/", job_status, name="benchmark_job_status"),
+    path("jobs/<int:job_id>/result/", job_result, name="benchmark_job_result"),
     path("live/", live_metrics, name="live_metrics"),
+    path("live/stream/", live_stream, name="live_stream"),
+    path("live/stream/ticket/", live_stream_ticket, name="live_stream_ticket"),
+    path("telemetry/history/", telemetry_history, name="telemetry_history"),
     path("compare/", compare_benchmarks, name="compare_benchmarks"),      # <-- new
     path("bottleneck/", bottleneck_analysis, name="bottleneck_analysis"), # <-- new
+    path("cache/stats/", cache_stats, name="benchmark_cache_stats"),
+    path("gpu/devices/", gpu_devices, name="gpu_devices"),
 ]
@@ -1,47 +1,30 @@
 # benchmarks/utils.py
 import time
-import psutil
 from typing import List, Dict, Optional
-import multiprocessing as mp
 
-try:
-    import GPUtil
-except Exception:
-    GPUtil = None
+from .gpu_telemetry import read_gpu
+from .sensors import get_sensors
 
 def get_cpu_percent() -> float:
     # short blocking read for a momentary percent
+    import psutil
     return round(psutil.cpu_percent(interval=1), 2)
 
 def get_cpu_temp() -> Optional[float]:
+    """CPU package temperature from the sensors found at startup (see benchmarks/sensors.py)."""
     try:
-        temps = psutil.sensors_temperatures()
-        # Choose a sensible sensor if available
-        for key in ('coretemp', 'cpu-thermal', 'k10temp'):
-            if key in temps and temps[key]:
-                return round(temps[key][0].current, 2)
-        if temps:
-            first_key = next(iter(temps))
-            if temps[first_key]:
-                return round(temps[first_key][0].current, 2)
+        return get_sensors().package()
     except Exception:
-        pass
-    return None
+        return None
 
 def get_gpu_usage_and_vram() -> Dict[str, Optional[float]]:
-    """Return dict { 'gpu_percent': float or None, 'vram_total_mb': int or None }."""
-    if not GPUtil:
-        return {"gpu_percent": None, "vram_total_mb": None}
-    try:
-        gpus = GPUtil.getGPUs()
-        if not gpus:
-            return {"gpu_percent": None, "vram_total_mb": None}
-        gpu = gpus[0]
-        gpu_percent = round(gpu.load * 100, 2)
-        vram_total = int(gpu.memoryTotal) if hasattr(gpu, "memoryTotal") and gpu.memoryTotal else None
-        return {"gpu_percent": gpu_percent, "vram_total_mb": vram_total}
-    except Exception:
-        return {"gpu_percent": None, "vram_total_mb": None}
+    """Return dict { 'gpu_percent': float or None, 'vram_total_mb': int or None } (see benchmarks/gpu_telemetry.py)."""
+    reading = read_gpu()
+    gpu_percent = reading.get("gpu_percent")
+    return {
+        "gpu_percent": round(gpu_percent, 2) if gpu_percent is not None else None,
+        "vram_total_mb": reading.get("vram_total_mb"),
+    }
 
 def run_samples(duration_seconds: int = 60, sample_count: int = 3, sample_interval: Optional[int] = None) -> List[Dict]:
     """
@@ -75,144 +58,127 @@ def run_samples(duration_seconds: int = 60, sample_count: int = 3, sample_interv
 # ---------------------------------------------------------
 # CPU stress (multi-process) — uses all logical cores
 # ---------------------------------------------------------
-import numpy as np
-
-def _cpu_worker(stop_event: mp.Event, op_counter: mp.Value, mat_size: int):
-    """
-    Worker process: continuously multiply matrices until stop_event is set.
-    Increments op_counter for each completed multiplication.
-    """
-    # imports inside worker process
-    import numpy as _np
-    while not stop_event.is_set():
-        a = _np.random.rand(mat_size, mat_size)
-        b = _np.random.rand(mat_size, mat_size)
-        _ = _np.dot(a, b)
-        with op_counter.get_lock():
-            op_counter.value += 1
-
 def run_cpu_stress_test(duration_seconds: int = 10, mat_size: int = 300) -> Dict[str, float]:
     """
-    Run a CPU stress test using one worker per logical core (multiprocessing).
+    Run a CPU stress test on the persistent stress pool (one worker per logical core,
+    see benchmarks/stress_pool.py). Measurement starts once every worker is ready.
     Returns:
       {
-        "cpu_score": operations_per_sec,
+        "cpu_score": gflops (2*mat_size^3 flops per multiply),
+        "gflops": gflops,
+        "ops_per_sec": matrix_multiplies_per_sec,
         "avg_cpu": average_cpu_percent,
-        "duration": elapsed_seconds
+        "duration": elapsed_seconds,
+        "startup_latency": seconds_until_all_workers_ready,
+        "spawn_time": seconds_spent_spawning_workers (0 when pre-warmed),
+        "workers": worker_count,
+        "worker_ops": [total_ops_per_worker, ...],
+        "timeline": [{"time", "cpu", "worker_ops"}, ...]
       }
     """
-    cores = psutil.cpu_count(logical=True) or 1
-    stop_event = mp.Event()
-    op_counter = mp.Value('L', 0)  # unsigned long counter
-
-    workers = []
-    for _ in range(cores):
-        p = mp.Process(target=_cpu_worker, args=(stop_event, op_counter, mat_size), daemon=True)
-        p.start()
-        workers.append(p)
-
-    cpu_samples = []
-    start = time.time()
-    try:
-        # sample CPU usage periodically while workers run
-        while time.time() - start < duration_seconds:
-            # sample over a short interval
-            cpu_samples.append(psutil.cpu_percent(interval=0.5))
-    finally:
-        # stop workers
-        stop_event.set()
-        for p in workers:
-            p.join(timeout=2)
-
-    elapsed = time.time() - start
-    ops = op_counter.value
-    avg_cpu = round(sum(cpu_samples) / len(cpu_samples), 2) if cpu_samples else 0.0
-    score = round(ops / elapsed, 2) if elapsed > 0 else 0.0
-
-    return {"cpu_score": score, "avg_cpu": avg_cpu, "duration": round(elapsed, 2)}
+    from .stress_pool import get_cpu_pool
+    return get_cpu_pool().run(duration_seconds=duration_seconds, mat_size=mat_size)
 
 # ---------------------------------------------------------
 # GPU stress (OpenCL) — larger/chunked workload + repeats
 # ---------------------------------------------------------
-def run_gpu_stress_test(duration_seconds: int = 10, chunk_n: int = 8_000_000, repeat_per_cycle: int = 4) -> Dict[str, float]:
+VEC_ADD_KERNEL = """
+__kernel void vec_add(__global const float *a, __global const float *b, __global float *c) {
+    int gid = get_global_id(0);
+    c[gid] = a[gid] + b[gid];
+}
+"""
+
+
+def run_gpu_stress_test(duration_seconds: int = 10, chunk_n: int = 8_000_000, repeat_per_cycle: int = 4,
+                        device: Optional[str] = None) -> Dict:
     """
     Run a GPU stress test with OpenCL vector additions in repeated cycles.
+    This is a sustained-load helper: scored runs use gpu_kernels.run_gpu_suite(),
+    which times each test with profiling events.
     - chunk_n: vector length per buffer (tune based on GPU memory)
     - repeat_per_cycle: how many kernel launches per cycle to increase load
+    - device: OpenCL device spec (see benchmarks.gpu_compute); GPU_COMPUTE_DEVICE by default
+    Context, compiled program and input buffers come from the process-wide
+    compute session, and one warm-up launch runs before the clock starts, so
+    the timed window holds kernel work only.
     Returns:
       {
         "gpu_score": approx_gflops,
-        "avg_gpu": avg_gpu_percent,
-        "duration": elapsed_seconds
+        "avg_gpu": avg_gpu_percent (0 without GPU telemetry),
+        "duration": elapsed_seconds,
+        "device": device description or None,
+        "setup_seconds": untimed session/program/buffer preparation,
+        "program_cache": "memory" | "disk" | "compiled"
       }
-    Falls back cleanly if no OpenCL or GPUtil present.
+    Falls back cleanly if no OpenCL device is available.
     """
-    if not GPUtil:
-        return {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": duration_seconds}
+    from .gpu_compute import get_session
 
+    empty = {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": duration_seconds, "device": None}
     try:
-        import pyopencl as cl
-        import numpy as _np
+        session = get_session(device)
     except Exception:
-        return {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": duration_seconds}
+        session = None
+    if session is None:
+        return empty
 
     try:
-        platforms = cl.get_platforms()
-        devices = [d for p in platforms for d in p.get_devices(device_type=cl.device_type.GPU)]
-        if not devices:
-            return {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": duration_seconds}
-
-        ctx = cl.Context(devices)
-        queue = cl.CommandQueue(ctx)
-
-        kernel_code = """
-        __kernel void vec_add(__global const float *a, __global const float *b, __global float *c) {
-            int gid = get_global_id(0);
-            c[gid] = a[gid] + b[gid];
-        }
-        """
-        program = cl.Program(ctx, kernel_code).build()
-
-        # allocate smaller chunks to avoid exhausting GPU memory on small cards
+        import numpy as _np
+        cl = session.cl
+        mf = cl.mem_flags
         n = chunk_n
-        a_np = _np.random.rand(n).astype(_np.float32)
-        b_np = _np.random.rand(n).astype(_np.float32)
-        c_np = _np.empty_like(a_np)
+        nbytes = n * 4
+        with session.lock:
+            prepared = time.perf_counter()
+            before = dict(session.build_stats)
+            program = session.program(VEC_ADD_KERNEL)
+            if session.build_stats["compiles"] > before["compiles"]:
+                program_cache = "compiled"
+            elif session.build_stats["disk_hits"] > before["disk_hits"]:
+                program_cache = "disk"
+            else:
+                program_cache = "memory"
+            # allocate smaller chunks to avoid exhausting GPU memory on small cards
+            a_g = session.buffer("stress.a", nbytes, mf.READ_ONLY, host=lambda: _np.random.rand(n).astype(_np.float32))
+            b_g = session.buffer("stress.b", nbytes, mf.READ_ONLY, host=lambda: _np.random.rand(n).astype(_np.float32))
+            c_g = session.buffer("stress.c", nbytes, mf.WRITE_ONLY)
+            kernel = cl.Kernel(program, "vec_add")
+            kernel.set_args(a_g, b_g, c_g)
+            global_size = (n,)
+            # warm-up: lazy allocation, first-launch JIT and uploads land outside the window
+            cl.enqueue_nd_range_kernel(session.queue, kernel, global_size, None).wait()
+            setup_seconds = time.perf_counter() - prepared
+
+            start = time.perf_counter()
+            iterations = 0
+            gpu_samples = []
+            while time.perf_counter() - start < duration_seconds:
+                # call the kernel multiple times per loop to keep GPU busy
+                for _ in range(repeat_per_cycle):
+                    cl.enqueue_nd_range_kernel(session.queue, kernel, global_size, None)
+                session.queue.finish()
+                iterations += repeat_per_cycle
+
+                # sample GPU utilization (in-process provider, no subprocess per cycle)
+                gpu_percent = read_gpu().get("gpu_percent")
+                if gpu_percent is not None:
+                    gpu_samples.append(gpu_percent)
+            elapsed = time.perf_counter() - start
 
-        mf = cl.mem_flags
-        a_g = cl.Buffer(ctx, mf.READ_ONLY | mf.COPY_HOST_PTR, hostbuf=a_np)
-        b_g = cl.Buffer(ctx, mf.READ_ONLY | mf.COPY_HOST_PTR, hostbuf=b_np)
-        c_g = cl.Buffer(ctx, mf.WRITE_ONLY, c_np.nbytes)
-
-        start = time.time()
-        iterations = 0
-        gpu_samples = []
-
-        # choose global size aligned to vector length
-        global_size = (n,)
-        while time.time() - start < duration_seconds:
-            # call the kernel multiple times per loop to keep GPU busy
-            for _ in range(repeat_per_cycle):
-                program.vec_add(queue, global_size, None, a_g, b_g, c_g)
-            queue.finish()
-            iterations += repeat_per_cycle
-
-            # sample GPU utilization (GPUtil)
-            try:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    gpu_samples.append(gpus[0].load * 100)
-            except Exception:
-                pass
-
-        elapsed = time.time() - start
         avg_gpu = round(sum(gpu_samples) / len(gpu_samples), 2) if gpu_samples else 0.0
-
         # Each kernel does ~ n additions -> n ops per kernel (we count add as 1 op)
         # We approximate operations as 1 * n * iterations, but count both read+write ~2 ops:
         ops = 2 * n * iterations
         gflops = (ops / elapsed) / 1e9 if elapsed > 0 else 0.0
-        return {"gpu_score": round(gflops, 4), "avg_gpu": avg_gpu, "duration": round(elapsed, 2)}
+        return {
+            "gpu_score": round(gflops, 4),
+            "avg_gpu": avg_gpu,
+            "duration": round(elapsed, 2),
+            "device": {"id": session.device_id, **session.info},
+            "setup_seconds": round(setup_seconds, 4),
+            "program_cache": program_cache,
+        }
 
     except Exception:
-        return {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": duration_seconds}
+        return empty
@@ -5,163 +5,268 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Max, F
 from django.core.paginator import Paginator
-
-from .models import Benchmark, BenchmarkMetric
-from .serializers import BenchmarkSerializer, UserSpecsSerializer
-from .utils import run_cpu_stress_test, run_gpu_stress_test, get_cpu_temp, run_samples
-import GPUtil, psutil, time, math
-from diagnostics.utils.system_collector import get_system_info as system_collector
+from django.conf import settings
+
+from .models import Benchmark, BenchmarkJob
+from .serializers import BenchmarkSerializer, BenchmarkSummarySerializer, UserSpecsSerializer, BenchmarkJobSerializer
+from .jobs import enqueue_benchmark_job, get_worker_pool
+from .telemetry import get_sampler
+from .streams import issue_ticket as issue_stream_ticket
+from .cpu_kernels import validate_kernels
+from .gpu_kernels import validate_gpu_tests
+from .leaderboard import (
+    group_profile_ids, group_sketches, hardware_group, rank_in_group, score_distribution, top_in_group,
+)
+from .hardware import find_profile
+from .pagination import InvalidCursor, keyset_page
+from .retention import RESOLUTIONS as TELEMETRY_RESOLUTIONS, history as telemetry_range
+from .downsample import METHODS as DOWNSAMPLE_METHODS, MIN_POINTS as MIN_CHART_POINTS, downsampled_metrics
+from .response_cache import cached_for_group, get_cache, server_disk_total_gb, stats as response_cache_stats
+from .sketch import DDSketch
+from .gpu_compute import list_devices as list_compute_devices, select_device
+from .gpu_telemetry import get_provider as get_gpu_provider
+import os, time, math
+from datetime import datetime, timezone as dt_timezone
+from diagnostics.utils.system_collector import get_static_info
 from diagnostics.utils.bottleneck_analyzer import analyze_bottlenecks
 from users.models import UserSpecs
 
+# run/ body fields that turn on an optional step; parsed like ?summary= so a form's "false" or "0" stays off
+FLAG_PARAMS = ("scaling", "memory", "storage")
+
+
+def _flag(value) -> bool:
+    return str(value).strip().lower() in ('1', 'true', 'yes')
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def run_benchmark(request):
     """
-    Safely run benchmark: collect system info, stress CPU/GPU, store results,
-    and provide bottleneck/comparison data without throwing 500 errors.
+    Queue a benchmark run and return its job id right away.
+    Optional body fields: cpu_duration, gpu_duration, gpu_device (OpenCL device spec,
+    see gpu/devices/; defaults to GPU_COMPUTE_DEVICE), gpu_tests (list or comma-separated
+    names from benchmarks/gpu_kernels.py; defaults to the full suite), kernels (list or comma-separated
+    names from benchmarks/cpu_kernels.py; defaults to the full suite), scaling
+    (also run the thread-scaling sweep; implied by type "scaling"), scaling_duration,
+    memory (also run the memory bandwidth/latency benchmark; implied by type "memory"),
+    storage (also run the storage I/O benchmark; implied by type "storage").
+    The run itself happens on the benchmark worker pool (see benchmarks/jobs.py);
+    poll jobs/<id>/ for progress and jobs/<id>/result/ for the final benchmark.
     """
-    user = request.user
     bench_type = request.data.get("type", "cpu").lower()
-
+    params = {
+        key: request.data.get(key)
+        for key in ("cpu_duration", "gpu_duration", "gpu_device", "scaling", "scaling_duration", "memory", "storage")
+        if request.data.get(key) is not None
+    }
+    for key in FLAG_PARAMS:
+        if key in params:
+            params[key] = _flag(params[key])
     try:
-        # --- Step 1: Collect system snapshot safely ---
-        sysinfo = system_collector() or {}
-        cpu_model = sysinfo.get("cpu", {}).get("model", "Unknown CPU")
-        gpu_model = sysinfo.get("gpu", {}).get("model", "Unknown GPU")
+        params["kernels"] = validate_kernels(request.data.get("kernels"))
+        params["gpu_tests"] = validate_gpu_tests(request.data.get("gpu_tests"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        ram_total_repr = sysinfo.get("ram", {}).get("total", "0")
-        try:
-            ram_gb = float(str(ram_total_repr).split()[0])
-        except Exception:
-            ram_gb = 0.0
-
-        # --- Step 2: Run CPU/GPU stress safely ---
-        try:
-            cpu_result = run_cpu_stress_test(duration_seconds=int(request.data.get("cpu_duration", 10)))
-        except Exception:
-            cpu_result = {"cpu_score": 0.0, "avg_cpu": 0.0, "duration": 0.0}
+    try:
+        job = enqueue_benchmark_job(request.user, bench_type, params)
+        return Response({
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"jobs/{job.id}/",
+            "result_url": f"jobs/{job.id}/result/",
+        }, status=status.HTTP_202_ACCEPTED)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        gpu_result = {}
-        if bench_type in ["gpu", "hybrid"]:
-            try:
-                gpu_result = run_gpu_stress_test(duration_seconds=int(request.data.get("gpu_duration", 10)))
-            except Exception:
-                gpu_result = {"gpu_score": 0.0, "avg_gpu": 0.0, "duration": 0.0}
 
-        # --- Step 3: Safe temperature reading ---
-        temp = get_cpu_temp() or 0.0
-        gpu_usage = 0.0
-        try:
-            if GPUtil:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    gpu_usage = round(gpus[0].load * 100, 2)
-                    if not temp and hasattr(gpus[0], "temperature"):
-                        temp = gpus[0].temperature or temp
-        except Exception:
-            pass
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_status(request, job_id):
+    """Return status, progress and partial results of one of the user's benchmark jobs."""
+    job = BenchmarkJob.objects.filter(id=job_id, user=request.user).first()
+    if not job:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    if job.status == BenchmarkJob.STATUS_QUEUED and getattr(settings, "BENCHMARK_WORKER_AUTOSTART", True):
+        get_worker_pool().wake()
+    return Response(BenchmarkJobSerializer(job).data, status=status.HTTP_200_OK)
 
-        # --- Step 4: Compute scores ---
-        cpu_score = float(cpu_result.get("cpu_score", 0.0) or 0.0)
-        gpu_score = float(gpu_result.get("gpu_score", 0.0) or 0.0)
-        overall_score = cpu_score + gpu_score
 
-        # --- Step 5: Create or update benchmark safely ---
-        benchmark, created = Benchmark.objects.update_or_create(
-            user=user,
-            cpu_model=cpu_model,
-            gpu_model=gpu_model,
-            ram_gb=ram_gb,
-            defaults={
-                "type": bench_type,
-                "cpu_score": cpu_score,
-                "gpu_score": gpu_score,
-                "overall_score": overall_score,
-                "avg_temp": float(temp)
-            }
-        )
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_result(request, job_id):
+    """
+    Return the finished benchmark payload for a job.
+    Responds 202 with the job status while it is still queued or running.
+    """
+    job = BenchmarkJob.objects.filter(id=job_id, user=request.user).first()
+    if not job:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    if job.status == BenchmarkJob.STATUS_FAILED:
+        return Response({"error": job.error or "Benchmark failed", "job_id": job.id}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    if job.status != BenchmarkJob.STATUS_DONE:
+        return Response(BenchmarkJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    return Response(job.result, status=status.HTTP_200_OK)
 
-        # --- Step 6: Store a safe metric sample ---
-        try:
-            BenchmarkMetric.objects.create(
-                benchmark=benchmark,
-                time=0,
-                cpu=float(cpu_result.get("avg_cpu", psutil.cpu_percent(interval=0.5) or 0.0)),
-                gpu=float(gpu_result.get("avg_gpu", gpu_usage) or 0.0),
-                temp=float(temp or 0.0)
-            )
-        except Exception:
-            pass
 
-        # --- Step 7: Update user's specs ---
-        try:
-            from users.models import UserSpecs
-            import psutil
-            UserSpecs.objects.update_or_create(
-                user=user,
-                defaults={
-                    "cpu_model": cpu_model,
-                    "gpu_model": gpu_model,
-                    "ram_gb": ram_gb,
-                    "storage_gb": psutil.disk_usage('/').total / (1024 ** 3)
-                }
-            )
-        except Exception:
-            pass
 
-        # --- Step 8: Bottleneck analysis ---
-        try:
-            bottleneck_data = analyze_bottlenecks({
-                "cpu_threads": psutil.cpu_count(logical=True) or 1,
-                "total_ram_gb": ram_gb,
-                "gpu_info": [{"name": gpu_model}],
-                "disk_total_gb": psutil.disk_usage('/').total / (1024 ** 3)
-            })
-        except Exception:
-            bottleneck_data = {}
-
-        # --- Step 9: Build response ---
-        from .serializers import BenchmarkSerializer
-        serializer = BenchmarkSerializer(benchmark)
-        data = serializer.data
-        data.update({
-            "raw_cpu_result": cpu_result,
-            "raw_gpu_result": gpu_result,
-            "bottleneckAnalysis": bottleneck_data,
-            "topScore": benchmark.overall_score,
-            "efficiencyPercent": 100.0,
-            "bottleneckComponent": None
-        })
-
-        return Response(data, status=201)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def live_metrics(request):
+    """
+    Return the latest live system metric sample from the background sampler.
+    Query params:
+      - since (optional): epoch timestamp; returns every buffered sample taken after it
+    """
+    try:
+        sampler = get_sampler()
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since_ts = float(since)
+            except ValueError:
+                return Response({"error": "since must be an epoch timestamp in seconds."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(sampler.since(since_ts), status=status.HTTP_200_OK)
 
+        sample = sampler.latest() or sampler.sample_once()
+        return Response(sample, status=status.HTTP_200_OK)
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())  # For dev debugging
-        return Response({"error": str(e)}, status=500)
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def live_stream_ticket(request):
+    """
+    Issue a short-lived, single-use ticket for live/stream/?ticket=, so EventSource
+    clients never put the access token in a URL.
+    """
+    return Response({
+        "ticket": issue_stream_ticket(request.user),
+        "expires_in": getattr(settings, "TELEMETRY_STREAM_TICKET_SECONDS", 30),
+    }, status=status.HTTP_201_CREATED)
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def live_metrics(request):
-    """Return one live system metric sample."""
+def telemetry_history(request):
+    """
+    Return persisted telemetry for a time range (see benchmarks/retention.py).
+    Query params:
+      - start, end (optional): epoch seconds; default the last hour
+      - max_points (optional): point budget used to pick the resolution (default TELEMETRY_HISTORY_MAX_POINTS)
+      - resolution (optional): "raw", "1m" or "1h" to override the automatic choice
+    """
     try:
-        sample = run_samples(duration_seconds=1, sample_count=1)[0]
-        return Response(sample, status=status.HTTP_200_OK)
+        end_ts = float(request.query_params.get('end', time.time()))
+        start_ts = float(request.query_params.get('start', end_ts - 3600))
+        max_points = int(request.query_params.get('max_points', getattr(settings, "TELEMETRY_HISTORY_MAX_POINTS", 500)))
+    except ValueError:
+        return Response({"error": "start/end must be epoch seconds and max_points an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    resolution = request.query_params.get('resolution')
+    if resolution not in (None, '', 'auto', *TELEMETRY_RESOLUTIONS):
+        return Response({"error": f"resolution must be one of: auto, {', '.join(TELEMETRY_RESOLUTIONS)}."}, status=status.HTTP_400_BAD_REQUEST)
+    if start_ts >= end_ts or max_points < 1:
+        return Response({"error": "start must be before end and max_points positive."}, status=status.HTTP_400_BAD_REQUEST)
+
+    start = datetime.fromtimestamp(start_ts, tz=dt_timezone.utc)
+    end = datetime.fromtimestamp(end_ts, tz=dt_timezone.utc)
+    try:
+        return Response(telemetry_range(start, end, max_points, resolution if resolution not in (None, '', 'auto') else None),
+                        status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# columns read by summary listings (the nested series and JSON blobs stay on disk)
+SUMMARY_COLUMNS = BenchmarkSummarySerializer.Meta.fields + [
+    'profile__cpu_model', 'profile__gpu_model', 'profile__ram_gb',
+]
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_benchmarks(request):
-    """List all user benchmarks (latest first)."""
-    user = request.user
-    benchmarks = Benchmark.objects.filter(user=user).order_by('-timestamp')
-    serializer = BenchmarkSerializer(benchmarks, many=True)
-    return Response(serializer.data)
+    """
+    List the user's benchmarks, latest first, one page at a time.
+    Query params:
+      - limit (optional): page size, default BENCHMARK_HISTORY_PAGE_SIZE, capped at BENCHMARK_HISTORY_MAX_PAGE_SIZE
+      - cursor (optional): next_cursor from the previous page
+      - summary (optional): "1" to leave out metrics, scaling points and raw result blobs
+      - points, method (optional): downsample each run's metrics, see _chart_points()
+    Returns {"results": [...], "next_cursor": str or null}. The query count is the
+    same for every page size and history length (see benchmarks/pagination.py).
+    """
+    default_limit = getattr(settings, "BENCHMARK_HISTORY_PAGE_SIZE", 20)
+    max_limit = getattr(settings, "BENCHMARK_HISTORY_MAX_PAGE_SIZE", 100)
+    try:
+        limit = min(max(1, int(request.query_params.get('limit', default_limit))), max_limit)
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    summary = request.query_params.get('summary', '').lower() in ('1', 'true', 'yes')
+    try:
+        points, method = _chart_points(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    benchmarks = Benchmark.objects.filter(user=request.user).select_related('profile')
+    if summary:
+        benchmarks = benchmarks.only(*SUMMARY_COLUMNS)
+        serializer_class = BenchmarkSummarySerializer
+    else:
+        benchmarks = (benchmarks.select_related('series').defer('profile__score_sketches')
+                      .prefetch_related('scaling_points'))
+        serializer_class = BenchmarkSerializer
+
+    try:
+        rows, next_cursor = keyset_page(benchmarks, request.query_params.get('cursor'), limit)
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    context = {"metrics": downsampled_metrics(rows, points, method)} if points and not summary else {}
+    return Response({"results": serializer_class(rows, many=True, context=context).data, "next_cursor": next_cursor})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def benchmark_detail(request, benchmark_id):
+    """
+    Return one of the user's benchmarks with its full timeline.
+    Query params:
+      - points, method (optional): downsample the metrics, see _chart_points()
+    """
+    try:
+        points, method = _chart_points(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    benchmark = (Benchmark.objects.filter(id=benchmark_id, user=request.user)
+                 .select_related('profile', 'series').defer('profile__score_sketches')
+                 .prefetch_related('scaling_points').first())
+    if not benchmark:
+        return Response({"error": "Benchmark not found"}, status=status.HTTP_404_NOT_FOUND)
+    context = {"metrics": downsampled_metrics([benchmark], points, method)} if points else {}
+    return Response(BenchmarkSerializer(benchmark, context=context).data, status=status.HTTP_200_OK)
+
+
+def _chart_points(request):
+    """
+    ?points=N (at least 3, at most BENCHMARK_CHART_MAX_POINTS) and ?method=lttb|minmax
+    (default lttb); (None, method) when no downsampling was asked for.
+    """
+    method = request.query_params.get('method', 'lttb').lower()
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"method must be one of: {', '.join(DOWNSAMPLE_METHODS)}.")
+    raw = request.query_params.get('points')
+    if raw in (None, ''):
+        return None, method
+    try:
+        points = int(raw)
+    except ValueError:
+        raise ValueError("points must be an integer.")
+    max_points = getattr(settings, "BENCHMARK_CHART_MAX_POINTS", 5000)
+    if not MIN_CHART_POINTS <= points <= max_points:
+        raise ValueError(f"points must be between {MIN_CHART_POINTS} and {max_points}.")
+    return points, method
 
 
 # -------------------------
@@ -177,7 +282,9 @@ def compare_benchmarks(request):
       - gpu_model (optional)
       - ram_gb (optional)
       - page (optional)
-    If params omitted, uses user's latest benchmark snapshot.
+    If params omitted, uses user's latest benchmark snapshot. Names are matched
+    after canonicalisation (benchmarks/hardware.py), so any spelling of the same
+    chip finds the same group; ram_gb is matched by nominal size.
     """
     user = request.user
     cpu_model = request.query_params.get('cpu_model')
@@ -201,42 +308,100 @@ def compare_benchmarks(request):
         except Exception:
             ram_gb = None
 
-        qs = Benchmark.objects.filter(cpu_model=cpu_model, gpu_model=gpu_model)
-        if ram_gb is not None:
-            qs = qs.filter(ram_gb__gte=ram_gb - 0.5, ram_gb__lte=ram_gb + 0.5)
-
-        # order by overall_score desc
-        qs = qs.order_by('-overall_score')
-        # take top 5 for quick comparison
-        top5 = qs[:5]
-
-        top_serialized = BenchmarkSerializer(top5, many=True).data
-
-        # find user's rank in this group (1-based)
-        all_scores = list(qs.values_list('overall_score', flat=True))
-        user_latest = Benchmark.objects.filter(user=user, cpu_model=cpu_model, gpu_model=gpu_model).order_by('-overall_score').first()
-        user_rank = None
-        user_score = None
-        if user_latest:
-            user_score = user_latest.overall_score
-            # compute rank
-            higher = sum(1 for s in all_scores if s > user_score)
-            user_rank = higher + 1
+        # group aggregates are shared by everyone on this hardware, the standing is per user;
+        # both stay cached until a benchmark in the group changes (benchmarks/response_cache.py)
+        profile_ids = group_profile_ids(cpu_model, gpu_model, ram_gb)
+        group = cached_for_group("compare", profile_ids, lambda: _compare_group_summary(profile_ids))
+        standing = cached_for_group("compare-user", profile_ids, lambda: _compare_user_standing(user, profile_ids), user.id)
+        user_score = standing["user_score"] if standing else None
 
         resp = {
             "cpu_model": cpu_model,
             "gpu_model": gpu_model,
             "ram_gb": ram_gb,
-            "top5": top_serialized,
-            "user_rank": user_rank,
+            "profile_ids": profile_ids,
+            "top5": group["top5"],
+            "user_rank": standing["user_rank"] if standing else None,
             "user_score": user_score,
-            "count": qs.count()
+            "distribution": score_distribution(DDSketch.from_dict(group["overall_sketch"]), user_score),
+            "memory": standing["memory"] if standing else None,
+            "storage": standing["storage"] if standing else None,
+            "count": group["count"]
         }
         return Response(resp, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _compare_group_summary(profile_ids):
+    qs = hardware_group(profile_ids)
+    return {
+        # take top 5 for quick comparison
+        "top5": BenchmarkSerializer(top_in_group(qs, 5), many=True).data,
+        "count": qs.count(),
+        "overall_sketch": group_sketches(profile_ids)["overall_score"].to_dict(),
+    }
+
+
+def _compare_memory_summary(profile_ids):
+    # memory subsystem: only rows that actually ran the memory benchmark take part
+    mem_qs = hardware_group(profile_ids).filter(memory_score__gt=0)
+    best = mem_qs.order_by('-memory_score').first()
+    return {
+        "count": mem_qs.count(),
+        "best_memory_score": best.memory_score if best else None,
+        "best_triad_gbps": best.mem_triad_gbps if best else None,
+        "best_latency_ns": best.mem_latency_ns if best else None,
+    }
+
+
+def _compare_storage_summary(profile_ids):
+    storage_qs = hardware_group(profile_ids).filter(storage_score__gt=0)
+    best = storage_qs.order_by('-storage_score').first()
+    return {
+        "count": storage_qs.count(),
+        "best_storage_score": best.storage_score if best else None,
+    }
+
+
+def _compare_user_standing(user, profile_ids):
+    # find user's rank in this group (1-based) with a COUNT over the group index
+    qs = hardware_group(profile_ids)
+    user_latest = Benchmark.objects.filter(user=user, profile_id__in=profile_ids).order_by('-overall_score').first()
+    if not user_latest:
+        return None
+
+    memory = None
+    if user_latest.memory_score > 0:
+        memory = {
+            "memory_score": user_latest.memory_score,
+            "triad_gbps": user_latest.mem_triad_gbps,
+            "copy_gbps": user_latest.mem_copy_gbps,
+            "latency_ns": user_latest.mem_latency_ns,
+            "rank": rank_in_group(qs.filter(memory_score__gt=0), user_latest.memory_score, "memory_score"),
+            **cached_for_group("compare-memory", profile_ids, lambda: _compare_memory_summary(profile_ids)),
+        }
+
+    storage = None
+    if user_latest.storage_score > 0:
+        storage = {
+            "storage_score": user_latest.storage_score,
+            "storage_class": user_latest.storage_class,
+            "seq_read_mbps": user_latest.disk_seq_read_mbps,
+            "seq_write_mbps": user_latest.disk_seq_write_mbps,
+            "rand_read_iops": user_latest.disk_rand_read_iops,
+            "rank": rank_in_group(qs.filter(storage_score__gt=0), user_latest.storage_score, "storage_score"),
+            **cached_for_group("compare-storage", profile_ids, lambda: _compare_storage_summary(profile_ids)),
+        }
+
+    return {
+        "user_score": user_latest.overall_score,
+        "user_rank": rank_in_group(qs, user_latest.overall_score),
+        "memory": memory,
+        "storage": storage,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def bottleneck_analysis(request):
@@ -257,60 +422,106 @@ def bottleneck_analysis(request):
         if not benchmark:
             return Response({"error": "Benchmark not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Compare benchmark against best-of-same-specs
-        same_specs = Benchmark.objects.filter(
-            cpu_model=benchmark.cpu_model,
-            gpu_model=benchmark.gpu_model,
-            ram_gb__gte=benchmark.ram_gb - 0.5,
-            ram_gb__lte=benchmark.ram_gb + 0.5
-        ).exclude(id=benchmark.id)
-
-        top_score = same_specs.order_by('-overall_score').first()
-        efficiency_percent = 100.0
-        component = None
-        suggestions = []
-
-        if top_score and top_score.overall_score > 0:
-            efficiency_percent = round((benchmark.overall_score / top_score.overall_score) * 100.0, 2)
-            if efficiency_percent < 90:
-                if (top_score.cpu_score or 0) > 0 and benchmark.cpu_score < top_score.cpu_score * 0.9:
-                    component = "CPU"
-                    suggestions.append("CPU performing below peers — consider higher clocks or more cores.")
-                if (top_score.gpu_score or 0) > 0 and benchmark.gpu_score < top_score.gpu_score * 0.9:
-                    component = (component or "GPU")
-                    suggestions.append("GPU performing below peers — check drivers, thermal/throttling or upgrade.")
-                if not suggestions:
-                    component = "RAM/IO"
-                    suggestions.append("Investigate RAM usage or storage IO; compare configurations with top performers.")
-
-        # hardware spec analysis (generic)
-        hw_analysis = analyze_bottlenecks({
-            "cpu_threads": psutil.cpu_count(logical=True),
-            "total_ram_gb": benchmark.ram_gb,
-            "gpu_info": [{"name": benchmark.gpu_model}],
-            "disk_total_gb": psutil.disk_usage('/').total / (1024 ** 3),
-        })
-
-        resp = {
-            "benchmark_id": benchmark.id,
-            "cpu_model": benchmark.cpu_model,
-            "gpu_model": benchmark.gpu_model,
-            "ram_gb": benchmark.ram_gb,
-            "cpu_score": benchmark.cpu_score,
-            "gpu_score": benchmark.gpu_score,
-            "overall_score": benchmark.overall_score,
-            "avg_temp": benchmark.avg_temp,
-            "efficiency_percent_vs_top": efficiency_percent,
-            "likely_bottleneck_component": component,
-            "suggestions": suggestions,
-            "hardware_analysis": hw_analysis
-        }
+        profile_id = benchmark.profile_id
+        if profile_id is None:
+            profile = find_profile(benchmark.cpu_model, benchmark.gpu_model, benchmark.ram_gb)
+            profile_id = profile.id if profile else None
+        # cached per benchmark until a run in its hardware group changes (benchmarks/response_cache.py)
+        resp = cached_for_group("bottleneck", [profile_id] if profile_id else [],
+                                lambda: _bottleneck_report(benchmark, profile_id), benchmark.id)
         return Response(resp, status=status.HTTP_200_OK)
 
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _bottleneck_report(benchmark, profile_id):
+    # Compare benchmark against its peers (same canonical hardware profile) via the
+    # profile's score sketches: O(1) in group size, and robust to a single outlier run
+    sketches = group_sketches([profile_id]) if profile_id else {}
+    overall = score_distribution(sketches["overall_score"], benchmark.overall_score) if sketches else None
+
+    efficiency_percent = 100.0
+    efficiency_vs_top = 100.0
+    component = None
+    suggestions = []
+
+    if overall and overall["count"] > 1 and overall["p90"]:
+        # p90 peer, not the single best run: one overclocked outlier should not make everyone look slow
+        efficiency_percent = round(min(100.0, benchmark.overall_score / overall["p90"] * 100.0), 2)
+        efficiency_vs_top = round(min(100.0, benchmark.overall_score / overall["max"] * 100.0), 2)
+        if efficiency_percent < 90:
+            cpu_p90 = sketches["cpu_score"].quantile(0.9) or 0
+            gpu_p90 = sketches["gpu_score"].quantile(0.9) or 0
+            if cpu_p90 > 0 and benchmark.cpu_score < cpu_p90 * 0.9:
+                component = "CPU"
+                suggestions.append("CPU performing below peers — consider higher clocks or more cores.")
+            if gpu_p90 > 0 and benchmark.gpu_score < gpu_p90 * 0.9:
+                component = (component or "GPU")
+                suggestions.append("GPU performing below peers — check drivers, thermal/throttling or upgrade.")
+            if not suggestions:
+                component = "RAM/IO"
+                suggestions.append("Investigate RAM usage or storage IO; compare configurations with top performers.")
+
+    # hardware spec analysis (generic)
+    hw_analysis = analyze_bottlenecks({
+        "cpu_threads": os.cpu_count(),
+        "total_ram_gb": benchmark.ram_gb,
+        "gpu_info": [{"name": benchmark.gpu_model}],
+        "disk_total_gb": server_disk_total_gb(),
+    })
+
+    return {
+        "benchmark_id": benchmark.id,
+        "cpu_model": benchmark.cpu_model,
+        "gpu_model": benchmark.gpu_model,
+        "ram_gb": benchmark.ram_gb,
+        "profile_id": profile_id,
+        "cpu_score": benchmark.cpu_score,
+        "gpu_score": benchmark.gpu_score,
+        "overall_score": benchmark.overall_score,
+        "avg_temp": benchmark.avg_temp,
+        "efficiency_percent": efficiency_percent,
+        "efficiency_percent_vs_top": efficiency_vs_top,
+        "percentile": overall["percentile"] if overall else None,
+        "peer_scores": {k: overall[k] for k in ("count", "p50", "p90", "p99")} if overall else None,
+        "likely_bottleneck_component": component,
+        "suggestions": suggestions,
+        "hardware_analysis": hw_analysis
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cache_stats(request):
+    """Hit/miss counters of the compare/bottleneck response cache in this process."""
+    cache = get_cache()
+    return Response({
+        "alias": getattr(settings, "BENCHMARK_CACHE_ALIAS", "default"),
+        "backend": f"{type(cache).__module__}.{type(cache).__name__}",
+        **response_cache_stats.snapshot(),
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def gpu_devices(request):
+    """
+    OpenCL devices the GPU benchmark can run on, the one "auto"/GPU_COMPUTE_DEVICE
+    picks, and the current reading of the GPU telemetry provider.
+    """
+    try:
+        selected = select_device()
+        provider = get_gpu_provider()
+        return Response({
+            "devices": list_compute_devices(),
+            "default": selected[0] if selected else None,
+            "telemetry": {"provider": provider.name, **provider.read()},
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def save_user_specs(request):
@@ -326,7 +537,7 @@ def save_user_specs(request):
     try:
         # fallback to collector if fields missing
         if not (cpu_model and gpu_model and ram_gb):
-            sysinfo = system_collector()
+            sysinfo = get_static_info()
             cpu_model = cpu_model or sysinfo.get("cpu", {}).get("model", "Unknown CPU")
             gpu_model = gpu_model or sysinfo.get("gpu", {}).get("model", "Unknown GPU")
             ram_total_repr = sysinfo.get("ram", {}).get("total", "0")
@@ -335,7 +546,7 @@ def save_user_specs(request):
             except Exception:
                 ram_gb = float(ram_gb or 0)
 
-            storage_gb = storage_gb or (psutil.disk_usage('/').total / (1024 ** 3))
+            storage_gb = storage_gb or server_disk_total_gb()
 
         # create or update
         specs, created = UserSpecs.objects.update_or_create(
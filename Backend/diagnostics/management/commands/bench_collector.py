@@ -0,0 +1,35 @@
+# diagnostics/management/commands/bench_collector.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from diagnostics.utils.collectors import BACKENDS, backend_class
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark static and per-sample collection cost of every available collector backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=200, help="Dynamic samples per backend.")
+        parser.add_argument("--static-runs", type=int, default=3, help="Static inventory collections per backend.")
+
+    def _time(self, fn, runs):
+        fn()  # warm-up (imports, primed counters)
+        start = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        return (time.perf_counter() - start) / runs
+
+    def handle(self, *args, **options):
+        samples = max(1, options["samples"])
+        static_runs = max(1, options["static_runs"])
+        self.stdout.write(f"{'backend':<10} {'static (ms)':>12} {'sample (us)':>12}")
+        for name in BACKENDS:
+            cls = backend_class(name)
+            if not cls.available():
+                self.stdout.write(f"{name:<10} {'n/a':>12} {'n/a':>12}")
+                continue
+            backend = cls()
+            static_s = self._time(backend.static_info, static_runs)
+            sample_s = self._time(backend.dynamic_info, samples)
+            self.stdout.write(f"{name:<10} {static_s * 1e3:>12.2f} {sample_s * 1e6:>12.1f}")
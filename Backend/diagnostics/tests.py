@@ -1,3 +1,150 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from diagnostics.utils import system_collector
+
+
+class HardwareFingerprintTests(TestCase):
+    def test_fingerprint_is_stable_and_tracks_hardware(self):
+        first = system_collector.hardware_fingerprint()
+        self.assertEqual(first, system_collector.hardware_fingerprint())
+        self.assertRegex(first, r"^[0-9a-f]{40}$")
+        with mock.patch("psutil.virtual_memory", return_value=mock.Mock(total=1)):
+            self.assertNotEqual(system_collector.hardware_fingerprint(), first)
+
+
+class StaticInventoryCacheTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "static.json")
+        overrides = override_settings(SYSTEM_INFO_CACHE_PATH=self.path)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.fingerprint = "a" * 40
+        self.collect = mock.Mock(side_effect=lambda: {"cpu": {"model": "Test CPU"}, "storage": {"type": "HDD"}})
+        for target, kwargs in (("hardware_fingerprint", {"side_effect": lambda: self.fingerprint}),
+                               ("_collect_static_info", {"new": self.collect})):
+            patcher = mock.patch.object(system_collector, target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._forget_process_cache()
+
+    def _forget_process_cache(self):
+        system_collector._static_cache = None
+
+    def test_restart_on_same_hardware_reads_the_disk_cache(self):
+        self.assertEqual(system_collector.get_static_info()["cpu"]["model"], "Test CPU")
+        self._forget_process_cache()  # a new process
+        system_collector.get_static_info()
+        self.assertEqual(self.collect.call_count, 1)
+        with open(self.path, encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh)["fingerprint"], self.fingerprint)
+
+    def test_changed_fingerprint_or_refresh_recollects(self):
+        system_collector.get_static_info()
+        self.fingerprint = "b" * 40
+        system_collector.get_static_info()
+        self.assertEqual(self.collect.call_count, 2)
+        system_collector.get_static_info(refresh=True)
+        self.assertEqual(self.collect.call_count, 3)
+
+    def test_callers_get_copies(self):
+        system_collector.get_static_info()["cpu"]["model"] = "mutated"
+        self.assertEqual(system_collector.get_static_info()["cpu"]["model"], "Test CPU")
+
+    def test_measured_storage_class_survives_a_refresh(self):
+        system_collector.record_storage_class("SSD")
+        info = system_collector.get_static_info(refresh=True)
+        self.assertEqual((info["storage"]["type"], info["storage"]["reported_type"]), ("SSD", "HDD"))
+
+
+class LinuxCollectorTests(TestCase):
+    CPUINFO = "".join(
+        f"processor\t: {n}\nmodel name\t: Test CPU 8C\nphysical id\t: {n // 4}\ncore id\t\t: {n % 2}\n\n"
+        for n in range(8)
+    )  # 2 packages x 2 cores x 2 threads
+    MEMINFO = "MemTotal:       16384000 kB\nMemFree:         1024000 kB\nMemAvailable:    4096000 kB\nHugePages_Total:       0\n"
+
+    def setUp(self):
+        from diagnostics.utils.collectors.linux import LinuxCollector
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.proc = os.path.join(tmp.name, "proc")
+        self.sys = os.path.join(tmp.name, "sys")
+        self._write(self.proc, "cpuinfo", self.CPUINFO)
+        self._write(self.proc, "meminfo", self.MEMINFO)
+        self._write(self.proc, "stat", "cpu  100 0 100 700 100 0 0 0 0 0\ncpu0 50 0 50 350 50 0 0 0 0 0\n")
+        self.collector = LinuxCollector(proc_root=self.proc, sys_root=self.sys)
+
+    def _write(self, root, relative, text):
+        path = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fh:
+            fh.write(text)
+        return path
+
+    def _card(self, name, vendor, driver, **files):
+        device = os.path.join(self.sys, "class", "drm", name, "device")
+        self._write(device, "vendor", f"{vendor}\n")
+        self._write(device, "device", "0x73bf\n")
+        for filename, text in files.items():
+            self._write(device, filename, text)
+        os.makedirs(os.path.join(self.sys, "bus", "pci", "drivers", driver), exist_ok=True)
+        os.symlink(os.path.join(self.sys, "bus", "pci", "drivers", driver), os.path.join(device, "driver"))
+
+    def test_parsers(self):
+        from diagnostics.utils.collectors.linux import parse_cpuinfo, parse_meminfo, parse_proc_stat_cpu
+        self.assertEqual(parse_cpuinfo(self.CPUINFO), ("Test CPU 8C", 8, 4))
+        self.assertEqual(parse_cpuinfo("processor : 0\nModel : Raspberry Pi 4\n"), ("Raspberry Pi 4", 1, 1))
+        meminfo = parse_meminfo(self.MEMINFO)
+        self.assertEqual((meminfo["MemTotal"], meminfo["HugePages_Total"]), (16384000 * 1024, 0))
+        self.assertEqual(parse_proc_stat_cpu("cpu  100 0 100 700 100 0 0 0 5 0"), (200, 1000))
+
+    def test_cpu_percent_is_the_delta_between_samples(self):
+        self.assertEqual(self.collector.cpu_percent(), 20.0)  # since boot: 200 busy of 1000
+        self._write(self.proc, "stat", "cpu  400 0 200 800 100 0 0 0 0 0\n")
+        self.assertEqual(self.collector.cpu_percent(), 80.0)  # 400 more busy of 500
+        self.assertEqual(self.collector.ram_percent(), 75.0)
+
+    def test_concurrent_samples_open_each_file_once(self):
+        import threading
+        import time
+        real_open, opened = os.open, []
+
+        def slow_open(path, flags):
+            opened.append(path)
+            time.sleep(0.05)  # widen the window between the lookup and the store
+            return real_open(path, flags)
+
+        with mock.patch("diagnostics.utils.collectors.linux.os.open", slow_open):
+            threads = [threading.Thread(target=self.collector.ram_percent) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(opened, [os.path.join(self.proc, "meminfo")])
+        self.assertEqual(self.collector.ram_percent(), 75.0)
+
+    def test_static_inventory_from_sysfs(self):
+        self._card("card0", "0x8086", "i915")
+        self._card("card1", "0x1002", "amdgpu", mem_info_vram_total=f"{16 * 1024 ** 3}\n")
+        os.makedirs(os.path.join(self.sys, "class", "drm", "card1-DP-1"))
+        self._write(self.sys, "block/nvme0n1/queue/rotational", "0\n")
+        self._write(self.sys, "block/loop0/queue/rotational", "1\n")
+
+        with mock.patch("diagnostics.utils.collectors.linux._pci_name", return_value=None):
+            info = self.collector.static_info()
+        self.assertEqual(info["cpu"], {"model": "Test CPU 8C", "cores": 4, "threads": 8})
+        self.assertEqual(info["gpu"]["model"], "AMD GPU [1002:73bf]")
+        self.assertEqual((info["gpu"]["vram"], info["gpu"]["driver_version"]), ("16.00 GB", "amdgpu"))
+        self.assertEqual(info["storage"]["type"], "NVMe SSD")  # loop devices are ignored
+        self.assertEqual(info["ram"]["total"], "15.62 GB")
+
+    def test_rotational_disks_are_hdd(self):
+        self._write(self.sys, "block/sda/queue/rotational", "1\n")
+        self.assertEqual(self.collector.storage_type(), "HDD")
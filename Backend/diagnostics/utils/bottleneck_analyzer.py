@@ -14,6 +14,10 @@ def analyze_bottlenecks(system_info):
     total_ram = system_info.get("total_ram_gb", 0)
     gpu_list = system_info.get("gpu_info", [])
     disk_total = system_info.get("disk_total_gb", 0)
+    mem_bandwidth = system_info.get("mem_triad_gbps", 0)  # only present after a memory benchmark
+    mem_latency = system_info.get("mem_latency_ns", 0)
+    storage_type = system_info.get("storage_type")
+    disk_iops = system_info.get("disk_rand_read_iops", 0)  # only present after a storage benchmark
 
     # --- CPU Analysis ---
     if cpu_threads <= 4:
@@ -27,6 +31,16 @@ def analyze_bottlenecks(system_info):
         results["recommendations"].append("Upgrade to at least 8 GB for general use or 16 GB for gaming/editing.")
         results["overall_health"] = "Moderate"
 
+    # --- Memory speed (from the memory benchmark) ---
+    if mem_bandwidth and mem_bandwidth < 5:
+        results["issues"].append(f"Low measured memory bandwidth ({mem_bandwidth:.1f} GB/s triad).")
+        results["recommendations"].append("Check that RAM runs in dual-channel mode at its rated speed (XMP/EXPO).")
+        results["overall_health"] = "Moderate"
+    if mem_latency and mem_latency > 250:
+        results["issues"].append(f"High measured memory latency ({mem_latency:.0f} ns).")
+        results["recommendations"].append("Check RAM timings and that the memory profile is enabled in the BIOS.")
+        results["overall_health"] = "Moderate"
+
     # --- GPU Analysis ---
     if not gpu_list:
         results["issues"].append("No dedicated GPU detected.")
@@ -46,6 +60,16 @@ def analyze_bottlenecks(system_info):
         results["issues"].append("Total storage below 128 GB.")
         results["recommendations"].append("Use an SSD or larger drive for better performance.")
         results["overall_health"] = "Poor"
+    if storage_type == "HDD":
+        results["issues"].append("System drive is a spinning hard disk.")
+        results["recommendations"].append("Move the OS and applications to an SSD for much faster load times.")
+        if results["overall_health"] == "Good":
+            results["overall_health"] = "Moderate"
+    elif disk_iops and disk_iops < 1000:
+        results["issues"].append(f"Low measured random read performance ({disk_iops:.0f} IOPS at 4 KiB).")
+        results["recommendations"].append("Check drive health or upgrade to an NVMe/SATA SSD.")
+        if results["overall_health"] == "Good":
+            results["overall_health"] = "Moderate"
 
     # --- Final Verdict ---
     if not results["issues"]:
@@ -0,0 +1,59 @@
+#diagnostics/utils/collectors/__init__.py
+"""
+Pluggable system information backends.
+
+get_backend() picks SYSTEM_COLLECTOR_BACKEND from settings ("auto" by default):
+Linux reads procfs/sysfs, Windows uses WMI, anything else falls back to psutil.
+
+Backend modules are imported only when picked, so a Linux process never
+loads the psutil/WMI backends (or their dependencies) at startup.
+"""
+import importlib
+import threading
+
+from .base import CollectorBackend, format_value
+
+# name -> "module:class", in "auto" preference order
+BACKENDS = {
+    "linux": "diagnostics.utils.collectors.linux:LinuxCollector",
+    "windows": "diagnostics.utils.collectors.windows:WindowsCollector",
+    "psutil": "diagnostics.utils.collectors.generic:PsutilCollector",
+}
+AUTO_ORDER = tuple(BACKENDS)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _configured_name():
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, "SYSTEM_COLLECTOR_BACKEND", "auto")
+    except Exception:
+        pass
+    return "auto"
+
+
+def backend_class(name):
+    module, _, attribute = BACKENDS[name].partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def create_backend(name="auto"):
+    if name and name != "auto":
+        return backend_class(name)()
+    for candidate in AUTO_ORDER:
+        cls = backend_class(candidate)
+        if cls.available():
+            return cls()
+    return backend_class("psutil")()
+
+
+def get_backend():
+    """Process-wide collector backend (it keeps counters between samples)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(_configured_name())
+        return _backend
@@ -0,0 +1,48 @@
+#diagnostics/utils/collectors/base.py
+
+
+def format_value(value, unit=None):
+    """Helper to format numeric values with units or handle missing ones."""
+    if value in (None, "", "Unknown", "Standard"):
+        return "Standard"
+
+    try:
+        if isinstance(value, (int, float)):
+            if unit:
+                # Format floats with 2 decimals when needed
+                return f"{value:.2f}{unit}" if isinstance(value, float) else f"{value}{unit}"
+            return str(value)
+        return str(value)
+    except Exception:
+        return "Standard"
+
+
+def default_gpu_info():
+    return {
+        "model": "Integrated GPU",
+        "vram": "Standard",
+        "driver_version": "Standard",
+        "status": "Standard",
+    }
+
+
+class CollectorBackend:
+    """
+    Platform-specific source of system information.
+
+    static_info() returns the hardware inventory sections (os, cpu, gpu, ram,
+    storage) that never change at runtime; system_collector caches it.
+    dynamic_info() returns the usage figures and is called per request, so it
+    must be cheap and non-blocking.
+    """
+    name = "base"
+
+    @classmethod
+    def available(cls):
+        return False
+
+    def static_info(self):
+        raise NotImplementedError
+
+    def dynamic_info(self):
+        raise NotImplementedError
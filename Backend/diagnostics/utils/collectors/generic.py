@@ -0,0 +1,66 @@
+#diagnostics/utils/collectors/generic.py
+import platform
+
+import psutil
+
+from .base import CollectorBackend, format_value, default_gpu_info
+
+
+class PsutilCollector(CollectorBackend):
+    """Portable fallback built on psutil (and py-cpuinfo when installed)."""
+    name = "psutil"
+
+    def __init__(self):
+        self._cpu_primed = False
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def cpu_model(self):
+        try:
+            import cpuinfo
+            return cpuinfo.get_cpu_info().get('brand_raw', 'Standard')
+        except Exception:
+            return platform.processor() or "Standard"
+
+    def gpu_info(self):
+        return default_gpu_info()
+
+    def static_info(self):
+        ram = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        return {
+            "os": {
+                "name": platform.system() or "Standard",
+                "version": platform.version() or "Standard",
+                "build": platform.release() or "Standard",
+            },
+            "cpu": {
+                "model": self.cpu_model(),
+                "cores": psutil.cpu_count(logical=False) or "Standard",
+                "threads": psutil.cpu_count(logical=True) or "Standard",
+            },
+            "gpu": self.gpu_info(),
+            "ram": {
+                "total": format_value(round(ram.total / (1024 ** 3), 2), " GB") if ram.total else "Standard",
+                "speed": "Standard",
+            },
+            "storage": {
+                "type": "Standard",
+                "size": format_value(round(disk.total / (1024 ** 3), 2), " GB") if disk.total else "Standard",
+            },
+        }
+
+    def dynamic_info(self):
+        # the first non-blocking cpu_percent() call has no reference point, so block briefly once
+        cpu_usage = psutil.cpu_percent(interval=None if self._cpu_primed else 0.1)
+        self._cpu_primed = True
+        ram = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        return {
+            "cpu": {"usage": format_value(cpu_usage, "%")},
+            "gpu": {"utilization": format_value(0, "%")},
+            "ram": {"usage": format_value(ram.percent, "%")},
+            "storage": {"usage": format_value(disk.percent, "%")},
+        }
@@ -0,0 +1,260 @@
+#diagnostics/utils/collectors/linux.py
+import glob
+import os
+import platform
+import sys
+import threading
+
+from .base import CollectorBackend, format_value, default_gpu_info
+
+PCI_IDS_PATHS = ("/usr/share/hwdata/pci.ids", "/usr/share/misc/pci.ids", "/usr/share/pci.ids")
+PCI_VENDORS = {"0x10de": "NVIDIA", "0x1002": "AMD", "0x8086": "Intel", "0x1af4": "Virtio", "0x1234": "QEMU"}
+VIRTUAL_BLOCK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr", "fd", "nbd")
+
+
+def _read(path):
+    try:
+        with open(path, "r") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def _read_int(path):
+    text = _read(path)
+    try:
+        return int(text.strip()) if text else None
+    except ValueError:
+        return None
+
+
+def parse_meminfo(text):
+    """/proc/meminfo -> {key: bytes}."""
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts:
+            values[key] = int(parts[0]) * (1024 if len(parts) > 1 else 1)
+    return values
+
+
+def parse_cpuinfo(text):
+    """Return (model, logical_count, physical_core_count) from /proc/cpuinfo."""
+    model = None
+    logical = 0
+    cores = set()
+    physical_id = core_id = None
+    for line in text.splitlines() + [""]:
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if key == "processor":
+            logical += 1
+        elif key in ("model name", "Model", "cpu model") and model is None:
+            model = value
+        elif key == "physical id":
+            physical_id = value
+        elif key == "core id":
+            core_id = value
+        elif not key:
+            if core_id is not None:
+                cores.add((physical_id, core_id))
+            physical_id = core_id = None
+    return model, logical, (len(cores) or logical)
+
+
+def parse_proc_stat_cpu(text):
+    """(busy, total) jiffies from the aggregate "cpu" line of /proc/stat."""
+    fields = [int(v) for v in text.split("\n", 1)[0].split()[1:]]
+    # user nice system idle iowait irq softirq steal (guest time is already in user/nice)
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    total = sum(fields[:8])
+    return total - idle, total
+
+
+def _pci_name(vendor, device):
+    """Look a PCI vendor/device pair up in the system pci.ids database, if installed."""
+    vendor_hex, device_hex = vendor[2:].lower(), device[2:].lower()
+    for path in PCI_IDS_PATHS:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as fh:
+                vendor_name = None
+                for line in fh:
+                    if vendor_name is None:
+                        if line.startswith(vendor_hex + "  "):
+                            vendor_name = line[len(vendor_hex):].strip()
+                    elif line.startswith("\t\t") or line.startswith("#"):
+                        continue
+                    elif line.startswith("\t"):
+                        if line[1:].startswith(device_hex + "  "):
+                            return line[1 + len(device_hex):].strip()
+                    else:
+                        break
+        except OSError:
+            continue
+    return None
+
+
+class LinuxCollector(CollectorBackend):
+    """
+    Reads /proc and /sys directly. A dynamic sample is two pread() calls on
+    descriptors kept open for /proc/stat and /proc/meminfo plus one statvfs;
+    CPU usage is the busy share of jiffies since the previous sample, so it
+    never blocks.
+    """
+    name = "linux"
+
+    def __init__(self, proc_root="/proc", sys_root="/sys"):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self._last_cpu = None
+        self._fds = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith("linux") and os.path.exists("/proc/stat")
+
+    # --- static inventory ---
+    def cpu_info(self):
+        model, logical, cores = parse_cpuinfo(_read(f"{self.proc_root}/cpuinfo") or "")
+        return {
+            "model": model or platform.processor() or "Standard",
+            "cores": cores or "Standard",
+            "threads": logical or "Standard",
+        }
+
+    def gpu_info(self):
+        gpus = []
+        for card in sorted(glob.glob(f"{self.sys_root}/class/drm/card[0-9]*")):
+            if "-" in os.path.basename(card):  # connectors such as card0-HDMI-A-1
+                continue
+            dev = os.path.join(card, "device")
+            vendor = (_read(os.path.join(dev, "vendor")) or "").strip()
+            device = (_read(os.path.join(dev, "device")) or "").strip()
+            if not vendor:
+                continue
+            driver = os.path.basename(os.path.realpath(os.path.join(dev, "driver")))
+            vram = _read_int(os.path.join(dev, "mem_info_vram_total"))  # amdgpu only
+            name = _pci_name(vendor, device) if device else None
+            vendor_name = PCI_VENDORS.get(vendor, vendor)
+            gpus.append({
+                "model": f"{vendor_name} {name}" if name else f"{vendor_name} GPU [{vendor[2:]}:{device[2:]}]",
+                "vram": format_value(round(vram / (1024 ** 3), 2), " GB") if vram else "Standard",
+                "driver_version": driver or "Standard",
+                "status": "OK",
+                "_discrete": vendor in ("0x10de", "0x1002") or bool(vram),
+            })
+        if not gpus:
+            return default_gpu_info()
+        # prefer a discrete card over the integrated one
+        gpus.sort(key=lambda g: not g["_discrete"])
+        best = gpus[0]
+        best.pop("_discrete")
+        return best
+
+    def _root_disk(self):
+        """sysfs directory of the whole disk holding "/", or None on overlay/tmpfs roots."""
+        try:
+            st = os.stat("/")
+            node = os.path.realpath(f"{self.sys_root}/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}")
+        except OSError:
+            return None
+        if os.path.exists(os.path.join(node, "partition")):
+            node = os.path.dirname(node)
+        return node if os.path.exists(os.path.join(node, "queue", "rotational")) else None
+
+    def storage_type(self):
+        """"SSD"/"NVMe SSD"/"HDD" from queue/rotational of the root disk (or all physical disks)."""
+        disk = self._root_disk()
+        disks = [disk] if disk else [
+            d for d in glob.glob(f"{self.sys_root}/block/*")
+            if not os.path.basename(d).startswith(VIRTUAL_BLOCK_PREFIXES)
+        ]
+        kinds = []
+        for d in disks:
+            rotational = _read_int(os.path.join(d, "queue", "rotational"))
+            if rotational is None:
+                continue
+            if rotational:
+                kinds.append("HDD")
+            else:
+                kinds.append("NVMe SSD" if os.path.basename(d).startswith("nvme") else "SSD")
+        if not kinds:
+            return "Standard"
+        return "HDD" if "HDD" in kinds and len(set(kinds)) == 1 else kinds[0]
+
+    def static_info(self):
+        mem = parse_meminfo(_read(f"{self.proc_root}/meminfo") or "")
+        ram_total = mem.get("MemTotal", 0)
+        vfs = os.statvfs("/")
+        disk_total = vfs.f_blocks * vfs.f_frsize
+        uname = platform.uname()
+        return {
+            "os": {
+                "name": uname.system or "Standard",
+                "version": uname.version or "Standard",
+                "build": uname.release or "Standard",
+            },
+            "cpu": self.cpu_info(),
+            "gpu": self.gpu_info(),
+            "ram": {
+                "total": format_value(round(ram_total / (1024 ** 3), 2), " GB") if ram_total else "Standard",
+                "speed": "Standard",
+            },
+            "storage": {
+                "type": self.storage_type(),
+                "size": format_value(round(disk_total / (1024 ** 3), 2), " GB") if disk_total else "Standard",
+            },
+        }
+
+    # --- dynamic sample ---
+    def _pread(self, name):
+        """
+        Re-read a procfs file through a descriptor kept open across samples.
+        The lock covers open, read and close, so concurrent samplers neither
+        open a descriptor twice nor close one another thread is reading.
+        """
+        with self._lock:
+            fd = self._fds.get(name)
+            if fd is None:
+                fd = self._fds[name] = os.open(f"{self.proc_root}/{name}", os.O_RDONLY)
+            try:
+                return os.pread(fd, 4096, 0)
+            except OSError:
+                self._fds.pop(name, None)
+                os.close(fd)
+                raise
+
+    def cpu_percent(self):
+        line = self._pread("stat").split(b"\n", 1)[0].decode()
+        busy, total = parse_proc_stat_cpu(line)
+        with self._lock:
+            last, self._last_cpu = self._last_cpu, (busy, total)
+        if last is None:
+            # no previous sample: report the average since boot rather than block
+            return round(100.0 * busy / total, 1) if total else 0.0
+        d_total = total - last[1]
+        return round(100.0 * (busy - last[0]) / d_total, 1) if d_total > 0 else 0.0
+
+    def ram_percent(self):
+        head = self._pread("meminfo")
+        # MemTotal, MemFree and MemAvailable are the first three lines
+        lines = head.split(b"\n", 3)
+        total = int(lines[0].split()[1])
+        available = int(lines[2].split()[1]) if lines[2].startswith(b"MemAvailable") else int(lines[1].split()[1])
+        return round(100.0 * (total - available) / total, 1) if total else 0.0
+
+    def dynamic_info(self):
+        cpu_usage = self.cpu_percent()
+        ram_percent = self.ram_percent()
+        vfs = os.statvfs("/")
+        used = (vfs.f_blocks - vfs.f_bfree) * vfs.f_frsize
+        usable = used + vfs.f_bavail * vfs.f_frsize
+        disk_percent = round(100.0 * used / usable, 1) if usable else 0.0
+        return {
+            "cpu": {"usage": format_value(cpu_usage, "%")},
+            "gpu": {"utilization": format_value(0, "%")},
+            "ram": {"usage": format_value(ram_percent, "%")},
+            "storage": {"usage": format_value(disk_percent, "%")},
+        }
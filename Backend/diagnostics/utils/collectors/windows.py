@@ -0,0 +1,58 @@
+#diagnostics/utils/collectors/windows.py
+import sys
+
+from .base import format_value, default_gpu_info
+from .generic import PsutilCollector
+
+
+class WindowsCollector(PsutilCollector):
+    """psutil/cpuinfo for CPU, RAM and disk plus WMI for the GPU inventory."""
+    name = "windows"
+
+    @classmethod
+    def available(cls):
+        if sys.platform != "win32":
+            return False
+        try:
+            import wmi, pythoncom  # noqa: F401
+            return True
+        except Exception:
+            return False
+
+    def gpu_info(self):
+        import wmi, pythoncom
+
+        try:
+            # Initialize COM for WMI safely
+            pythoncom.CoInitialize()
+            wmi_obj = wmi.WMI()
+            gpu_list = wmi_obj.Win32_VideoController()
+            if gpu_list:
+                gpu = gpu_list[0]
+
+                def safe_get(attr):
+                    val = getattr(gpu, attr, None)
+                    return val if val not in (None, "", 0, "Unknown") else "Standard"
+
+                vram_value = None
+                try:
+                    if getattr(gpu, "AdapterRAM", None):
+                        vram_value = round(int(gpu.AdapterRAM) / (1024 ** 3), 2)
+                except Exception:
+                    vram_value = "Standard"
+
+                return {
+                    "model": safe_get("Name"),
+                    "vram": format_value(vram_value, " GB"),
+                    "driver_version": safe_get("DriverVersion"),
+                    "status": safe_get("Status"),
+                }
+        except Exception:
+            pass
+        finally:
+            try:
+                pythoncom.CoUninitialize()
+            except:
+                pass
+
+        return default_gpu_info()
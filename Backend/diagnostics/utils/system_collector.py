@@ -1,106 +1,142 @@
 #diagnostics/utils/system_collector.py
-import psutil, platform, cpuinfo, wmi, pythoncom
+import copy, hashlib, json, os, tempfile, threading
+from pathlib import Path
+import platform
 
-def format_value(value, unit=None):
-    """Helper to format numeric values with units or handle missing ones."""
-    if value in (None, "", "Unknown", "Standard"):
-        return "Standard"
+from diagnostics.utils.collectors import get_backend, format_value  # noqa: F401 (format_value re-exported)
 
+_static_cache = None
+_static_lock = threading.Lock()
+
+
+def _cache_path():
+    """Where the static inventory is persisted between restarts."""
     try:
-        if isinstance(value, (int, float)):
-            if unit:
-                # Format floats with 2 decimals when needed
-                return f"{value:.2f}{unit}" if isinstance(value, float) else f"{value}{unit}"
-            return str(value)
-        return str(value)
+        from django.conf import settings
+        if settings.configured and getattr(settings, "SYSTEM_INFO_CACHE_PATH", None):
+            return Path(settings.SYSTEM_INFO_CACHE_PATH)
     except Exception:
-        return "Standard"
+        pass
+    return Path(tempfile.gettempdir()) / "sdu_system_static.json"
 
 
-def get_system_info():
+def hardware_fingerprint():
+    """
+    Cheap identity of the machine: any CPU, RAM, disk or OS change alters it
+    and invalidates the cached static inventory.
+    """
+    import psutil
+
+    parts = [
+        get_backend().name, platform.node(), platform.system(), platform.release(), platform.machine(),
+        psutil.cpu_count(logical=True), psutil.cpu_count(logical=False),
+        psutil.virtual_memory().total, psutil.disk_usage('/').total,
+    ]
+    return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def _collect_static_info():
+    """Hardware facts that do not change while the machine is running (slow on some backends)."""
+    return get_backend().static_info()
+
+
+def _read_cached_static(fingerprint):
     try:
-        # Initialize COM for WMI safely
-        pythoncom.CoInitialize()
-
-        cpu_usage = psutil.cpu_percent(interval=1)
-        ram = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-
-        system_info = {
-            "os": {
-                "name": platform.system() or "Standard",
-                "version": platform.version() or "Standard",
-                "build": platform.release() or "Standard",
-            },
-            "cpu": {
-                "model": cpuinfo.get_cpu_info().get('brand_raw', 'Standard'),
-                "cores": psutil.cpu_count(logical=False) or "Standard",
-                "threads": psutil.cpu_count(logical=True) or "Standard",
-                "usage": format_value(cpu_usage, "%"),
-            },
-            "gpu": {},
-            "ram": {
-                "total": format_value(round(ram.total / (1024 ** 3), 2), " GB") if ram.total else "Standard",
-                "usage": format_value(ram.percent, "%"),
-                "speed": "Standard",
-            },
-            "storage": {
-                "type": "Standard",
-                "size": format_value(round(disk.total / (1024 ** 3), 2), " GB") if disk.total else "Standard",
-                "usage": format_value(disk.percent, "%"),
-            },
-        }
-
-        # --- GPU Info (Safe WMI Call) ---
-        try:
-            wmi_obj = wmi.WMI()
-            gpu_list = wmi_obj.Win32_VideoController()
-            if gpu_list:
-                gpu = gpu_list[0]
-
-                def safe_get(attr):
-                    val = getattr(gpu, attr, None)
-                    return val if val not in (None, "", 0, "Unknown") else "Standard"
-
-                vram_value = None
-                try:
-                    if getattr(gpu, "AdapterRAM", None):
-                        vram_value = round(int(gpu.AdapterRAM) / (1024 ** 3), 2)
-                except Exception:
-                    vram_value = "Standard"
-
-                system_info["gpu"] = {
-                    "model": safe_get("Name"),
-                    "vram": format_value(vram_value, " GB"),
-                    "driver_version": safe_get("DriverVersion"),
-                    "status": safe_get("Status"),
-                    "utilization": format_value(0, "%"),
-                }
-            else:
-                system_info["gpu"] = {
-                    "model": "Integrated GPU",
-                    "vram": "Standard",
-                    "driver_version": "Standard",
-                    "status": "Standard",
-                    "utilization": format_value(0, "%"),
-                }
-
-        except Exception:
-            system_info["gpu"] = {
-                "model": "Integrated GPU",
-                "vram": "Standard",
-                "driver_version": "Standard",
-                "status": "Standard",
-                "utilization": format_value(0, "%"),
-            }
+        with open(_cache_path(), "r", encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if cached.get("fingerprint") == fingerprint:
+            return cached.get("info")
+    except Exception:
+        pass
+    return None
+
+
+def _write_cached_static(fingerprint, info):
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"fingerprint": fingerprint, "info": info}, fh)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def get_static_info(refresh=False):
+    """
+    Static hardware inventory (OS, CPU model/cores, RAM total, GPU, disk size).
+    Computed once per process and persisted to disk keyed by hardware_fingerprint(),
+    so restarts on unchanged hardware skip cpuinfo/WMI entirely.
+    """
+    global _static_cache
+    with _static_lock:
+        fingerprint = hardware_fingerprint()
+        if not refresh and _static_cache and _static_cache[0] == fingerprint:
+            return copy.deepcopy(_static_cache[1])
 
+        info = None if refresh else _read_cached_static(fingerprint)
+        if info is None:
+            previous = _static_cache[1] if _static_cache and _static_cache[0] == fingerprint else _read_cached_static(fingerprint)
+            info = _collect_static_info()
+            measured = (previous or {}).get("storage", {}).get("measured_type")
+            if measured:
+                _apply_storage_class(info, measured)
+            _write_cached_static(fingerprint, info)
+        _static_cache = (fingerprint, info)
+        return copy.deepcopy(info)
+
+
+def _apply_storage_class(info, kind):
+    storage = info.setdefault("storage", {})
+    if "measured_type" not in storage:
+        storage["reported_type"] = storage.get("type", "Standard")
+    storage["measured_type"] = kind
+    storage["type"] = kind
+
+
+def on_inventory_disk(path):
+    """
+    True when `path` is on the filesystem the inventory's storage section describes
+    (the root filesystem: storage.size and the Linux storage.type both come from "/").
+    """
+    try:
+        return os.stat(path).st_dev == os.stat(os.path.abspath(os.sep)).st_dev
+    except OSError:
+        return False
+
+
+def record_storage_class(kind):
+    """
+    Remember the storage class ("SSD"/"HDD") measured by the storage benchmark.
+    The measurement wins over what the backend reported (psutil cannot tell,
+    and virtual disks often claim to be rotational); the backend's answer is
+    kept as storage.reported_type in the cached inventory. Callers only pass
+    measurements taken on_inventory_disk().
+    """
+    global _static_cache
+    if not kind:
+        return
+    get_static_info()
+    with _static_lock:
+        fingerprint, info = _static_cache
+        info = copy.deepcopy(info)
+        _apply_storage_class(info, kind)
+        _write_cached_static(fingerprint, info)
+        _static_cache = (fingerprint, info)
+
+
+def get_dynamic_info():
+    """Current usage figures; non-blocking and cheap enough to call per request."""
+    return get_backend().dynamic_info()
+
+
+def get_system_info():
+    try:
+        system_info = get_static_info()
+        for section, values in get_dynamic_info().items():
+            system_info.setdefault(section, {}).update(values)
         return system_info
 
     except Exception as e:
         return {"error": str(e)}
-
-    finally:
-        try:
-            pythoncom.CoUninitialize()
-        except:
-            pass
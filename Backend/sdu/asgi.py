@@ -2,6 +2,8 @@
 ASGI config for sdu project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn sdu.asgi:application``) so the
+Server-Sent Events endpoint /api/benchmarks/live/stream/ can stream.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
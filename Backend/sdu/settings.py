@@ -132,4 +132,107 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
-}
\ No newline at end of file
+}
+
+# Benchmark job queue (benchmarks/jobs.py)
+# Web processes start a local worker pool on demand; set BENCHMARK_WORKER_AUTOSTART
+# to False when jobs are drained by `manage.py run_benchmark_worker` instead.
+BENCHMARK_WORKER_AUTOSTART = True
+BENCHMARK_WORKERS = 1
+BENCHMARK_JOB_POLL_SECONDS = 2.0
+BENCHMARK_JOB_STALE_SECONDS = 300
+BENCHMARK_JOB_HEARTBEAT_SECONDS = 30.0  # running jobs refresh their heartbeat this often
+BENCHMARK_JOB_MAX_ATTEMPTS = 3
+
+# Live telemetry sampler (benchmarks/telemetry.py)
+TELEMETRY_SAMPLE_INTERVAL = 1.0  # seconds between samples
+TELEMETRY_BUFFER_SIZE = 600      # samples kept in the ring buffer
+TELEMETRY_STREAM_INTERVAL = 1.0      # default seconds between SSE pushes
+TELEMETRY_STREAM_MIN_INTERVAL = 0.2  # fastest rate a client may request
+TELEMETRY_STREAM_KEEPALIVE = 15.0    # idle seconds before an SSE keepalive comment
+TELEMETRY_STREAM_TICKET_SECONDS = 30  # lifetime of a live/stream/?ticket= (single use)
+
+# Static hardware inventory cache (diagnostics/utils/system_collector.py)
+SYSTEM_INFO_CACHE_PATH = BASE_DIR / '.cache' / 'system_static.json'
+SYSTEM_COLLECTOR_BACKEND = 'auto'  # "auto", "linux", "windows" or "psutil"
+
+# CPU stress pool (benchmarks/stress_pool.py): spawn the workers when the job pool starts
+BENCHMARK_CPU_POOL_PREWARM = True
+BENCHMARK_CPU_PIN_WORKERS = False  # pin each stress worker to its own logical CPU
+
+# Memory benchmark (benchmarks/memory_bench.py): largest latency working set; the STREAM arrays
+# are always sized to 4x the last-level cache (bounded by available RAM)
+MEMORY_BENCH_MAX_MB = 256
+
+# Storage benchmark (benchmarks/storage_bench.py): scratch directory (None = system temp dir),
+# scratch file size cap and per-phase time limit
+STORAGE_BENCH_DIR = None
+STORAGE_BENCH_FILE_MB = 256
+STORAGE_BENCH_PHASE_SECONDS = 3.0
+
+# Response cache for the compare/bottleneck endpoints (benchmarks/response_cache.py).
+# Local memory, LRU: once MAX_ENTRIES is reached the least recently used 1/CULL_FREQUENCY
+# of the entries are evicted. Entries are invalidated per hardware group on every benchmark
+# write; a separate run_benchmark_worker process needs a shared backend (Redis/Memcached)
+# for that to reach the web processes.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sdu-default",
+    },
+    "benchmarks": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sdu-benchmarks",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 5000, "CULL_FREQUENCY": 4},
+    },
+}
+BENCHMARK_CACHE_ALIAS = "benchmarks"
+BENCHMARK_CACHE_TIMEOUT = 300        # seconds; safety net behind the write invalidation
+BENCHMARK_CACHE_HOST_TIMEOUT = 3600  # server facts such as disk size
+
+# Benchmark history listing (benchmarks/pagination.py)
+BENCHMARK_HISTORY_PAGE_SIZE = 20
+BENCHMARK_HISTORY_MAX_PAGE_SIZE = 100
+
+# Benchmark timelines (benchmarks/series.py): zlib-compress the packed float32 columns when it saves space
+BENCHMARK_SERIES_COMPRESSION = True
+
+# Chart downsampling (benchmarks/downsample.py): largest ?points a client may ask for,
+# and how long a downsampled timeline stays cached
+BENCHMARK_CHART_MAX_POINTS = 5000
+BENCHMARK_SERIES_CACHE_TIMEOUT = 3600
+
+# Persisted telemetry (benchmarks/retention.py): when TELEMETRY_PERSIST is on, the process
+# running the live sampler also writes its samples to the database (enable it in one process
+# only, or use `manage.py run_telemetry_archiver`) and compacts them into 1m/1h rollups.
+TELEMETRY_PERSIST = False
+TELEMETRY_PERSIST_INTERVAL = 10.0    # seconds between flushes of new samples
+TELEMETRY_COMPACT_INTERVAL = 300.0   # seconds between rollup/retention passes
+TELEMETRY_RAW_RETENTION_HOURS = 24
+TELEMETRY_1M_RETENTION_DAYS = 7
+TELEMETRY_1H_RETENTION_DAYS = 365
+TELEMETRY_DELETE_CHUNK = 2000        # rows per delete transaction
+TELEMETRY_HISTORY_MAX_POINTS = 500   # default point budget of telemetry/history/
+
+# OpenCL compute (benchmarks/gpu_compute.py): device the GPU benchmark runs on ("auto", "gpu",
+# "cpu", "<platform>:<device>" or a name fragment). "auto" takes CPU OpenCL runtimes such as
+# PoCL only when GPU_COMPUTE_ALLOW_CPU is set. Built program binaries are cached on disk.
+GPU_COMPUTE_DEVICE = "auto"
+GPU_COMPUTE_ALLOW_CPU = False
+GPU_PROGRAM_CACHE_DIR = BASE_DIR / ".cache" / "opencl"
+
+# GPU telemetry (benchmarks/gpu_telemetry.py): "auto" tries the in-process NVML bindings, then Linux
+# DRM sysfs (amdgpu/i915/xe), then GPUtil; or name one of "nvml", "sysfs", "gputil", "fake", "none".
+GPU_TELEMETRY_PROVIDER = "auto"
+GPU_TELEMETRY_DEVICE = 0
+GPU_TELEMETRY_SLOW_INTERVAL = 2.0    # seconds between nvidia-smi calls of the GPUtil fallback
+
+# Temperature sensors (benchmarks/sensors.py) are discovered once; a failed read re-runs discovery
+# at most this often (seconds)
+SENSOR_REDISCOVER_INTERVAL = 30.0
+
+# Startup import budget (benchmarks/startup.py, `manage.py bench_startup`): median
+# `-X importtime` total, in milliseconds, of importing sdu.wsgi/sdu.asgi plus the URLconf. The unit
+# tests only check that no heavy module is imported; set SDU_STARTUP_BUDGET_TEST=1 to test the time too
+STARTUP_IMPORT_BUDGET_MS = 1500
@@ -38,9 +38,10 @@ export function AnalysisUpgrades({ user }: AnalysisUpgradesProps) {
     const fetchBenchmarks = async () => {
       setLoading(true);
       try {
-        const resp = await API.get('/benchmarks/');
+        // summary mode: this view only shows scores, so skip the per-run metric series
+        const resp = await API.get('/benchmarks/', { params: { summary: 1, limit: 20 } });
         if (cancelled) return;
-        const data = Array.isArray(resp.data) ? resp.data : [];
+        const data = Array.isArray(resp.data?.results) ? resp.data.results : [];
         setBenchmarks(data);
 
         if (data.length > 0) {
@@ -31,6 +31,11 @@ interface BenchmarkResult {
   metrics: BenchmarkMetric[];
 }
 
+interface BenchmarkPage {
+  results: BenchmarkResult[];
+  next_cursor: string | null;
+}
+
 interface ProfileModalProps {
   open: boolean;
   onClose: () => void;
@@ -42,6 +47,7 @@ export function ProfileModal({ open, onClose, onLogout }: ProfileModalProps) {
   const [editing, setEditing] = useState(false);
   const [formData, setFormData] = useState<UserData>({ id: 0, username: '', email: '', avatar: '' });
   const [savedResults, setSavedResults] = useState<BenchmarkResult[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   const fetchProfile = async () => {
     try {
@@ -54,14 +60,20 @@ export function ProfileModal({ open, onClose, onLogout }: ProfileModalProps) {
     }
   };
 
-  const fetchBenchmarks = async () => {
+  // history is cursor-paginated: first page on open, older runs on demand
+  const fetchBenchmarks = async (cursor: string | null = null) => {
     try {
-      const { data } = await API.get('/benchmarks/');
-      setSavedResults(data);
+      const { data } = await API.get<BenchmarkPage>('/benchmarks/', {
+        // the charts are a few hundred pixels wide: let the server decimate long timelines
+        params: { limit: 10, points: 300, ...(cursor ? { cursor } : {}) },
+      });
+      setSavedResults((prev) => (cursor ? [...prev, ...data.results] : data.results));
+      setNextCursor(data.next_cursor);
     } catch (err) {
       toast.error('Failed to load benchmarks');
       console.error(err);
-      setSavedResults([]);
+      if (!cursor) setSavedResults([]);
+      setNextCursor(null);
     }
   };
 
@@ -189,6 +201,11 @@ export function ProfileModal({ open, onClose, onLogout }: ProfileModalProps) {
                 </div>
               ))
             )}
+            {nextCursor && (
+              <Button onClick={() => fetchBenchmarks(nextCursor)} variant="outline" className="w-full text-xs h-8">
+                Load older results
+              </Button>
+            )}
           </div>
 
           {/* Actions */}
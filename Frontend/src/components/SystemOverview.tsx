@@ -70,17 +70,61 @@ export function SystemOverview() {
 
   const handleRescan = () => fetchSystemData();
 
-  // 🚀 Live metric polling during stress test
-  const startLivePolling = () => {
-    const poller = setInterval(async () => {
-      try {
-        const { data } = await API.get("/benchmarks/live/");
-        setChartData((prev) => [...prev.slice(-15), data]);
-      } catch {
-        console.error("Live poll failed");
-      }
-    }, 1000);
-    return poller;
+  // 🚀 Live metrics during stress test: SSE stream, polling live/?since= as the fallback
+  const startLiveStream = () => {
+    let source: EventSource | null = null;
+    let poller: ReturnType<typeof setInterval> | null = null;
+    let lastTimestamp: number | null = null;
+    let closed = false;
+
+    const addSamples = (samples: BenchmarkMetric[]) => {
+      if (!samples.length) return;
+      lastTimestamp = (samples[samples.length - 1] as any).timestamp ?? lastTimestamp;
+      setChartData((prev) => [...prev, ...samples].slice(-16));
+    };
+
+    const startPolling = () => {
+      if (closed || poller) return;
+      poller = setInterval(async () => {
+        try {
+          if (lastTimestamp === null) {
+            const { data } = await API.get("/benchmarks/live/");
+            addSamples([data]);
+          } else {
+            const { data } = await API.get("/benchmarks/live/", { params: { since: lastTimestamp } });
+            addSamples(data);
+          }
+        } catch {
+          console.error("Live poll failed");
+        }
+      }, 1000);
+    };
+
+    // the ticket is single use, so a dropped stream is not reopened: poll instead
+    API.post("/benchmarks/live/stream/ticket/")
+      .then(({ data }) => {
+        if (closed) return;
+        source = new EventSource(
+          `${API.defaults.baseURL}/benchmarks/live/stream/?ticket=${encodeURIComponent(data.ticket)}`
+        );
+        source.addEventListener("sample", (event) => {
+          addSamples([JSON.parse((event as MessageEvent).data)]);
+        });
+        source.onerror = () => {
+          console.error("Live stream unavailable, polling instead");
+          source?.close();
+          startPolling();
+        };
+      })
+      .catch(startPolling);
+
+    return {
+      close: () => {
+        closed = true;
+        source?.close();
+        if (poller) clearInterval(poller);
+      },
+    };
   };
 
   // 🧠 Run benchmark (CPU/GPU/Hybrid)
@@ -91,23 +135,28 @@ export function SystemOverview() {
     setChartData([]);
     setBenchmarkResults(null);
 
-    // progress animation
-    const progressTimer = setInterval(() => {
-      setBenchmarkProgress((prev) => (prev < 90 ? prev + 3 : prev));
-    }, 600);
-
-    // start polling
-    const poller = startLivePolling();
+    // start live stream
+    const stream = startLiveStream();
 
     try {
-      const { data: result } = await API.post("/benchmarks/run/", { type });
+      // run/ only queues the job; follow it until the worker finishes
+      const { data: job } = await API.post("/benchmarks/run/", { type });
+      let status = job.status;
+      while (status === "queued" || status === "running") {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const { data: progress } = await API.get(`/benchmarks/jobs/${job.job_id}/`);
+        status = progress.status;
+        setBenchmarkProgress((prev) => Math.max(prev, Math.min(progress.progress ?? 0, 99)));
+      }
+      if (status !== "done") throw new Error("Benchmark job failed");
+
+      const { data: result } = await API.get(`/benchmarks/jobs/${job.job_id}/result/`);
       setBenchmarkResults(result);
       toast.success("Benchmark complete!");
     } catch {
       toast.error("Benchmark failed");
     } finally {
-      clearInterval(progressTimer);
-      clearInterval(poller);
+      stream.close();
       setBenchmarking(false);
       setBenchmarkProgress(100);
     }